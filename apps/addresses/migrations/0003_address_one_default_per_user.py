@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def keep_latest_default(apps, schema_editor):
+    # Older rows may have several defaults per user; keep the most recent one
+    Address = apps.get_model('addresses', 'Address')
+    seen = set()
+    stale = []
+    for address_id, user_id in (
+        Address.objects.filter(is_default=True).order_by('user_id', '-created_at', '-id').values_list('id', 'user_id').iterator()
+    ):
+        if user_id in seen:
+            stale.append(address_id)
+        seen.add(user_id)
+    for start in range(0, len(stale), 1000):
+        Address.objects.filter(id__in=stale[start:start + 1000]).update(is_default=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('addresses', '0002_alter_address_options_remove_address_apartment_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_latest_default, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='address',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_default', True)), fields=('user',), name='address_one_default_per_user'),
+        ),
+    ]
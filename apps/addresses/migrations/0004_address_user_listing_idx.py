@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('addresses', '0003_address_one_default_per_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(fields=['user', 'is_default', 'created_at'], name='address_user_listing_idx'),
+        ),
+    ]
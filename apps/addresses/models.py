@@ -1,5 +1,6 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.contrib.auth import get_user_model
 
 class Address(models.Model):
     user = models.ForeignKey(
@@ -15,11 +16,44 @@ class Address(models.Model):
     is_default = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            # At most one default per user; also serves the "default address" lookup
+            models.UniqueConstraint(
+                fields=["user"],
+                condition=models.Q(is_default=True),
+                name="address_one_default_per_user",
+            ),
+        ]
+        indexes = [
+            # Address book listing: default first, then newest
+            models.Index(fields=["user", "is_default", "created_at"], name="address_user_listing_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_is_default = instance.__dict__.get("is_default")
+        return instance
+
     def save(self, *args, **kwargs):
-        # if an address is set as default, remove default from others
-        if self.is_default:
-            Address.objects.filter(user=self.user, is_default=True).update(is_default=False)
-        super().save(*args, **kwargs)
+        # Only a save that makes this address the default has to touch the others
+        if not self.is_default or getattr(self, "_loaded_is_default", False):
+            super().save(*args, **kwargs)
+        else:
+            with transaction.atomic():
+                Address.clear_default(self.user_id, exclude_pk=self.pk)
+                super().save(*args, **kwargs)
+        self._loaded_is_default = self.is_default
+
+    @staticmethod
+    def clear_default(user_id, exclude_pk=None):
+        """
+        Unset the user's current default. Locks the user row first so concurrent
+        default changes for one user run one after the other. Call inside a transaction.
+        """
+        get_user_model().objects.select_for_update().filter(pk=user_id).values_list("pk", flat=True).first()
+        Address.objects.filter(user_id=user_id, is_default=True).exclude(pk=exclude_pk).update(is_default=False)
 
     def __str__(self):
         return f"{self.street}, {self.city}, {self.country}"
@@ -0,0 +1,129 @@
+# apps/addresses/normalization.py
+"""
+Address normalization: collapse whitespace, map country names/ISO-3 codes to
+ISO 3166-1 alpha-2, map US/CA state and province names to their codes, and
+format postal codes for the countries we know. Results are memoized per
+worker, keyed by a hash of the whitespace-collapsed input (case is kept, since
+street and city keep the input's case), so repeated checkouts with the same
+address cost one dict lookup.
+"""
+import hashlib
+import re
+from django.core.exceptions import ValidationError
+from apps.utils.cache import LRUCache
+
+ADDRESS_FIELDS = ("street", "city", "state", "zip_code", "country")
+
+# Fields an address needs before it can be shipped to
+REQUIRED_FOR_SHIPPING = ("street", "city", "zip_code", "country")
+
+COUNTRY_ALIASES = {
+    "united states": "US", "united states of america": "US", "usa": "US", "us": "US", "u.s.": "US", "u.s.a.": "US",
+    "canada": "CA", "can": "CA", "ca": "CA",
+    "united kingdom": "GB", "great britain": "GB", "uk": "GB", "gbr": "GB", "gb": "GB", "england": "GB",
+    "germany": "DE", "deutschland": "DE", "deu": "DE", "de": "DE",
+    "france": "FR", "fra": "FR", "fr": "FR",
+    "india": "IN", "ind": "IN", "in": "IN",
+    "australia": "AU", "aus": "AU", "au": "AU",
+    "pakistan": "PK", "pak": "PK", "pk": "PK",
+    "netherlands": "NL", "nld": "NL", "nl": "NL",
+    "spain": "ES", "esp": "ES", "es": "ES",
+    "italy": "IT", "ita": "IT", "it": "IT",
+}
+
+STATE_CODES = {
+    "US": {
+        "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR", "california": "CA",
+        "colorado": "CO", "connecticut": "CT", "delaware": "DE", "district of columbia": "DC",
+        "florida": "FL", "georgia": "GA", "hawaii": "HI", "idaho": "ID", "illinois": "IL",
+        "indiana": "IN", "iowa": "IA", "kansas": "KS", "kentucky": "KY", "louisiana": "LA",
+        "maine": "ME", "maryland": "MD", "massachusetts": "MA", "michigan": "MI", "minnesota": "MN",
+        "mississippi": "MS", "missouri": "MO", "montana": "MT", "nebraska": "NE", "nevada": "NV",
+        "new hampshire": "NH", "new jersey": "NJ", "new mexico": "NM", "new york": "NY",
+        "north carolina": "NC", "north dakota": "ND", "ohio": "OH", "oklahoma": "OK", "oregon": "OR",
+        "pennsylvania": "PA", "rhode island": "RI", "south carolina": "SC", "south dakota": "SD",
+        "tennessee": "TN", "texas": "TX", "utah": "UT", "vermont": "VT", "virginia": "VA",
+        "washington": "WA", "west virginia": "WV", "wisconsin": "WI", "wyoming": "WY",
+    },
+    "CA": {
+        "alberta": "AB", "british columbia": "BC", "manitoba": "MB", "new brunswick": "NB",
+        "newfoundland and labrador": "NL", "nova scotia": "NS", "ontario": "ON",
+        "prince edward island": "PE", "quebec": "QC", "saskatchewan": "SK",
+        "northwest territories": "NT", "nunavut": "NU", "yukon": "YT",
+    },
+}
+
+# country -> (pattern the compacted, upper-cased code must match, formatter)
+POSTAL_CODE_FORMATS = {
+    "US": (re.compile(r"^\d{5}(\d{4})?$"), lambda code: code if len(code) == 5 else f"{code[:5]}-{code[5:]}"),
+    "CA": (re.compile(r"^[A-Z]\d[A-Z]\d[A-Z]\d$"), lambda code: f"{code[:3]} {code[3:]}"),
+    "GB": (re.compile(r"^[A-Z]{1,2}\d[A-Z\d]?\d[A-Z]{2}$"), lambda code: f"{code[:-3]} {code[-3:]}"),
+    "DE": (re.compile(r"^\d{5}$"), str),
+    "FR": (re.compile(r"^\d{5}$"), str),
+    "ES": (re.compile(r"^\d{5}$"), str),
+    "IT": (re.compile(r"^\d{5}$"), str),
+    "PK": (re.compile(r"^\d{5}$"), str),
+    "IN": (re.compile(r"^\d{6}$"), str),
+    "AU": (re.compile(r"^\d{4}$"), str),
+    "NL": (re.compile(r"^\d{4}[A-Z]{2}$"), lambda code: f"{code[:4]} {code[4:]}"),
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+_normalized = LRUCache(maxsize=10_000, ttl=3600)
+
+
+def _clean(value):
+    return _WHITESPACE.sub(" ", value or "").strip()
+
+
+def _cache_key(values):
+    # Not casefolded: street, city and unknown states/countries keep the input's case
+    raw = "\x1f".join(_clean(values.get(field)) for field in ADDRESS_FIELDS)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _normalize(values):
+    street, city, state, zip_code, country = (_clean(values.get(field)) for field in ADDRESS_FIELDS)
+
+    country = COUNTRY_ALIASES.get(country.casefold(), country.upper() if len(country) == 2 else country)
+    state = STATE_CODES.get(country, {}).get(state.casefold(), state.upper() if len(state) == 2 else state)
+
+    errors = {}
+    if zip_code:
+        compact = zip_code.upper().replace(" ", "").replace("-", "")
+        postal_format = POSTAL_CODE_FORMATS.get(country)
+        if postal_format is None:
+            zip_code = zip_code.upper()
+        elif postal_format[0].match(compact):
+            zip_code = postal_format[1](compact)
+        else:
+            errors["zip_code"] = f"Invalid postal code for {country}."
+    if state and country in STATE_CODES and state not in STATE_CODES[country].values():
+        errors["state"] = f"Unknown state or province for {country}."
+
+    return {
+        "street": street, "city": city, "state": state, "zip_code": zip_code, "country": country,
+    }, errors
+
+
+def normalize_address(values):
+    """
+    Return a dict of normalized ADDRESS_FIELDS for `values` (a dict of raw fields).
+    Raises ValidationError ({field: message}) for postal codes or states that
+    can't be valid for the country.
+    """
+    key = _cache_key(values)
+    result = _normalized.get(key)
+    if result is None:
+        result = _normalize(values)
+        _normalized.set(key, result)
+    normalized, errors = result
+    if errors:
+        raise ValidationError(errors)
+    return dict(normalized)
+
+
+def missing_shipping_fields(address):
+    """Names of the fields `address` (a model instance) still needs for shipping."""
+    return [field for field in REQUIRED_FOR_SHIPPING if not _clean(getattr(address, field))]
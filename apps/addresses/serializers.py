@@ -1,5 +1,7 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 from .models import Address
+from .normalization import ADDRESS_FIELDS, normalize_address
 
 class AddressSerializer(serializers.ModelSerializer):
     class Meta:
@@ -10,6 +12,18 @@ class AddressSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "created_at", "user"]
 
+    def validate(self, data):
+        # Normalize the full address (merged with the stored one on partial updates)
+        values = {field: getattr(self.instance, field, None) for field in ADDRESS_FIELDS}
+        values.update({field: data[field] for field in ADDRESS_FIELDS if field in data})
+        try:
+            normalized = normalize_address(values)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.message_dict)
+        for field in ADDRESS_FIELDS:
+            data[field] = normalized[field] or None
+        return data
+
     def create(self, validated_data):
         user = self.context["request"].user
         validated_data["user"] = user
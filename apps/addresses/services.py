@@ -1,3 +1,4 @@
+from django.db import transaction
 from .models import Address
 
 class AddressService:
@@ -16,3 +17,22 @@ class AddressService:
     def delete_address(address):
         address.delete()
         return True
+
+    @staticmethod
+    def get_default_address(user):
+        """The user's default address or None (one lookup on the partial unique index)."""
+        return Address.objects.filter(user=user, is_default=True).first()
+
+    @staticmethod
+    @transaction.atomic
+    def set_default_address(address):
+        """
+        Make `address` its user's default. Two UPDATEs rather than one CASE UPDATE: the
+        partial unique index can't be deferred, and a single statement would trip it
+        whenever the new default row is visited before the old one.
+        """
+        Address.clear_default(address.user_id, exclude_pk=address.pk)
+        Address.objects.filter(pk=address.pk).update(is_default=True)
+        address.is_default = True
+        address._loaded_is_default = True
+        return address
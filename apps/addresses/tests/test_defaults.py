@@ -0,0 +1,80 @@
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+
+from apps.addresses.models import Address
+from apps.addresses.services import AddressService
+from apps.users.tests.test_authentication import make_user
+from apps.utils.testing import CacheClearingMixin, auth_client
+
+
+def make_address(user, city="Oslo", **fields):
+    fields = {"street": "Main St 1", "zip_code": "0150", "country": "NO", **fields}
+    return Address.objects.create(user=user, city=city, **fields)
+
+
+def default_cities(user):
+    return list(Address.objects.filter(user=user, is_default=True).values_list("city", flat=True))
+
+
+class DefaultAddressTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+
+    def test_new_default_replaces_the_old_one(self):
+        make_address(self.user, "Oslo", is_default=True)
+        make_address(self.user, "Bergen", is_default=True)
+        self.assertEqual(default_cities(self.user), ["Bergen"])
+
+    def test_defaults_are_per_user(self):
+        other = make_user("other@example.com")
+        make_address(self.user, "Oslo", is_default=True)
+        make_address(other, "Bergen", is_default=True)
+        self.assertEqual(default_cities(self.user), ["Oslo"])
+        self.assertEqual(default_cities(other), ["Bergen"])
+
+    def test_saving_the_current_default_touches_only_its_row(self):
+        address = make_address(self.user, is_default=True)
+        address = Address.objects.get(pk=address.pk)
+        address.street = "Main St 2"
+        with self.assertNumQueries(1):
+            address.save()
+
+    def test_database_rejects_a_second_default(self):
+        make_address(self.user, "Oslo", is_default=True)
+        bergen = make_address(self.user, "Bergen")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Address.objects.filter(pk=bergen.pk).update(is_default=True)
+
+    def test_set_default_address(self):
+        make_address(self.user, "Oslo", is_default=True)
+        bergen = make_address(self.user, "Bergen")
+        AddressService.set_default_address(bergen)
+        self.assertEqual(default_cities(self.user), ["Bergen"])
+        self.assertEqual(AddressService.get_default_address(self.user), bergen)
+
+
+class DefaultAddressEndpointTests(CacheClearingMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = make_user()
+        self.client = auth_client(self.user)
+
+    def test_default_endpoint(self):
+        self.assertEqual(self.client.get("/api/addresses/default/").status_code, 404)
+        make_address(self.user, "Oslo", is_default=True)
+        response = self.client.get("/api/addresses/default/")
+        self.assertEqual(response.json()["data"]["city"], "Oslo")
+
+    def test_set_default_action(self):
+        make_address(self.user, "Oslo", is_default=True)
+        bergen = make_address(self.user, "Bergen")
+        response = self.client.post(f"/api/addresses/{bergen.pk}/set-default/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["data"]["is_default"])
+        self.assertEqual(default_cities(self.user), ["Bergen"])
+
+    def test_cannot_set_another_users_default(self):
+        other_address = make_address(make_user("other@example.com"))
+        response = self.client.post(f"/api/addresses/{other_address.pk}/set-default/")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(default_cities(other_address.user), [])
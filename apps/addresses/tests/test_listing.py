@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.addresses.models import Address
+from apps.users.tests.test_authentication import make_user
+from apps.utils.pagination import KeysetPagination
+from apps.utils.testing import CacheClearingMixin, auth_client
+from .test_defaults import make_address
+
+
+class AddressBookTests(CacheClearingMixin, TestCase):
+    url = "/api/addresses/"
+
+    def setUp(self):
+        super().setUp()
+        self.user = make_user()
+        self.other = make_user("other@example.com")
+        now = timezone.now()
+        for i, city in enumerate(["A", "B", "C", "D", "E"]):
+            address = make_address(self.user, city, is_default=(city == "B"))
+            Address.objects.filter(pk=address.pk).update(created_at=now - timedelta(days=5 - i))
+        make_address(self.other, "Elsewhere")
+        self.client = auth_client(self.user)
+
+    def walk(self, client=None, **params):
+        cities = []
+        response = (client or self.client).get(self.url, {"page_size": 2, **params})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            data = response.json()["data"]
+            self.assertLessEqual(len(data["results"]), 2)
+            cities += [address["city"] for address in data["results"]]
+            if not data["next"]:
+                return cities
+            response = (client or self.client).get(data["next"])
+
+    def test_own_addresses_default_first_then_newest(self):
+        self.assertEqual(self.walk(), ["B", "E", "D", "C", "A"])
+
+    def test_customers_cannot_reach_other_address_books(self):
+        self.assertEqual(self.walk(user=self.other.pk), ["B", "E", "D", "C", "A"])
+        other_address = Address.objects.get(user=self.other)
+        self.assertEqual(self.client.get(f"{self.url}{other_address.pk}/").status_code, 404)
+        self.assertEqual(self.client.delete(f"{self.url}{other_address.pk}/").status_code, 404)
+
+    def test_staff_can_list_any_user(self):
+        staff = auth_client(make_user("staff@example.com", is_staff=True))
+        self.assertEqual(self.walk(staff, user=self.other.pk), ["Elsewhere"])
+        self.assertEqual(self.walk(staff), [])  # their own, by default
+        self.assertEqual(staff.get(self.url, {"user": "me"}).status_code, 400)
+
+    def test_new_addresses_belong_to_the_requester(self):
+        response = self.client.post(self.url, {
+            "street": "Side St 2", "city": "F", "zip_code": "0150", "country": "NO", "user": self.other.pk,
+        }, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Address.objects.get(city="F").user, self.user)
+
+    def test_mistyped_cursor_is_not_found(self):
+        cursor = KeysetPagination().encode_cursor(["x", "y", "z"])
+        self.assertEqual(self.client.get(self.url, {"cursor": cursor}).status_code, 404)
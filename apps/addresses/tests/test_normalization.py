@@ -0,0 +1,106 @@
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase
+
+from apps.addresses import normalization
+from apps.addresses.models import Address
+from apps.addresses.normalization import normalize_address
+from apps.reviews.tests.test_permissions import make_product
+from apps.users.tests.test_authentication import make_user
+from apps.utils.testing import CacheClearingMixin, auth_client
+from .test_defaults import make_address
+
+
+def address(**fields):
+    return {"street": "1 Main St", "city": "Springfield", "state": "", "zip_code": "", "country": "", **fields}
+
+
+class NormalizeAddressTests(SimpleTestCase):
+    def setUp(self):
+        normalization._normalized.clear()
+
+    def test_country_state_and_zip_codes(self):
+        result = normalize_address(address(country="United States", state="california", zip_code="941031234"))
+        self.assertEqual((result["country"], result["state"], result["zip_code"]), ("US", "CA", "94103-1234"))
+
+        result = normalize_address(address(country="can", state="Ontario", zip_code="k1a0b1"))
+        self.assertEqual((result["country"], result["state"], result["zip_code"]), ("CA", "ON", "K1A 0B1"))
+
+        result = normalize_address(address(country="uk", zip_code="sw1a1aa"))
+        self.assertEqual(result["zip_code"], "SW1A 1AA")
+
+    def test_whitespace_is_collapsed(self):
+        result = normalize_address(address(street="  1   Main\tSt ", city=" Springfield  "))
+        self.assertEqual((result["street"], result["city"]), ("1 Main St", "Springfield"))
+
+    def test_invalid_codes_are_rejected(self):
+        with self.assertRaises(ValidationError) as error:
+            normalize_address(address(country="US", state="Narnia", zip_code="123"))
+        self.assertEqual(set(error.exception.message_dict), {"state", "zip_code"})
+
+    def test_unknown_countries_pass_through(self):
+        result = normalize_address(address(country="Norway", state="Viken", zip_code="0150"))
+        self.assertEqual((result["country"], result["state"], result["zip_code"]), ("Norway", "Viken", "0150"))
+
+    def test_results_are_memoized(self):
+        with mock.patch.object(normalization, "_normalize", wraps=normalization._normalize) as normalize:
+            normalize_address(address(country="usa"))
+            normalize_address(address(country=" usa "))
+            normalize_address(address(country="USA"))
+        # Whitespace-only differences share an entry; case differences don't
+        self.assertEqual(normalize.call_count, 2)
+
+    def test_case_of_free_text_is_kept(self):
+        self.assertEqual(normalize_address(address(street="1 main st"))["street"], "1 main st")
+        self.assertEqual(normalize_address(address(street="1 MAIN ST"))["street"], "1 MAIN ST")
+
+
+class AddressEndpointTests(CacheClearingMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        normalization._normalized.clear()
+        self.user = make_user()
+        self.client = auth_client(self.user)
+
+    def test_addresses_are_stored_normalized(self):
+        response = self.client.post("/api/addresses/", {
+            "street": "1  Main St", "city": "Austin", "state": "texas", "zip_code": "73301", "country": "usa",
+        }, format="json")
+        self.assertEqual(response.status_code, 201)
+        stored = Address.objects.values("street", "state", "country").get()
+        self.assertEqual(stored, {"street": "1 Main St", "state": "TX", "country": "US"})
+
+    def test_partial_update_is_checked_against_the_stored_country(self):
+        existing = make_address(self.user, country="US", zip_code="73301")
+        response = self.client.patch(f"/api/addresses/{existing.pk}/", {"zip_code": "ABC"}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("zip_code", str(response.json()))
+
+
+class CheckoutAddressTests(CacheClearingMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = make_user()
+        self.product = make_product()
+        self.client = auth_client(self.user)
+
+    def order(self, address):
+        return self.client.post("/api/orders/", {
+            "items": [{"product_id": self.product.pk, "quantity": 1}],
+            "shipping_address": address.pk,
+        }, format="json")
+
+    def test_own_complete_address_is_accepted(self):
+        self.assertEqual(self.order(make_address(self.user)).status_code, 201)
+
+    def test_other_users_address_is_rejected(self):
+        response = self.order(make_address(make_user("other@example.com")))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("shipping_address", str(response.json()))
+
+    def test_incomplete_address_is_rejected(self):
+        incomplete = Address.objects.create(user=self.user, city="Oslo")
+        response = self.order(incomplete)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("missing: street, zip_code, country", str(response.json()))
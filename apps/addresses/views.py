@@ -1,11 +1,51 @@
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from .models import Address
 from .serializers import AddressSerializer
+from .services import AddressService
+from apps.utils.pagination import KeysetPagination
+
+class AddressPagination(KeysetPagination):
+    page_size = 20
+    max_page_size = 100
 
 class AddressViewSet(viewsets.ModelViewSet):
     serializer_class = AddressSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = AddressPagination
+    # Range scan on (user, is_default, created_at)
+    keyset_ordering = ('-is_default', '-created_at', '-id')
 
     def get_queryset(self):
-        # return Address.objects.filter(user=self.request.user)
-        return Address.objects.all()
\ No newline at end of file
+        # Handle Swagger schema generation
+        if getattr(self, 'swagger_fake_view', False):
+            return Address.objects.none()
+
+        user = self.request.user
+        is_staff = user.is_staff or user.is_superuser
+        if self.action == 'list':
+            # Staff may list another user's address book with ?user=<id>
+            user_id = self.request.query_params.get('user') if is_staff else None
+            if user_id is not None:
+                try:
+                    return Address.objects.filter(user_id=int(user_id))
+                except ValueError:
+                    raise ValidationError({"user": "Must be a user id."})
+            return Address.objects.filter(user=user)
+        if is_staff:
+            return Address.objects.all()
+        return Address.objects.filter(user=user)
+
+    @action(detail=True, methods=["post"], url_path="set-default")
+    def set_default(self, request, pk=None):
+        address = AddressService.set_default_address(self.get_object())
+        return Response(self.get_serializer(address).data)
+
+    @action(detail=False, methods=["get"])
+    def default(self, request):
+        address = AddressService.get_default_address(request.user)
+        if address is None:
+            return Response({"error": "No default address set."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(self.get_serializer(address).data)
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import CartItem
+from apps.utils.fast_serializers import RowConverter
 
 class CartItemSerializer(serializers.ModelSerializer):
     user_email = serializers.EmailField(source='user.email', read_only=True)
@@ -9,4 +10,7 @@ class CartItemSerializer(serializers.ModelSerializer):
     class Meta:
         model = CartItem
         fields = ['id', 'user', 'user_email', 'product', 'product_name', 'product_price', 'quantity', 'created_at']
-        read_only_fields = ['id', 'user', 'user_email', 'created_at', 'product_name', 'product_price']
\ No newline at end of file
+        read_only_fields = ['id', 'user', 'user_email', 'created_at', 'product_name', 'product_price']
+
+# .values() fast path for cart listings (user and product columns come from one join)
+cart_item_rows = RowConverter(CartItemSerializer)
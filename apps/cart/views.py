@@ -2,11 +2,13 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import CartItem
-from .serializers import CartItemSerializer
+from .serializers import CartItemSerializer, cart_item_rows
+from apps.utils.fast_serializers import FastListMixin
 from rest_framework.permissions import IsAuthenticated
 
-class CartViewSet(viewsets.ModelViewSet):
+class CartViewSet(FastListMixin, viewsets.ModelViewSet):
     serializer_class = CartItemSerializer
+    row_converter = cart_item_rows
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
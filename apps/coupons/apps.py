@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class CouponsConfig(AppConfig):
+    name = "apps.coupons"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,121 @@
+# apps/coupons/cache.py
+"""
+Two-tier coupon lookup cache.
+
+Only the immutable coupon definition is cached (code, discount, validity window,
+limits). `used_count` is deliberately left out: it is loaded lazily from the
+database if something touches it, and redemption checks it atomically
+(see `services.redeem_coupon`).
+
+Tier 1 is a per-process LRU with a short TTL, tier 2 is Django's shared cache.
+Admin edits invalidate both tiers in the current process and the shared tier
+for everyone; other processes pick up the change when their local TTL expires.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.utils.cache import LRUCache
+from apps.utils.metrics import CACHE_LOOKUPS
+from .models import Coupon
+
+COUPON_CACHE_TTL = getattr(settings, "COUPON_CACHE_TTL", 300)
+COUPON_LOCAL_CACHE_TTL = getattr(settings, "COUPON_LOCAL_CACHE_TTL", 30)
+COUPON_NEGATIVE_CACHE_TTL = getattr(settings, "COUPON_NEGATIVE_CACHE_TTL", 30)
+
+DEFINITION_FIELDS = (
+    "id", "code", "discount_type", "discount_value", "valid_from", "valid_to",
+    "min_cart_value", "active", "usage_limit",
+)
+
+# Stored for unknown codes so repeated guesses don't hit the database
+_NOT_FOUND = "__not_found__"
+
+_local_cache = LRUCache(
+    maxsize=getattr(settings, "COUPON_LOCAL_CACHE_SIZE", 4096),
+    ttl=COUPON_LOCAL_CACHE_TTL,
+)
+
+
+def normalize_code(code):
+    """Canonical form used for cache keys and lookups."""
+    return (code or "").strip().upper()
+
+
+def _cache_key(code):
+    return f"coupons:definition:{code}"
+
+
+def _load_entry(code):
+    values = (
+        Coupon.objects.filter(code__iexact=code)
+        .values_list(*DEFINITION_FIELDS)
+        .first()
+    )
+    if values is None:
+        return _NOT_FOUND
+
+    row = dict(zip(DEFINITION_FIELDS, values))
+    # Precompute the validity window as epoch seconds (None = never valid)
+    window = None
+    if row["active"]:
+        window = (row["valid_from"].timestamp(), row["valid_to"].timestamp())
+    return {"values": values, "window": window}
+
+
+def _get_entry(code):
+    key = _cache_key(code)
+    entry = _local_cache.get(key)
+    if entry is not None:
+        CACHE_LOOKUPS.labels("coupon", "local").inc()
+        return entry
+
+    entry = cache.get(key)
+    if entry is not None:
+        CACHE_LOOKUPS.labels("coupon", "shared").inc()
+    else:
+        CACHE_LOOKUPS.labels("coupon", "database").inc()
+        entry = _load_entry(code)
+        ttl = COUPON_NEGATIVE_CACHE_TTL if entry == _NOT_FOUND else COUPON_CACHE_TTL
+        cache.set(key, entry, ttl)
+
+    local_ttl = COUPON_LOCAL_CACHE_TTL
+    if entry == _NOT_FOUND:
+        local_ttl = min(local_ttl, COUPON_NEGATIVE_CACHE_TTL)
+    _local_cache.set(key, entry, ttl=local_ttl)
+    return entry
+
+
+def get_coupon(code):
+    """
+    Return the coupon for `code` (case-insensitive) or None.
+    The instance has `used_count` deferred, so reading it costs one query.
+    """
+    code = normalize_code(code)
+    if not code:
+        return None
+
+    entry = _get_entry(code)
+    if entry == _NOT_FOUND:
+        return None
+    return Coupon.from_db("default", DEFINITION_FIELDS, entry["values"])
+
+
+def is_code_in_window(code):
+    """Cheap validity check (active + date window) from the cached definition."""
+    code = normalize_code(code)
+    if not code:
+        return False
+
+    entry = _get_entry(code)
+    if entry == _NOT_FOUND or entry["window"] is None:
+        return False
+    valid_from, valid_to = entry["window"]
+    return valid_from <= time.time() <= valid_to
+
+
+def invalidate_coupon(code):
+    key = _cache_key(normalize_code(code))
+    _local_cache.delete(key)
+    cache.delete(key)
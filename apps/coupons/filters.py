@@ -0,0 +1,26 @@
+# apps/coupons/filters.py
+import django_filters
+from django.utils import timezone
+from .models import Coupon
+
+class CouponFilter(django_filters.FilterSet):
+    valid_at = django_filters.IsoDateTimeFilter(method='filter_valid_at')
+    live = django_filters.BooleanFilter(method='filter_live')
+    valid_from_after = django_filters.IsoDateTimeFilter(field_name='valid_from', lookup_expr='gte')
+    valid_to_before = django_filters.IsoDateTimeFilter(field_name='valid_to', lookup_expr='lte')
+
+    class Meta:
+        model = Coupon
+        fields = ['active', 'discount_type', 'campaign']
+
+    def filter_valid_at(self, queryset, name, value):
+        """Coupons whose validity window contains `value`"""
+        return queryset.filter(valid_from__lte=value, valid_to__gte=value)
+
+    def filter_live(self, queryset, name, value):
+        """Active coupons valid right now (served by the coupon_live_idx partial index)"""
+        now = timezone.now()
+        live = queryset.filter(active=True, valid_from__lte=now, valid_to__gte=now)
+        if value:
+            return live
+        return queryset.exclude(pk__in=live.values('pk'))
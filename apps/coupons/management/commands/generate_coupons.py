@@ -0,0 +1,60 @@
+import csv
+import sys
+from datetime import timedelta
+from decimal import Decimal
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from apps.coupons.services import generate_coupon_codes, DEFAULT_CODE_ALPHABET
+
+class Command(BaseCommand):
+    help = 'Bulk-generate unique coupon codes for a campaign and write them out as CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int)
+        parser.add_argument('--campaign', required=True)
+        parser.add_argument('--discount-type', choices=['percent', 'fixed'], default='percent')
+        parser.add_argument('--discount-value', type=Decimal, required=True)
+        parser.add_argument('--valid-days', type=int, default=30, help='Validity window starting now')
+        parser.add_argument('--min-cart-value', type=Decimal, default=Decimal('0'))
+        parser.add_argument('--usage-limit', type=int, default=1, help='Uses per code (0 = unlimited)')
+        parser.add_argument('--prefix', default='')
+        parser.add_argument('--length', type=int, default=10)
+        parser.add_argument('--alphabet', default=DEFAULT_CODE_ALPHABET)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--output', help='CSV file to write (defaults to stdout)')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        try:
+            batches = generate_coupon_codes(
+                options['count'],
+                prefix=options['prefix'],
+                length=options['length'],
+                alphabet=options['alphabet'],
+                batch_size=options['batch_size'],
+                campaign=options['campaign'],
+                discount_type=options['discount_type'],
+                discount_value=options['discount_value'],
+                valid_from=now,
+                valid_to=now + timedelta(days=options['valid_days']),
+                min_cart_value=options['min_cart_value'],
+                usage_limit=options['usage_limit'] or None,
+            )
+        except ValidationError as e:
+            raise CommandError(str(e))
+
+        out = open(options['output'], 'w', newline='') if options['output'] else sys.stdout
+        try:
+            writer = csv.writer(out)
+            writer.writerow(['code'])
+            created = 0
+            for batch in batches:
+                writer.writerows([code] for code in batch)
+                created += len(batch)
+                self.stderr.write(f"{created}/{options['count']} codes created")
+        finally:
+            if out is not sys.stdout:
+                out.close()
+
+        self.stderr.write(self.style.SUCCESS(f"Created {created} coupons for campaign '{options['campaign']}'"))
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:28
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def rename_case_duplicates(apps, schema_editor):
+    # Older rows may share a code up to case ("SAVE10" / "save10"); keep the active,
+    # oldest one and rename the others to "<code>-DUP<id>", deactivated, so they
+    # stay visible in the admin instead of being dropped
+    Coupon = apps.get_model('coupons', 'Coupon')
+    taken = {code.upper() for code in Coupon.objects.values_list('code', flat=True)}
+    kept = set()
+    renames = []
+    for coupon_id, code in Coupon.objects.order_by('-active', 'id').values_list('id', 'code').iterator():
+        if code.upper() not in kept:
+            kept.add(code.upper())
+            continue
+        suffix = f'-DUP{coupon_id}'
+        new_code = code[:50 - len(suffix)] + suffix
+        if new_code.upper() in taken:
+            raise RuntimeError(f'Cannot rename duplicate coupon code {code!r} (id {coupon_id}); resolve it by hand')
+        taken.add(new_code.upper())
+        renames.append((coupon_id, new_code))
+    for coupon_id, new_code in renames:
+        Coupon.objects.filter(id=coupon_id).update(code=new_code, active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coupons', '0002_coupon_min_cart_value'),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_case_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='coupon',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Upper('code'), name='coupon_code_upper_uniq'),
+        ),
+    ]
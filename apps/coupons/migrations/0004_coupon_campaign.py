@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coupons', '0003_coupon_code_upper_uniq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coupon',
+            name='campaign',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='Campaign the coupon was bulk-generated for', max_length=100),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coupons', '0004_coupon_campaign'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='coupon',
+            index=models.Index(condition=models.Q(('active', True)), fields=['valid_to', 'valid_from'], name='coupon_live_idx'),
+        ),
+    ]
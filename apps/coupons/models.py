@@ -1,8 +1,16 @@
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
 
 class Coupon(models.Model):
     code = models.CharField(max_length=50, unique=True)
+    campaign = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+        db_index=True,
+        help_text="Campaign the coupon was bulk-generated for"
+    )
     discount_type = models.CharField(
         max_length=10,
         choices=[
@@ -24,14 +32,31 @@ class Coupon(models.Model):
     usage_limit = models.PositiveIntegerField(null=True, blank=True)
     used_count = models.PositiveIntegerField(default=0)
 
-    def is_valid(self, cart_total=None):
-        """Check if coupon is valid, optionally with cart total validation"""
+    class Meta:
+        constraints = [
+            # Case-insensitive uniqueness; also serves `code__iexact` lookups
+            models.UniqueConstraint(Upper("code"), name="coupon_code_upper_uniq"),
+        ]
+        indexes = [
+            # "Live coupons" admin view: active=True AND valid_from <= now <= valid_to
+            models.Index(
+                fields=["valid_to", "valid_from"],
+                name="coupon_live_idx",
+                condition=models.Q(active=True),
+            ),
+        ]
+
+    def is_valid(self, cart_total=None, check_usage=True):
+        """
+        Check if coupon is valid, optionally with cart total validation.
+        Pass check_usage=False to skip the usage limit (e.g. for cached coupons,
+        where used_count is only checked atomically at redemption time).
+        """
         now = timezone.now()
-        is_valid = (
-            self.active
-            and self.valid_from <= now <= self.valid_to
-            and (self.usage_limit is None or self.used_count < self.usage_limit)
-        )
+        is_valid = self.active and self.valid_from <= now <= self.valid_to
+
+        if check_usage:
+            is_valid = is_valid and (self.usage_limit is None or self.used_count < self.usage_limit)
         
         # Additional validation for minimum cart value if provided
         if cart_total is not None:
@@ -5,3 +5,31 @@ class CouponSerializer(serializers.ModelSerializer):
     class Meta:
         model = Coupon
         fields = '__all__'
+
+class CouponDefinitionSerializer(serializers.ModelSerializer):
+    """Coupon without the mutable usage counter (used for cached coupons)"""
+    class Meta:
+        model = Coupon
+        fields = [
+            'id', 'code', 'discount_type', 'discount_value', 'valid_from',
+            'valid_to', 'min_cart_value', 'active', 'usage_limit',
+        ]
+
+class CouponBulkGenerateSerializer(serializers.Serializer):
+    """Template for bulk-generating single-campaign coupon codes"""
+    count = serializers.IntegerField(min_value=1, max_value=1_000_000)
+    prefix = serializers.CharField(max_length=20, required=False, default="", allow_blank=True)
+    length = serializers.IntegerField(min_value=4, max_value=30, default=10)
+    alphabet = serializers.CharField(min_length=2, required=False)
+    campaign = serializers.CharField(max_length=100)
+    discount_type = serializers.ChoiceField(choices=Coupon._meta.get_field('discount_type').choices)
+    discount_value = serializers.DecimalField(max_digits=10, decimal_places=2)
+    valid_from = serializers.DateTimeField()
+    valid_to = serializers.DateTimeField()
+    min_cart_value = serializers.DecimalField(max_digits=10, decimal_places=2, default=0)
+    usage_limit = serializers.IntegerField(min_value=1, allow_null=True, default=1)  # single-use by default
+
+    def validate(self, data):
+        if data['valid_from'] >= data['valid_to']:
+            raise serializers.ValidationError({"valid_to": "Must be after valid_from."})
+        return data
@@ -1,7 +1,16 @@
+import random
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
 from django.utils import timezone
 from .models import Coupon
 from django.core.exceptions import ValidationError
 from .serializers import CouponSerializer
+from .cache import get_coupon, is_code_in_window
+from apps.utils import metrics
+
+COUPON_REDEMPTIONS = metrics.counter(
+    "coupon_redemptions_total", "Coupon uses redeemed, refused at the limit, or released", ["result"]
+)
 
 def create_coupon(data):
     serializer = CouponSerializer(data=data)
@@ -9,12 +18,92 @@ def create_coupon(data):
     return serializer.save()
 
 def validate_coupon(code):
-    try:
-        coupon = Coupon.objects.get(code=code)
-    except Coupon.DoesNotExist:
+    """
+    Validate a coupon from the cached definition (no database hit on a warm cache).
+    The usage limit is not checked here; it is enforced by `redeem_coupon`.
+    """
+    coupon = get_coupon(code)
+    if coupon is None:
         raise ValidationError("Invalid coupon code.")
 
-    if not coupon.is_valid():
+    if not is_code_in_window(code):
         raise ValidationError("Coupon is not valid or expired.")
 
     return coupon
+
+def redeem_coupon(coupon):
+    """
+    Atomically consume one use of the coupon.
+    Returns False if the usage limit has already been reached.
+    """
+    updated = (
+        Coupon.objects.filter(pk=coupon.pk)
+        .filter(Q(usage_limit__isnull=True) | Q(used_count__lt=F("usage_limit")))
+        .update(used_count=F("used_count") + 1)
+    )
+    if updated == 1:
+        transaction.on_commit(COUPON_REDEMPTIONS.labels("redeemed").inc)
+        return True
+    COUPON_REDEMPTIONS.labels("limit_reached").inc()
+    return False
+
+def release_coupon(coupon):
+    """Give back one use of the coupon (e.g. when it is removed from an order)."""
+    if Coupon.objects.filter(pk=coupon.pk, used_count__gt=0).update(used_count=F("used_count") - 1):
+        transaction.on_commit(COUPON_REDEMPTIONS.labels("released").inc)
+
+# No 0/O or 1/I, so printed codes can't be misread
+DEFAULT_CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+
+_rng = random.SystemRandom()
+
+def _random_codes(size, prefix, length, alphabet, max_retries):
+    """Return `size` new codes that don't exist yet (one lookup query per attempt)."""
+    codes = set()
+    for _ in range(max_retries + 1):
+        while len(codes) < size:
+            codes.add(prefix + "".join(_rng.choices(alphabet, k=length)))
+        taken = Coupon.objects.filter(code__in=codes).values_list("code", flat=True)
+        codes.difference_update(taken)
+        if len(codes) == size:
+            return codes
+    raise ValidationError("Could not generate enough unique codes. Use a longer code length.")
+
+def generate_coupon_codes(count, prefix="", length=10, alphabet=DEFAULT_CODE_ALPHABET,
+                          batch_size=5000, max_retries=5, **coupon_fields):
+    """
+    Create `count` unique coupons sharing `coupon_fields` (discount, validity, campaign...).
+    Returns an iterator that inserts batch by batch with bulk_create and yields each
+    batch of codes once it is committed, so callers can stream the codes out without
+    holding them all in memory. Parameters are validated before anything is inserted.
+    """
+    # Codes are stored upper-case so they can't clash with the UPPER(code) index
+    prefix = prefix.upper()
+    alphabet = "".join(dict.fromkeys(alphabet.upper()))
+    if len(alphabet) < 2:
+        raise ValidationError("The code alphabet needs at least two characters.")
+    if len(prefix) + length > Coupon._meta.get_field("code").max_length:
+        raise ValidationError("Prefix plus code length exceeds the maximum code length.")
+    if len(alphabet) ** length < count * 10:
+        raise ValidationError("Code space is too small for this many codes. Use a longer code length.")
+
+    return _insert_code_batches(count, prefix, length, alphabet, batch_size, max_retries, coupon_fields)
+
+def _insert_code_batches(count, prefix, length, alphabet, batch_size, max_retries, coupon_fields):
+    remaining = count
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        for _ in range(max_retries + 1):
+            codes = _random_codes(size, prefix, length, alphabet, max_retries)
+            try:
+                # A concurrent insert may still grab one of our codes; retry the batch
+                with transaction.atomic():
+                    Coupon.objects.bulk_create(Coupon(code=code, **coupon_fields) for code in codes)
+            except IntegrityError:
+                continue
+            break
+        else:
+            raise ValidationError("Could not insert a batch of unique codes after several retries.")
+
+        remaining -= size
+        yield sorted(codes)
@@ -0,0 +1,28 @@
+# apps/coupons/signals.py
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import Coupon
+from .cache import invalidate_coupon
+
+
+@receiver(pre_save, sender=Coupon)
+def invalidate_renamed_coupon(sender, instance, update_fields=None, **kwargs):
+    """If an edit changes the code, drop the cache entry for the old code too."""
+    if not instance.pk or (update_fields and "code" not in update_fields):
+        return
+    old_code = Coupon.objects.filter(pk=instance.pk).values_list("code", flat=True).first()
+    if old_code and old_code != instance.code:
+        invalidate_coupon(old_code)
+
+
+@receiver(post_save, sender=Coupon)
+def invalidate_saved_coupon(sender, instance, update_fields=None, **kwargs):
+    # used_count is not part of the cached definition
+    if update_fields and set(update_fields) == {"used_count"}:
+        return
+    invalidate_coupon(instance.code)
+
+
+@receiver(post_delete, sender=Coupon)
+def invalidate_deleted_coupon(sender, instance, **kwargs):
+    invalidate_coupon(instance.code)
@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.users.models import User
+from apps.utils.testing import CacheClearingMixin, auth_client
+from .test_cache import make_coupon
+
+
+class CouponListingTests(CacheClearingMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        admin = User.objects.create_user(email="admin@example.com", password="x", is_active=True, is_staff=True)
+        self.client = auth_client(admin)
+        now = timezone.now()
+        self.live = make_coupon("LIVE", campaign="spring")
+        self.expired = make_coupon("EXPIRED", campaign="spring", valid_to=now - timedelta(days=1))
+        self.future = make_coupon("FUTURE", valid_from=now + timedelta(days=5), valid_to=now + timedelta(days=10))
+        self.inactive = make_coupon("OFF", active=False, discount_type="fixed")
+
+    def codes(self, query=""):
+        response = self.client.get(f"/api/coupons/{query}")
+        self.assertEqual(response.status_code, 200)
+        return [coupon["code"] for coupon in response.json()["data"]["results"]]
+
+    def test_newest_first_by_default(self):
+        self.assertEqual(self.codes(), ["OFF", "FUTURE", "EXPIRED", "LIVE"])
+
+    def test_live_filter(self):
+        self.assertEqual(self.codes("?live=true"), ["LIVE"])
+        self.assertEqual(sorted(self.codes("?live=false")), ["EXPIRED", "FUTURE", "OFF"])
+
+    def test_valid_at_filter(self):
+        at = (timezone.now() + timedelta(days=6)).isoformat().replace("+00:00", "Z")
+        self.assertEqual(self.codes(f"?valid_at={at}"), ["FUTURE"])
+
+    def test_field_filters(self):
+        self.assertEqual(sorted(self.codes("?campaign=spring")), ["EXPIRED", "LIVE"])
+        self.assertEqual(self.codes("?discount_type=fixed"), ["OFF"])
+        self.assertEqual(self.codes("?active=false"), ["OFF"])
+
+    def test_ordering(self):
+        self.assertEqual(self.codes("?ordering=valid_to")[0], "EXPIRED")
+
+    def test_page_size(self):
+        response = self.client.get("/api/coupons/?page_size=3")
+        data = response.json()["data"]
+        self.assertEqual(data["count"], 4)
+        self.assertEqual(len(data["results"]), 3)
+        self.assertIsNotNone(data["next"])
+
+    def test_customers_cannot_list(self):
+        customer = User.objects.create_user(email="c@example.com", password="x", is_active=True)
+        self.assertEqual(auth_client(customer).get("/api/coupons/").status_code, 403)
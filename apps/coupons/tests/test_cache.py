@@ -0,0 +1,92 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.utils.testing import CacheClearingMixin
+from apps.coupons import cache as coupon_cache
+from apps.coupons.cache import get_coupon, invalidate_coupon, is_code_in_window
+from apps.coupons.models import Coupon
+
+
+def make_coupon(code="SAVE10", **fields):
+    now = timezone.now()
+    defaults = {
+        "discount_type": "percent",
+        "discount_value": Decimal("10"),
+        "valid_from": now - timedelta(days=1),
+        "valid_to": now + timedelta(days=1),
+    }
+    defaults.update(fields)
+    return Coupon.objects.create(code=code, **defaults)
+
+
+class CouponCacheTests(CacheClearingMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        coupon_cache._local_cache.clear()
+
+    def test_lookup_is_case_insensitive_and_cached(self):
+        coupon = make_coupon()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_coupon(" save10 ").pk, coupon.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_coupon("SAVE10").code, "SAVE10")
+
+    def test_shared_tier_serves_other_processes(self):
+        make_coupon()
+        get_coupon("SAVE10")
+        coupon_cache._local_cache.clear()  # as seen by another worker
+        with self.assertNumQueries(0):
+            self.assertIsNotNone(get_coupon("SAVE10"))
+
+    def test_unknown_codes_are_negatively_cached(self):
+        with self.assertNumQueries(1):
+            self.assertIsNone(get_coupon("NOPE"))
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_coupon("nope"))
+
+    def test_used_count_is_not_cached(self):
+        coupon = make_coupon(usage_limit=5)
+        Coupon.objects.filter(pk=coupon.pk).update(used_count=3)
+        cached = get_coupon("SAVE10")
+        with self.assertNumQueries(1):
+            self.assertEqual(cached.used_count, 3)
+
+    def test_saving_a_coupon_invalidates_it(self):
+        coupon = make_coupon()
+        get_coupon("SAVE10")
+        coupon.discount_value = Decimal("25")
+        coupon.save()
+        self.assertEqual(get_coupon("SAVE10").discount_value, Decimal("25"))
+
+    def test_renaming_a_coupon_invalidates_the_old_code(self):
+        coupon = make_coupon()
+        get_coupon("SAVE10")
+        coupon.code = "SAVE20"
+        coupon.save()
+        self.assertIsNone(get_coupon("SAVE10"))
+        self.assertEqual(get_coupon("SAVE20").pk, coupon.pk)
+
+    def test_deleting_a_coupon_invalidates_it(self):
+        make_coupon().delete()
+        self.assertIsNone(get_coupon("SAVE10"))
+
+    def test_validity_window(self):
+        now = timezone.now()
+        make_coupon("LIVE")
+        make_coupon("EXPIRED", valid_to=now - timedelta(seconds=1))
+        make_coupon("INACTIVE", active=False)
+        self.assertTrue(is_code_in_window("live"))
+        self.assertFalse(is_code_in_window("EXPIRED"))
+        self.assertFalse(is_code_in_window("INACTIVE"))
+        self.assertFalse(is_code_in_window("MISSING"))
+        self.assertFalse(is_code_in_window(""))
+
+    def test_invalidate_clears_both_tiers(self):
+        coupon = make_coupon()
+        get_coupon("SAVE10")
+        Coupon.objects.filter(pk=coupon.pk).update(discount_value=Decimal("30"))
+        invalidate_coupon("save10")
+        self.assertEqual(get_coupon("SAVE10").discount_value, Decimal("30"))
@@ -0,0 +1,121 @@
+import csv
+import io
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.users.models import User
+from apps.utils.testing import CacheClearingMixin, auth_client
+from apps.coupons.models import Coupon
+from apps.coupons.services import generate_coupon_codes
+
+
+def coupon_fields(**overrides):
+    now = timezone.now()
+    fields = {
+        "campaign": "spring",
+        "discount_type": "percent",
+        "discount_value": Decimal("15"),
+        "valid_from": now,
+        "valid_to": now + timedelta(days=30),
+        "usage_limit": 1,
+    }
+    fields.update(overrides)
+    return fields
+
+
+class GenerateCouponCodesTests(TestCase):
+    def test_creates_unique_codes_batch_by_batch(self):
+        batches = list(generate_coupon_codes(25, prefix="sp-", length=6, batch_size=10, **coupon_fields()))
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 5])
+        codes = [code for batch in batches for code in batch]
+        self.assertEqual(len(set(codes)), 25)
+        self.assertTrue(all(code.startswith("SP-") and len(code) == 9 for code in codes))
+        self.assertEqual(Coupon.objects.filter(campaign="spring").count(), 25)
+
+    def test_nothing_is_inserted_before_iteration(self):
+        batches = generate_coupon_codes(5, **coupon_fields())
+        self.assertFalse(Coupon.objects.exists())
+        list(batches)
+        self.assertEqual(Coupon.objects.count(), 5)
+
+    def test_codes_use_only_the_alphabet(self):
+        codes = [code for batch in generate_coupon_codes(20, length=8, alphabet="ab", **coupon_fields()) for code in batch]
+        self.assertTrue(all(set(code) <= {"A", "B"} for code in codes))
+
+    def test_existing_codes_are_skipped(self):
+        Coupon.objects.create(code="AAAAA", **coupon_fields())
+        draws = iter([list("AAAAA"), list("BBBBB"), list("ABABA"), list("BABAB")])
+        with mock.patch("apps.coupons.services._rng.choices", side_effect=lambda *a, **k: next(draws)):
+            codes = [code for batch in generate_coupon_codes(3, length=5, alphabet="AB", **coupon_fields()) for code in batch]
+        self.assertEqual(sorted(codes), ["ABABA", "BABAB", "BBBBB"])
+        self.assertEqual(Coupon.objects.count(), 4)
+
+    def test_a_racing_insert_retries_the_batch(self):
+        real_bulk_create = Coupon.objects.bulk_create
+        calls = []
+
+        def flaky_bulk_create(objs, *args, **kwargs):
+            calls.append(1)
+            if len(calls) == 1:
+                raise IntegrityError("duplicate key")
+            return real_bulk_create(objs, *args, **kwargs)
+
+        with mock.patch.object(Coupon.objects, "bulk_create", side_effect=flaky_bulk_create):
+            list(generate_coupon_codes(5, **coupon_fields()))
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(Coupon.objects.count(), 5)
+
+    def test_parameters_are_validated_up_front(self):
+        with self.assertRaises(ValidationError):
+            generate_coupon_codes(5, alphabet="a", **coupon_fields())
+        with self.assertRaises(ValidationError):
+            generate_coupon_codes(5, prefix="X" * 45, length=10, **coupon_fields())
+        with self.assertRaises(ValidationError):
+            generate_coupon_codes(100, length=2, alphabet="AB", **coupon_fields())
+
+
+class BulkGenerateEndpointTests(CacheClearingMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_user(email="admin@example.com", password="x", is_active=True, is_staff=True)
+        self.payload = {
+            "count": 12, "campaign": "Summer Sale", "discount_type": "fixed", "discount_value": "5.00",
+            "valid_from": timezone.now().isoformat(), "valid_to": (timezone.now() + timedelta(days=7)).isoformat(),
+        }
+
+    def test_streams_the_generated_codes_as_csv(self):
+        response = auth_client(self.admin).post("/api/coupons/bulk/", self.payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("summer-sale-coupons.csv", response["Content-Disposition"])
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(rows[0], ["code"])
+        self.assertEqual(len(rows), 13)
+        self.assertEqual(Coupon.objects.filter(campaign="Summer Sale", usage_limit=1).count(), 12)
+
+    def test_admin_only(self):
+        customer = User.objects.create_user(email="c@example.com", password="x", is_active=True)
+        response = auth_client(customer).post("/api/coupons/bulk/", self.payload, format="json")
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Coupon.objects.exists())
+
+    def test_invalid_window(self):
+        self.payload["valid_to"] = self.payload["valid_from"]
+        response = auth_client(self.admin).post("/api/coupons/bulk/", self.payload, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class GenerateCouponsCommandTests(TestCase):
+    def test_writes_codes_as_csv(self):
+        out, err = io.StringIO(), io.StringIO()
+        with mock.patch("sys.stdout", out):
+            call_command("generate_coupons", "7", campaign="cmd", discount_value=Decimal("10"), stderr=err)
+        rows = list(csv.reader(io.StringIO(out.getvalue())))
+        self.assertEqual(len(rows), 8)
+        self.assertEqual(Coupon.objects.filter(campaign="cmd").count(), 7)
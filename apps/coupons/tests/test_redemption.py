@@ -0,0 +1,59 @@
+import threading
+from unittest import skipUnless
+
+from django.db import close_old_connections, connection
+from django.test import TestCase, TransactionTestCase
+
+from apps.coupons.models import Coupon
+from apps.coupons.services import redeem_coupon, release_coupon
+from .test_cache import make_coupon
+
+
+class RedeemCouponTests(TestCase):
+    def test_redeems_until_the_limit(self):
+        coupon = make_coupon(usage_limit=2)
+        self.assertTrue(redeem_coupon(coupon))
+        self.assertTrue(redeem_coupon(coupon))
+        self.assertFalse(redeem_coupon(coupon))
+        coupon.refresh_from_db()
+        self.assertEqual(coupon.used_count, 2)
+
+    def test_unlimited_coupon(self):
+        coupon = make_coupon(usage_limit=None)
+        for _ in range(5):
+            self.assertTrue(redeem_coupon(coupon))
+        coupon.refresh_from_db()
+        self.assertEqual(coupon.used_count, 5)
+
+    def test_release_gives_a_use_back_but_never_goes_negative(self):
+        coupon = make_coupon(usage_limit=1)
+        redeem_coupon(coupon)
+        release_coupon(coupon)
+        release_coupon(coupon)
+        coupon.refresh_from_db()
+        self.assertEqual(coupon.used_count, 0)
+        self.assertTrue(redeem_coupon(coupon))
+
+
+@skipUnless(connection.vendor == "postgresql", "needs concurrent connections")
+class ConcurrentRedemptionTests(TransactionTestCase):
+    def test_parallel_redemptions_never_exceed_the_limit(self):
+        coupon = make_coupon(usage_limit=5)
+        results = []
+        barrier = threading.Barrier(20)
+
+        def redeem():
+            barrier.wait()
+            try:
+                results.append(redeem_coupon(coupon))
+            finally:
+                close_old_connections()
+
+        threads = [threading.Thread(target=redeem) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count(True), 5)
+        self.assertEqual(Coupon.objects.get(pk=coupon.pk).used_count, 5)
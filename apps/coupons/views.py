@@ -1,29 +1,36 @@
 # apps/coupons/views.py
-from rest_framework import viewsets, status
+from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAdminUser
+from django_filters.rest_framework import DjangoFilterBackend
 from django.core.exceptions import ValidationError
+from django.utils.text import slugify
 from .models import Coupon
-from .serializers import CouponSerializer
-from .services import validate_coupon
+from .serializers import CouponSerializer, CouponDefinitionSerializer, CouponBulkGenerateSerializer
+from .services import validate_coupon, generate_coupon_codes
+from .filters import CouponFilter
+from apps.utils.pagination import StandardResultsSetPagination
+from apps.utils.streaming import csv_streaming_response
 
 class CouponViewSet(viewsets.ModelViewSet):
     queryset = Coupon.objects.all()
     serializer_class = CouponSerializer
+    pagination_class = StandardResultsSetPagination
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_class = CouponFilter
+    ordering_fields = ['used_count', 'valid_to', 'valid_from', 'id']
+    ordering = ['-id']
 
     def get_permissions(self):
         """
         Custom permissions per action:
         - Anyone can validate coupons
-        - Only admin can modify coupons
-        - Anyone can read coupons
+        - Only admin can list, read, modify or bulk-generate coupons
         """
         if self.action == 'validate_coupon_code':
             return [AllowAny()]
-        elif self.action in ['create', 'update', 'partial_update', 'destroy']:
-            return [IsAdminUser()]
-        return [AllowAny()]  # For list and retrieve
+        return [IsAdminUser()]
 
     @action(detail=False, methods=['post'], url_path='validate')
     def validate_coupon_code(self, request):
@@ -34,4 +41,22 @@ class CouponViewSet(viewsets.ModelViewSet):
             coupon = validate_coupon(code)
         except ValidationError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        return Response(CouponSerializer(coupon).data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(CouponDefinitionSerializer(coupon).data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_generate(self, request):
+        """
+        Bulk-generate unique coupon codes from a template.
+        POST /api/coupons/bulk/ -> CSV of the generated codes, streamed batch by batch
+        """
+        serializer = CouponBulkGenerateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = dict(serializer.validated_data)
+        count = params.pop('count')
+        try:
+            batches = generate_coupon_codes(count, **params)
+        except ValidationError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = ([code] for batch in batches for code in batch)
+        return csv_streaming_response(["code"], rows, f"{slugify(params['campaign'])}-coupons.csv")
@@ -0,0 +1,33 @@
+from django.db import migrations
+from django.db.models import Count, Sum
+
+
+def backfill_user_order_stats(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    User = apps.get_model('users', 'User')
+
+    stats = (
+        Order.objects.exclude(status='CANCELLED')
+        .values('user_id')
+        .annotate(order_count=Count('id'), lifetime_value=Sum('total_amount'))
+        .order_by()
+    )
+    users = []
+    for row in stats.iterator():
+        users.append(User(id=row['user_id'], order_count=row['order_count'], lifetime_value=row['lifetime_value']))
+        if len(users) == 1000:
+            User.objects.bulk_update(users, ['order_count', 'lifetime_value'])
+            users = []
+    User.objects.bulk_update(users, ['order_count', 'lifetime_value'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_orderitem_status'),
+        ('users', '0008_user_order_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_user_order_stats, migrations.RunPython.noop),
+    ]
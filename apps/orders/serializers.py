@@ -2,6 +2,9 @@
 from rest_framework import serializers
 from .models import Order, OrderItem
 from apps.products.models import Product
+from apps.addresses.models import Address
+from apps.addresses.normalization import missing_shipping_fields
+from apps.utils.fast_serializers import RowConverter
 from .services import OrderService
 
 class OrderItemSerializer(serializers.ModelSerializer):
@@ -18,8 +21,21 @@ class OrderItemSerializer(serializers.ModelSerializer):
         fields = ["id", "product_id", "product_name", "product_price", "quantity", "price_per_unit", "status", "status_display"]
         read_only_fields = ["id", "price_per_unit", "product_name", "product_price", "status_display"]
 
+class ShippingAddressField(serializers.PrimaryKeyRelatedField):
+    """
+    Looks the address up among the order owner's addresses only, so existence
+    and ownership are checked by the same single query.
+    """
+
+    def get_queryset(self):
+        order = self.parent.instance
+        if order is not None and not isinstance(order, (list, tuple)):
+            return Address.objects.filter(user_id=order.user_id)
+        return Address.objects.filter(user=self.context["request"].user)
+
 class OrderSerializer(serializers.ModelSerializer):
     items = OrderItemSerializer(many=True)
+    shipping_address = ShippingAddressField(queryset=Address.objects.none(), allow_null=True, required=False)
     user_email = serializers.EmailField(source='user.email', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     coupon = serializers.CharField(required=False, allow_null=True, write_only=True)  # Accept string for write
@@ -61,6 +77,16 @@ class OrderSerializer(serializers.ModelSerializer):
             
         return value.strip().upper()  # Normalize to uppercase
 
+    def validate_shipping_address(self, address):
+        """The address must be complete enough to ship to (checked on the fetched row)"""
+        if address is not None:
+            missing = missing_shipping_fields(address)
+            if missing:
+                raise serializers.ValidationError(
+                    f"Shipping address is incomplete; missing: {', '.join(missing)}."
+                )
+        return address
+
     def validate(self, data):
         """Additional validation for the entire order"""
         # Ensure items are provided
@@ -78,4 +104,41 @@ class OrderSerializer(serializers.ModelSerializer):
         return OrderService.create_order(user, validated_data)
 
     def update(self, instance, validated_data):
-        return OrderService.update_order(instance, validated_data)
\ No newline at end of file
+        return OrderService.update_order(instance, validated_data)
+
+
+class OrderRowConverter(RowConverter):
+    """
+    .values() fast path for order listings: one query for the orders (with the
+    coupon columns joined in) and one for all of their items.
+    """
+    COUPON_PATHS = ("coupon__code", "coupon__discount_type", "coupon__discount_value", "coupon__min_cart_value")
+
+    def __init__(self):
+        super().__init__(OrderSerializer, exclude=("items", "coupon_details"), extra_paths=self.COUPON_PATHS)
+        self.items = RowConverter(OrderItemSerializer, extra_paths=("order_id",))
+
+    def convert_rows(self, rows):
+        rows = list(rows)
+        items_by_order = {}
+        if rows:
+            item_rows = self.items.values(
+                OrderItem.objects.filter(order_id__in=[row["id"] for row in rows]).order_by("id")
+            )
+            for item in item_rows:
+                items_by_order.setdefault(item["order_id"], []).append(self.items.convert(item))
+
+        orders = []
+        for row in rows:
+            order = self.convert(row)
+            order["items"] = items_by_order.get(row["id"], [])
+            order["coupon_details"] = None if row["coupon__code"] is None else {
+                "code": row["coupon__code"],
+                "discount_type": row["coupon__discount_type"],
+                "discount_value": str(row["coupon__discount_value"]),
+                "min_cart_value": str(row["coupon__min_cart_value"]),
+            }
+            orders.append(order)
+        return orders
+
+order_rows = OrderRowConverter()
@@ -1,9 +1,44 @@
 # apps/orders/services.py
+from decimal import Decimal
+from functools import partial
 from django.db import transaction
+from django.db.models import F
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
+from django.contrib.auth import get_user_model
 from .models import Order, OrderItem
 from apps.products.models import Product
-from apps.coupons.models import Coupon  # Import Coupon model
+from apps.coupons.cache import get_coupon
+from apps.coupons.services import redeem_coupon, release_coupon
+from apps.reviews.services import record_verified_purchases
+from apps.utils import metrics
+
+ORDERS_CREATED = metrics.counter("orders_created_total", "Orders committed")
+ORDERS_REJECTED = metrics.counter("orders_rejected_total", "Order creations rejected by validation")
+ORDER_VALUE = metrics.histogram(
+    "order_value", "Order totals at creation",
+    buckets=(10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+ORDER_CREATE_TIME = metrics.histogram("order_create_duration_seconds", "Time spent in OrderService.create_order")
+ORDER_STATUS_CHANGES = metrics.counter("order_status_changes_total", "Order status updates", ["status"])
+
+def _count_created_order(total):
+    ORDERS_CREATED.inc()
+    ORDER_VALUE.observe(total)
+
+def order_stats_contribution(status, total_amount):
+    """(order_count, lifetime_value) an order adds to its user's aggregates."""
+    if status == "CANCELLED":
+        return 0, Decimal("0")
+    return 1, Decimal(str(total_amount or 0))
+
+def update_user_order_stats(user_id, count_delta, value_delta):
+    """Apply an order change to the user's denormalized order aggregates in one UPDATE."""
+    if not count_delta and not value_delta:
+        return
+    get_user_model().objects.filter(pk=user_id).update(
+        order_count=F("order_count") + count_delta,
+        lifetime_value=F("lifetime_value") + value_delta,
+    )
 
 class OrderService:
     
@@ -14,18 +49,28 @@ class OrderService:
     
     @staticmethod
     def _get_coupon_by_code(coupon_code):
-        """Get coupon object by code or return None"""
+        """Get coupon object by code (served from the coupon cache) or return None"""
         if not coupon_code:
             return None
-        try:
-            return Coupon.objects.get(code=coupon_code)
-        except Coupon.DoesNotExist:
+        coupon = get_coupon(coupon_code)
+        if coupon is None:
             raise ValidationError(f"Coupon with code '{coupon_code}' does not exist.")
+        return coupon
     
     @staticmethod
-    @transaction.atomic
     def create_order(user, validated_data):
         """Create a new order with items and handle coupon usage."""
+        with ORDER_CREATE_TIME.time():
+            try:
+                order = OrderService._create_order(user, validated_data)
+            except ValidationError:
+                ORDERS_REJECTED.inc()
+                raise
+        return order
+
+    @staticmethod
+    @transaction.atomic
+    def _create_order(user, validated_data):
         items_data = validated_data.pop('items', [])
         coupon_code = validated_data.pop('coupon', None)  # Get coupon code
         shipping_address = validated_data.pop('shipping_address')
@@ -38,7 +83,7 @@ class OrderService:
 
         # Validate coupon before creating order
         if coupon:
-            if not coupon.is_valid(cart_total):
+            if not coupon.is_valid(cart_total, check_usage=False):
                 if cart_total < coupon.min_cart_value:
                     raise ValidationError(
                         f"This coupon requires a minimum cart value of ${coupon.min_cart_value}. "
@@ -46,10 +91,6 @@ class OrderService:
                     )
                 else:
                     raise ValidationError("This coupon is invalid or has expired.")
-            
-            # Check usage limit
-            if coupon.usage_limit and coupon.used_count >= coupon.usage_limit:
-                raise ValidationError("This coupon has reached its usage limit.")
 
         # Create order
         order = Order.objects.create(
@@ -78,10 +119,12 @@ class OrderService:
         # Calculate total
         order.calculate_total()
 
-        # Update coupon usage if applied
-        if coupon:
-            coupon.used_count += 1
-            coupon.save(update_fields=["used_count"])
+        # Update coupon usage if applied (atomic check against the usage limit)
+        if coupon and not redeem_coupon(coupon):
+            raise ValidationError("This coupon has reached its usage limit.")
+
+        # Only count orders that are actually committed
+        transaction.on_commit(partial(_count_created_order, float(order.total_amount or 0)))
         
         return order
     
@@ -105,7 +148,7 @@ class OrderService:
 
         # Validate new coupon if different
         if new_coupon and new_coupon != order.coupon:
-            if not new_coupon.is_valid(cart_total):
+            if not new_coupon.is_valid(cart_total, check_usage=False):
                 if cart_total < new_coupon.min_cart_value:
                     raise ValidationError(
                         f"This coupon requires a minimum cart value of ${new_coupon.min_cart_value}. "
@@ -113,22 +156,16 @@ class OrderService:
                     )
                 else:
                     raise ValidationError("This coupon is invalid or has expired.")
-            
-            # Check usage limit
-            if new_coupon.usage_limit and new_coupon.used_count >= new_coupon.usage_limit:
-                raise ValidationError("This coupon has reached its usage limit.")
 
         # Handle coupon usage count
         if order.coupon and order.coupon != new_coupon:
             # Revert usage from old coupon
-            if order.coupon.used_count > 0:
-                order.coupon.used_count -= 1
-                order.coupon.save(update_fields=["used_count"])
+            release_coupon(order.coupon)
         
         if new_coupon and new_coupon != order.coupon:
-            # Increment usage for new coupon
-            new_coupon.used_count += 1
-            new_coupon.save(update_fields=["used_count"])
+            # Increment usage for new coupon (atomic check against the usage limit)
+            if not redeem_coupon(new_coupon):
+                raise ValidationError("This coupon has reached its usage limit.")
 
         # Update order fields
         order.coupon = new_coupon
@@ -169,5 +206,10 @@ class OrderService:
 
         # Update all related OrderItems
         order.items.update(status=new_status)
+        transaction.on_commit(ORDER_STATUS_CHANGES.labels(new_status).inc)
+
+        # Delivered items make the user eligible to review those products
+        if new_status == "DELIVERED":
+            record_verified_purchases(order.user_id, order.items.values_list("product_id", flat=True))
 
         return order
\ No newline at end of file
@@ -0,0 +1,31 @@
+# apps/orders/signals.py
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import Order
+from .services import order_stats_contribution, update_user_order_stats
+
+
+@receiver(pre_save, sender=Order)
+def remember_previous_contribution(sender, instance, **kwargs):
+    instance._previous = None
+    if not instance._state.adding:
+        previous = Order.objects.filter(pk=instance.pk).values_list("user_id", "status", "total_amount").first()
+        if previous:
+            instance._previous = (previous[0], *order_stats_contribution(previous[1], previous[2]))
+
+
+@receiver(post_save, sender=Order)
+def add_order_to_user_stats(sender, instance, created, **kwargs):
+    current = (instance.user_id, *order_stats_contribution(instance.status, instance.total_amount))
+    previous = getattr(instance, "_previous", None)
+    if not created and previous == current:
+        return
+    if previous:
+        update_user_order_stats(previous[0], -previous[1], -previous[2])
+    update_user_order_stats(*current)
+
+
+@receiver(post_delete, sender=Order)
+def remove_order_from_user_stats(sender, instance, **kwargs):
+    count, value = order_stats_contribution(instance.status, instance.total_amount)
+    update_user_order_stats(instance.user_id, -count, -value)
@@ -3,17 +3,19 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from .models import Order
-from .serializers import OrderSerializer
+from .serializers import OrderSerializer, order_rows
+from apps.utils.fast_serializers import FastListMixin
+from apps.utils.exports import ExportMixin
 from django.conf import settings
 from .services import OrderService
 from apps.payment.models import Payment
 from apps.payment.serializers import PaymentSerializer
-import stripe
+from apps.payment.gateways import get_payment_gateway, PaymentGatewayError
 
-stripe.api_key = settings.STRIPE_SECRET_KEY
-
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(ExportMixin, FastListMixin, viewsets.ModelViewSet):
     serializer_class = OrderSerializer
+    row_converter = order_rows
+    export_filename = "orders"
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
@@ -103,18 +105,17 @@ class OrderViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Create PaymentIntent with Stripe
+        # Create PaymentIntent through the configured gateway (Stripe or fake)
         try:
-            intent = stripe.PaymentIntent.create(
+            intent = get_payment_gateway().create_payment_intent(
                 amount=int(order.total_amount * 100),
                 currency="usd",
                 metadata={
                     "order_id": order.id,
                     "user_id": request.user.id
                 },
-                automatic_payment_methods={"enabled": True},
             )
-        except stripe.error.StripeError as e:
+        except PaymentGatewayError as e:
             return Response(
                 {"error": "Payment processing error"}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -123,7 +124,7 @@ class OrderViewSet(viewsets.ModelViewSet):
         # Save payment in DB
         payment = Payment.objects.create(
             order=order,
-            stripe_payment_intent_id=intent["id"],
+            stripe_payment_intent_id=intent.id,
             amount=order.total_amount,
             status="pending"
         )
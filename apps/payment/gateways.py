@@ -0,0 +1,230 @@
+# apps/payment/gateways.py
+"""
+Payment gateway interface used by checkout, webhooks and reconciliation.
+
+`get_payment_gateway()` returns the configured implementation
+(settings.PAYMENT_GATEWAY = "stripe" or "fake"). The fake gateway keeps
+everything in memory and signs webhook payloads exactly like Stripe, so the
+whole payment flow can be load-tested without network access.
+"""
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import requests
+import stripe
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from apps.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+GATEWAY_CALL_TIME = metrics.histogram(
+    "payment_gateway_request_duration_seconds", "Payment gateway API calls", ["gateway", "operation"]
+)
+GATEWAY_ERRORS = metrics.counter(
+    "payment_gateway_errors_total", "Failed payment gateway API calls", ["gateway", "operation"]
+)
+
+
+class PaymentGatewayError(Exception):
+    """The gateway call failed (network error, API error, timeout...)."""
+
+
+@dataclass
+class PaymentIntentResult:
+    id: str
+    client_secret: str
+    status: str
+    amount: int
+    metadata: dict
+
+
+class PaymentGateway(ABC):
+    name = "base"
+
+    @contextmanager
+    def _timed(self, operation):
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except Exception:
+            error = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            GATEWAY_CALL_TIME.labels(self.name, operation).observe(elapsed)
+            if error:
+                GATEWAY_ERRORS.labels(self.name, operation).inc()
+            logger.debug("%s.%s took %.1fms", self.name, operation, elapsed * 1000)
+
+    @abstractmethod
+    def create_payment_intent(self, amount, currency, metadata):
+        """Create a payment intent for `amount` (in the smallest currency unit)."""
+
+    @abstractmethod
+    def retrieve_payment_intent(self, intent_id):
+        """Return the PaymentIntentResult for `intent_id` (raises PaymentGatewayError)."""
+
+    def construct_webhook_event(self, payload, sig_header):
+        """Verify the signature and return the event (raises ValueError / SignatureVerificationError)."""
+        return stripe.Webhook.construct_event(payload, sig_header, settings.STRIPE_WEBHOOK_SECRET)
+
+    @staticmethod
+    def _to_result(intent):
+        return PaymentIntentResult(
+            id=intent["id"],
+            client_secret=intent["client_secret"],
+            status=intent["status"],
+            amount=intent["amount"],
+            metadata=dict(intent["metadata"] or {}),
+        )
+
+
+class StripeGateway(PaymentGateway):
+    name = "stripe"
+
+    def __init__(self):
+        super().__init__()
+        # One pooled requests session per process, explicit timeouts and retries
+        http_client = stripe.RequestsClient(
+            timeout=(settings.STRIPE_CONNECT_TIMEOUT, settings.STRIPE_READ_TIMEOUT),
+            session=requests.Session(),
+        )
+        self.client = stripe.StripeClient(
+            settings.STRIPE_SECRET_KEY,
+            http_client=http_client,
+            max_network_retries=settings.STRIPE_MAX_NETWORK_RETRIES,
+        )
+
+    def create_payment_intent(self, amount, currency, metadata):
+        try:
+            with self._timed("create_payment_intent"):
+                intent = self.client.payment_intents.create(params={
+                    "amount": amount,
+                    "currency": currency,
+                    "metadata": metadata,
+                    "automatic_payment_methods": {"enabled": True},
+                })
+        except stripe.error.StripeError as e:
+            raise PaymentGatewayError(str(e)) from e
+        return self._to_result(intent)
+
+    def retrieve_payment_intent(self, intent_id):
+        try:
+            with self._timed("retrieve_payment_intent"):
+                intent = self.client.payment_intents.retrieve(intent_id)
+        except stripe.error.StripeError as e:
+            raise PaymentGatewayError(str(e)) from e
+        return self._to_result(intent)
+
+
+class FakeGateway(PaymentGateway):
+    """
+    In-process gateway for local benchmarks and offline development.
+    Optional latency (settings.FAKE_PAYMENT_GATEWAY_LATENCY_MS) simulates the network.
+    """
+    name = "fake"
+
+    def __init__(self):
+        super().__init__()
+        self._intents = {}
+        self._lock = threading.Lock()
+        self.latency = getattr(settings, "FAKE_PAYMENT_GATEWAY_LATENCY_MS", 0) / 1000
+
+    def _simulate_latency(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def create_payment_intent(self, amount, currency, metadata):
+        with self._timed("create_payment_intent"):
+            self._simulate_latency()
+            intent_id = f"pi_fake_{uuid.uuid4().hex[:24]}"
+            intent = {
+                "id": intent_id,
+                "object": "payment_intent",
+                "client_secret": f"{intent_id}_secret_{uuid.uuid4().hex[:16]}",
+                "status": "requires_payment_method",
+                "amount": amount,
+                "currency": currency,
+                "metadata": {key: str(value) for key, value in metadata.items()},
+            }
+            with self._lock:
+                self._intents[intent_id] = intent
+        return self._to_result(intent)
+
+    def retrieve_payment_intent(self, intent_id):
+        with self._timed("retrieve_payment_intent"):
+            self._simulate_latency()
+            with self._lock:
+                intent = self._intents.get(intent_id)
+            if intent is None:
+                raise PaymentGatewayError(f"No such payment_intent: '{intent_id}'")
+        return self._to_result(intent)
+
+    def set_intent_status(self, intent_id, status):
+        with self._lock:
+            self._intents[intent_id]["status"] = status
+
+    def build_webhook(self, intent_id, succeeded=True, order_id=None, amount=None):
+        """
+        Settle an intent and return (payload, signature_header) for POSTing to the
+        webhook endpoint. Intents from other processes can be described with
+        order_id/amount instead.
+        """
+        with self._lock:
+            intent = dict(self._intents.get(intent_id) or {
+                "id": intent_id,
+                "object": "payment_intent",
+                "amount": amount,
+                "currency": "usd",
+                "metadata": {"order_id": str(order_id)},
+            })
+            intent["status"] = "succeeded" if succeeded else "requires_payment_method"
+            if intent_id in self._intents:
+                self._intents[intent_id] = intent
+
+        event = {
+            "id": f"evt_fake_{uuid.uuid4().hex[:24]}",
+            "object": "event",
+            "type": "payment_intent.succeeded" if succeeded else "payment_intent.payment_failed",
+            "created": int(time.time()),
+            "data": {"object": intent},
+        }
+        payload = json.dumps(event)
+        return payload, sign_webhook_payload(payload, settings.STRIPE_WEBHOOK_SECRET)
+
+
+def sign_webhook_payload(payload, secret, timestamp=None):
+    """Stripe-Signature header value for `payload`, as Stripe computes it."""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    signature = hmac.new(secret.encode(), f"{timestamp}.{payload}".encode(), hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+
+GATEWAYS = {
+    "stripe": "apps.payment.gateways.StripeGateway",
+    "fake": "apps.payment.gateways.FakeGateway",
+}
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_payment_gateway():
+    """Process-wide gateway instance (so the HTTP connection pool is shared)."""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = import_string(GATEWAYS[settings.PAYMENT_GATEWAY])()
+    return _gateway
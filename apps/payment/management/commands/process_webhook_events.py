@@ -0,0 +1,33 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from apps.payment.services import process_pending_events, WEBHOOK_MAX_ATTEMPTS
+from apps.utils.metrics import registry
+
+class Command(BaseCommand):
+    help = 'Apply pending Stripe webhook events from the inbox (run several for more throughput)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--max-attempts', type=int, default=WEBHOOK_MAX_ATTEMPTS)
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting when the inbox is drained')
+        parser.add_argument('--sleep', type=float, default=1.0, help='Seconds to wait when there is nothing to do')
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            close_old_connections()
+            handled = process_pending_events(
+                batch_size=options['batch_size'],
+                max_attempts=options['max_attempts'],
+            )
+            total += handled
+            registry.maybe_flush()
+            if handled:
+                # Keep draining at full speed while there is a backlog
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {total} webhook events"))
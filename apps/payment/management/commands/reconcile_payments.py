@@ -0,0 +1,33 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from apps.payment.reconciliation import reconcile_pending_payments
+
+class Command(BaseCommand):
+    help = 'Sync pending payments older than a threshold with the payment gateway'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-minutes', type=int, default=30)
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent gateway lookups')
+        parser.add_argument('--rate', type=float, default=20, help='Max gateway calls per second (0 = unlimited)')
+        parser.add_argument('--dry-run', action='store_true', help='Report discrepancies without updating anything')
+
+    def handle(self, *args, **options):
+        stats = reconcile_pending_payments(
+            older_than=timedelta(minutes=options['older_than_minutes']),
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+            rate=options['rate'],
+            dry_run=options['dry_run'],
+        )
+
+        for line in stats['discrepancies']:
+            self.stdout.write(line)
+        summary = (
+            f"Checked {stats['checked']} payments in {stats['seconds']:.1f}s "
+            f"({stats['per_second']:.1f}/s): {stats['succeeded']} succeeded, "
+            f"{stats['failed']} failed, {stats['unchanged']} still pending, {stats['errors']} errors"
+        )
+        if options['dry_run']:
+            summary += " (dry run, nothing updated)"
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,29 @@
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apps.payment.gateways import FakeGateway
+
+class Command(BaseCommand):
+    help = 'POST a signed fake payment_intent webhook to a running server (for local load tests)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('payment_intent_id')
+        parser.add_argument('--order', type=int, required=True)
+        parser.add_argument('--amount', type=int, required=True, help='Amount in cents')
+        parser.add_argument('--failed', action='store_true', help='Send payment_failed instead of succeeded')
+        parser.add_argument('--url', default='http://localhost:8000/api/payments/webhook/')
+
+    def handle(self, *args, **options):
+        payload, signature = FakeGateway().build_webhook(
+            options['payment_intent_id'],
+            succeeded=not options['failed'],
+            order_id=options['order'],
+            amount=options['amount'],
+        )
+        response = requests.post(
+            options['url'],
+            data=payload,
+            headers={"Content-Type": "application/json", "Stripe-Signature": signature},
+            timeout=settings.STRIPE_READ_TIMEOUT,
+        )
+        self.stdout.write(f"{response.status_code} {response.reason}")
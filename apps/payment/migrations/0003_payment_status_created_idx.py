@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_orderitem_status'),
+        ('payment', '0002_webhookevent'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['status', 'created_at'], name='payment_status_created_idx'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from apps.orders.models import Order
 
 class Payment(models.Model):
@@ -12,3 +13,44 @@ class Payment(models.Model):
         ("failed", "Failed"),
     ], default="pending")
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Reconciliation scans pending payments by age
+            models.Index(fields=["status", "created_at"], name="payment_status_created_idx"),
+        ]
+
+
+class WebhookEvent(models.Model):
+    """
+    Inbox of verified Stripe webhook events. The webhook only inserts here;
+    the process_webhook_events worker applies them (with retries).
+    """
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("processed", "Processed"),
+        ("failed", "Failed"),
+    ]
+
+    event_id = models.CharField(max_length=255, unique=True)
+    event_type = models.CharField(max_length=100)
+    payload = models.JSONField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Worker queue scan: pending events that are due
+            models.Index(
+                fields=["next_attempt_at"],
+                name="webhookevent_pending_idx",
+                condition=models.Q(status="pending"),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} ({self.event_id}) - {self.status}"
@@ -0,0 +1,138 @@
+# apps/payment/reconciliation.py
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from apps.orders.models import Order
+from .services import PAYMENTS
+from .gateways import get_payment_gateway, PaymentGatewayError
+from .models import Payment
+
+logger = logging.getLogger(__name__)
+
+# Orders in any other status (shipped, cancelled, already paid...) are never touched
+AWAITING_PAYMENT_STATUS = "awaiting_payment"  # set when the payment intent is created
+
+# Gateway intent status -> local Payment status (anything else stays pending)
+INTENT_STATUS_MAP = {
+    "succeeded": "succeeded",
+    "canceled": "failed",
+}
+
+
+class RateLimiter:
+    """Thread-safe limiter allowing at most `rate` calls per second."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _iter_pending_pages(cutoff, batch_size):
+    """Keyset-paginate pending payments older than `cutoff` on (created_at, id)."""
+    queryset = (
+        Payment.objects.filter(status="pending", created_at__lt=cutoff)
+        .order_by("created_at", "id")
+        .values("id", "order_id", "stripe_payment_intent_id", "created_at")
+    )
+    last = None
+    while True:
+        page = queryset
+        if last is not None:
+            page = page.filter(
+                Q(created_at__gt=last["created_at"])
+                | Q(created_at=last["created_at"], id__gt=last["id"])
+            )
+        rows = list(page[:batch_size])
+        if not rows:
+            return
+        yield rows
+        last = rows[-1]
+
+
+def _apply_updates(updates, dry_run):
+    """
+    updates: {local_status: [payment rows]} -> bulk UPDATE per status. Only payments
+    that are still pending when locked are changed (the webhook may have settled them
+    meanwhile), and only their orders, if those are still awaiting payment.
+    """
+    if dry_run:
+        return
+    now = timezone.now()
+    order_status = {"succeeded": "paid", "failed": "payment_failed"}
+    for status, rows in updates.items():
+        if not rows:
+            continue
+        with transaction.atomic():
+            changed = list(
+                Payment.objects.select_for_update()
+                .filter(id__in=[row["id"] for row in rows], status="pending")
+                .values_list("id", "order_id")
+            )
+            if not changed:
+                continue
+            Payment.objects.filter(id__in=[payment_id for payment_id, _ in changed]).update(status=status)
+            Order.objects.filter(
+                id__in=[order_id for _, order_id in changed], status=AWAITING_PAYMENT_STATUS
+            ).update(status=order_status[status], updated_at=now)
+        PAYMENTS.labels(status, "reconciliation").inc(len(changed))
+
+
+def reconcile_pending_payments(older_than, batch_size=200, workers=8, rate=20, dry_run=False):
+    """
+    Re-check pending payments older than `older_than` (a timedelta) against the gateway.
+    Gateway lookups run concurrently in a thread pool (rate limited to `rate` calls per
+    second); all database work stays on the calling thread and is applied in bulk.
+    Returns a stats dict.
+    """
+    gateway = get_payment_gateway()
+    limiter = RateLimiter(rate)
+    stats = {"checked": 0, "succeeded": 0, "failed": 0, "unchanged": 0, "errors": 0, "discrepancies": []}
+    cutoff = timezone.now() - older_than
+    start = time.monotonic()
+
+    def lookup(row):
+        limiter.wait()
+        try:
+            return row, gateway.retrieve_payment_intent(row["stripe_payment_intent_id"]), None
+        except PaymentGatewayError as e:
+            return row, None, e
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for rows in _iter_pending_pages(cutoff, batch_size):
+            updates = {"succeeded": [], "failed": []}
+            for row, intent, error in pool.map(lookup, rows):
+                stats["checked"] += 1
+                if error is not None:
+                    stats["errors"] += 1
+                    logger.warning(f"⚠️ Could not fetch {row['stripe_payment_intent_id']}: {error}")
+                    continue
+                status = INTENT_STATUS_MAP.get(intent.status)
+                if status is None:
+                    stats["unchanged"] += 1
+                    continue
+                updates[status].append(row)
+                stats[status] += 1
+                stats["discrepancies"].append(
+                    f"payment {row['id']} (order {row['order_id']}): pending -> {status}"
+                )
+            _apply_updates(updates, dry_run)
+
+    elapsed = time.monotonic() - start
+    stats["seconds"] = elapsed
+    stats["per_second"] = stats["checked"] / elapsed if elapsed else 0.0
+    return stats
@@ -0,0 +1,146 @@
+# apps/payment/services.py
+import logging
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from apps.orders.models import Order
+from apps.utils import metrics
+from .models import Payment, WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+PAYMENTS = metrics.counter("payments_total", "Payments settled", ["status", "source"])
+WEBHOOK_EVENTS_PROCESSED = metrics.counter(
+    "webhook_events_processed_total", "Inbox events handled by the worker", ["type", "result"]
+)
+WEBHOOK_LAG = metrics.histogram(
+    "webhook_event_lag_seconds", "From the event's creation at Stripe to it being applied",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 900, 3600, 14400),
+)
+
+WEBHOOK_MAX_ATTEMPTS = 8
+WEBHOOK_BACKOFF_BASE = timedelta(seconds=5)
+WEBHOOK_BACKOFF_MAX = timedelta(hours=1)
+
+
+class PermanentEventError(Exception):
+    """The event can never be applied (bad metadata); don't retry it."""
+
+
+def record_webhook_event(event):
+    """
+    Store a verified event in the inbox with a single INSERT ... ON CONFLICT DO NOTHING.
+    Stripe retries of an already stored event (same id) are ignored by the unique index.
+    """
+    WebhookEvent.objects.bulk_create(
+        [WebhookEvent(event_id=event["id"], event_type=event["type"], payload=event)],
+        ignore_conflicts=True,
+    )
+
+
+def _get_order_id(intent):
+    order_id = intent.get("metadata", {}).get("order_id")
+    if not order_id:
+        raise PermanentEventError(f"PaymentIntent {intent['id']} has no order_id in metadata")
+    return order_id
+
+
+def handle_payment_succeeded(intent):
+    order_id = _get_order_id(intent)
+    order = Order.objects.get(id=order_id)
+
+    # Get or create payment record
+    payment, created = Payment.objects.get_or_create(
+        stripe_payment_intent_id=intent["id"],
+        defaults={
+            'order': order,
+            'amount': intent["amount"] / 100,  # Convert from cents
+            'status': "succeeded"
+        }
+    )
+
+    if not created and payment.status != "succeeded":
+        payment.status = "succeeded"
+        payment.save(update_fields=["status"])
+
+    order.status = "paid"
+    order.save(update_fields=["status", "updated_at"])
+    transaction.on_commit(PAYMENTS.labels("succeeded", "webhook").inc)
+    logger.info(f"✅ Order {order_id} marked as paid")
+
+
+def handle_payment_failed(intent):
+    order_id = _get_order_id(intent)
+    updated = Order.objects.filter(id=order_id).update(status="payment_failed", updated_at=timezone.now())
+    if not updated:
+        raise Order.DoesNotExist(f"Order {order_id} not found for failed payment")
+
+    # Update payment record if it exists
+    Payment.objects.filter(stripe_payment_intent_id=intent["id"]).update(status="failed")
+    transaction.on_commit(PAYMENTS.labels("failed", "webhook").inc)
+    logger.info(f"❌ Payment failed for order {order_id}")
+
+
+EVENT_HANDLERS = {
+    "payment_intent.succeeded": handle_payment_succeeded,
+    "payment_intent.payment_failed": handle_payment_failed,
+}
+
+
+def apply_event(payload):
+    handler = EVENT_HANDLERS.get(payload["type"])
+    if handler is not None:
+        handler(payload["data"]["object"])
+
+
+def _backoff(attempts):
+    return min(WEBHOOK_BACKOFF_BASE * (2 ** (attempts - 1)), WEBHOOK_BACKOFF_MAX)
+
+
+def process_pending_events(batch_size=100, max_attempts=WEBHOOK_MAX_ATTEMPTS):
+    """
+    Claim a batch of due events with SELECT ... FOR UPDATE SKIP LOCKED and apply them.
+    Safe to run from several worker processes at once: each one gets different rows.
+    Returns the number of events handled.
+    """
+    with transaction.atomic():
+        events = list(
+            WebhookEvent.objects.select_for_update(skip_locked=True)
+            .filter(status="pending", next_attempt_at__lte=timezone.now())
+            .order_by("next_attempt_at")[:batch_size]
+        )
+
+        results = []
+        for event in events:
+            event.attempts += 1
+            try:
+                with transaction.atomic():
+                    apply_event(event.payload)
+            except PermanentEventError as e:
+                logger.error(f"⚠️ Dropping webhook event {event.event_id}: {e}")
+                event.status = "failed"
+                event.last_error = str(e)
+            except Exception as e:
+                logger.warning(f"⚠️ Error processing webhook event {event.event_id} (attempt {event.attempts}): {e}")
+                event.last_error = str(e)
+                if event.attempts >= max_attempts:
+                    event.status = "failed"
+                else:
+                    event.next_attempt_at = timezone.now() + _backoff(event.attempts)
+            else:
+                event.status = "processed"
+                event.processed_at = timezone.now()
+                event.last_error = ""
+            results.append("retry" if event.status == "pending" else event.status)
+
+        WebhookEvent.objects.bulk_update(
+            events, ["status", "attempts", "next_attempt_at", "last_error", "processed_at"]
+        )
+
+    for event, result in zip(events, results):
+        WEBHOOK_EVENTS_PROCESSED.labels(event.event_type, result).inc()
+        if result == "processed":
+            # Stripe's own timestamp, so the lag includes delivery and inbox wait
+            created = event.payload.get("created") or event.created_at.timestamp()
+            WEBHOOK_LAG.observe(event.processed_at.timestamp() - created)
+    return len(events)
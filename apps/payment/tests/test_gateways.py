@@ -0,0 +1,81 @@
+from django.test import SimpleTestCase, TestCase
+
+from apps.payment.gateways import (
+    FakeGateway, PaymentGateway, PaymentGatewayError, get_payment_gateway,
+)
+from apps.payment.models import Payment
+from apps.utils.metrics import registry
+from apps.utils.testing import CacheClearingMixin, auth_client
+from .test_webhooks import make_order
+
+
+def sample(name, *labels):
+    return registry.collect().get((name, labels))
+
+
+class FakeGatewayTests(SimpleTestCase):
+    def setUp(self):
+        self.gateway = FakeGateway()
+
+    def test_create_and_retrieve(self):
+        intent = self.gateway.create_payment_intent(2500, "usd", {"order_id": 7})
+        self.assertTrue(intent.id.startswith("pi_fake_"))
+        self.assertTrue(intent.client_secret.startswith(f"{intent.id}_secret_"))
+        self.assertEqual(intent.metadata, {"order_id": "7"})
+
+        self.gateway.set_intent_status(intent.id, "succeeded")
+        fetched = self.gateway.retrieve_payment_intent(intent.id)
+        self.assertEqual((fetched.status, fetched.amount), ("succeeded", 2500))
+
+    def test_unknown_intent_raises_gateway_error(self):
+        with self.assertRaises(PaymentGatewayError):
+            self.gateway.retrieve_payment_intent("pi_missing")
+
+    def test_webhooks_verify_like_stripe(self):
+        intent = self.gateway.create_payment_intent(2500, "usd", {"order_id": 7})
+        payload, signature = self.gateway.build_webhook(intent.id)
+
+        event = self.gateway.construct_webhook_event(payload, signature)
+        self.assertEqual(event["type"], "payment_intent.succeeded")
+        self.assertEqual(event["data"]["object"]["metadata"]["order_id"], "7")
+        self.assertEqual(self.gateway.retrieve_payment_intent(intent.id).status, "succeeded")
+
+    def test_calls_and_errors_are_measured(self):
+        calls = sample("payment_gateway_request_duration_seconds", "fake", "retrieve_payment_intent")
+        calls = calls[-1] if calls else 0
+        errors = sample("payment_gateway_errors_total", "fake", "retrieve_payment_intent") or 0
+
+        with self.assertRaises(PaymentGatewayError):
+            self.gateway.retrieve_payment_intent("pi_missing")
+
+        self.assertEqual(
+            sample("payment_gateway_request_duration_seconds", "fake", "retrieve_payment_intent")[-1], calls + 1
+        )
+        self.assertEqual(sample("payment_gateway_errors_total", "fake", "retrieve_payment_intent"), errors + 1)
+
+    def test_incomplete_gateways_cannot_be_instantiated(self):
+        class HalfGateway(PaymentGateway):
+            def create_payment_intent(self, amount, currency, metadata):
+                pass
+
+        with self.assertRaises(TypeError):
+            HalfGateway()
+
+    def test_configured_gateway_is_shared(self):
+        gateway = get_payment_gateway()
+        self.assertIsInstance(gateway, FakeGateway)
+        self.assertIs(get_payment_gateway(), gateway)
+
+
+class CreatePaymentTests(CacheClearingMixin, TestCase):
+    def test_creates_intent_through_the_gateway(self):
+        order = make_order(status="PENDING")
+        response = auth_client(order.user).post(f"/api/orders/{order.id}/create_payment/")
+        self.assertEqual(response.status_code, 201)
+
+        payment = Payment.objects.get(order=order)
+        intent = get_payment_gateway().retrieve_payment_intent(payment.stripe_payment_intent_id)
+        self.assertEqual(intent.amount, 2500)
+        self.assertEqual(intent.metadata["order_id"], str(order.id))
+        order.refresh_from_db()
+        self.assertEqual(order.status, "awaiting_payment")
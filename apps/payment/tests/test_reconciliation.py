@@ -0,0 +1,98 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.payment.gateways import get_payment_gateway
+from apps.payment.models import Payment
+from apps.payment.reconciliation import _apply_updates, reconcile_pending_payments
+from .test_webhooks import make_order
+
+
+class ReconcilePendingPaymentsTests(TestCase):
+    def setUp(self):
+        self.gateway = get_payment_gateway()
+
+    def make_payment(self, intent_status=None, order_status="awaiting_payment", age=timedelta(hours=1)):
+        order = make_order(status=order_status)
+        intent = self.gateway.create_payment_intent(2500, "usd", {"order_id": order.id})
+        if intent_status:
+            self.gateway.set_intent_status(intent.id, intent_status)
+        payment = Payment.objects.create(order=order, stripe_payment_intent_id=intent.id, amount="25.00")
+        Payment.objects.filter(id=payment.id).update(created_at=timezone.now() - age)
+        return payment
+
+    def reconcile(self, **options):
+        return reconcile_pending_payments(timedelta(minutes=30), workers=2, rate=0, **options)
+
+    def assertSettled(self, payment, payment_status, order_status):
+        payment.refresh_from_db()
+        payment.order.refresh_from_db()
+        self.assertEqual((payment.status, payment.order.status), (payment_status, order_status))
+
+    def test_applies_gateway_outcomes(self):
+        succeeded = self.make_payment("succeeded")
+        canceled = self.make_payment("canceled")
+        waiting = self.make_payment("requires_payment_method")
+
+        stats = self.reconcile()
+
+        self.assertEqual(
+            {key: stats[key] for key in ("checked", "succeeded", "failed", "unchanged", "errors")},
+            {"checked": 3, "succeeded": 1, "failed": 1, "unchanged": 1, "errors": 0},
+        )
+        self.assertSettled(succeeded, "succeeded", "paid")
+        self.assertSettled(canceled, "failed", "payment_failed")
+        self.assertSettled(waiting, "pending", "awaiting_payment")
+
+    def test_recent_payments_are_left_to_the_webhook(self):
+        payment = self.make_payment("succeeded", age=timedelta(minutes=5))
+        self.assertEqual(self.reconcile()["checked"], 0)
+        self.assertSettled(payment, "pending", "awaiting_payment")
+
+    def test_gateway_errors_are_counted_and_skipped(self):
+        payment = self.make_payment()
+        Payment.objects.filter(id=payment.id).update(stripe_payment_intent_id="pi_unknown")
+        with self.assertLogs("apps.payment.reconciliation", "WARNING"):
+            stats = self.reconcile()
+        self.assertEqual(stats["errors"], 1)
+        self.assertSettled(payment, "pending", "awaiting_payment")
+
+    def test_dry_run_only_reports(self):
+        payment = self.make_payment("succeeded")
+        stats = self.reconcile(dry_run=True)
+        self.assertEqual(len(stats["discrepancies"]), 1)
+        self.assertSettled(payment, "pending", "awaiting_payment")
+
+    def test_walks_every_page(self):
+        payments = [self.make_payment("succeeded") for _ in range(5)]
+        self.assertEqual(self.reconcile(batch_size=2)["succeeded"], 5)
+        for payment in payments:
+            self.assertSettled(payment, "succeeded", "paid")
+
+    def test_orders_past_awaiting_payment_are_not_touched(self):
+        payment = self.make_payment("succeeded", order_status="SHIPPED")
+        self.reconcile()
+        self.assertSettled(payment, "succeeded", "SHIPPED")
+
+    def test_payments_settled_meanwhile_are_skipped(self):
+        payment = self.make_payment()
+        row = {"id": payment.id, "order_id": payment.order_id}
+        # The webhook marked it failed after the gateway lookup said succeeded
+        Payment.objects.filter(id=payment.id).update(status="failed")
+        payment.order.status = "payment_failed"
+        payment.order.save()
+
+        _apply_updates({"succeeded": [row], "failed": []}, dry_run=False)
+
+        self.assertSettled(payment, "failed", "payment_failed")
+
+    def test_command_prints_summary(self):
+        self.make_payment("succeeded")
+        out = StringIO()
+        call_command("reconcile_payments", "--dry-run", "--rate", "0", stdout=out)
+        self.assertIn("pending -> succeeded", out.getvalue())
+        self.assertIn("1 succeeded", out.getvalue())
+        self.assertIn("dry run", out.getvalue())
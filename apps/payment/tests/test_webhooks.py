@@ -0,0 +1,163 @@
+import json
+import threading
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from apps.orders.models import Order
+from apps.payment.gateways import FakeGateway, sign_webhook_payload
+from apps.payment.models import Payment, WebhookEvent
+from apps.payment.services import process_pending_events, record_webhook_event
+from apps.users.models import User
+
+
+def make_order(status="awaiting_payment", email="buyer@example.com"):
+    user = User.objects.filter(email=email).first()
+    if user is None:
+        user = User.objects.create_user(email=email, password="x", is_active=True)
+    return Order.objects.create(user=user, total_amount="25.00", status=status)
+
+
+def payment_event(order_id, succeeded=True, intent_id="pi_1", event_id="evt_1"):
+    return {
+        "id": event_id,
+        "type": "payment_intent.succeeded" if succeeded else "payment_intent.payment_failed",
+        "created": int(timezone.now().timestamp()),
+        "data": {"object": {
+            "id": intent_id,
+            "amount": 2500,
+            "metadata": {"order_id": str(order_id)} if order_id else {},
+        }},
+    }
+
+
+class WebhookViewTests(TestCase):
+    url = "/api/payments/webhook/"
+
+    def post(self, payload, signature=None):
+        signature = signature or sign_webhook_payload(payload, settings.STRIPE_WEBHOOK_SECRET)
+        return self.client.post(self.url, payload, content_type="application/json", HTTP_STRIPE_SIGNATURE=signature)
+
+    def test_stores_signed_event_once(self):
+        order = make_order()
+        payload, signature = FakeGateway().build_webhook("pi_view", order_id=order.id, amount=2500)
+        self.assertEqual(self.post(payload, signature).status_code, 200)
+        # Stripe retrying the same delivery
+        self.assertEqual(self.post(payload, signature).status_code, 200)
+
+        event = WebhookEvent.objects.get()
+        self.assertEqual(event.event_id, json.loads(payload)["id"])
+        self.assertEqual(event.status, "pending")
+        # Only stored; the worker applies it
+        order.refresh_from_db()
+        self.assertEqual(order.status, "awaiting_payment")
+
+    def test_rejects_bad_signature(self):
+        payload = json.dumps(payment_event(1))
+        with self.assertLogs("apps.payment.views", "ERROR"):
+            response = self.post(payload, signature=sign_webhook_payload(payload, "whsec_wrong"))
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(WebhookEvent.objects.exists())
+
+
+class ProcessPendingEventsTests(TestCase):
+    def test_succeeded_event_marks_order_paid(self):
+        order = make_order()
+        record_webhook_event(payment_event(order.id))
+
+        self.assertEqual(process_pending_events(), 1)
+
+        order.refresh_from_db()
+        self.assertEqual(order.status, "paid")
+        payment = Payment.objects.get(stripe_payment_intent_id="pi_1")
+        self.assertEqual(payment.status, "succeeded")
+        event = WebhookEvent.objects.get()
+        self.assertEqual((event.status, event.attempts), ("processed", 1))
+        self.assertIsNotNone(event.processed_at)
+        self.assertEqual(process_pending_events(), 0)
+
+    def test_failed_event_marks_order_and_payment_failed(self):
+        order = make_order()
+        Payment.objects.create(order=order, stripe_payment_intent_id="pi_1", amount="25.00")
+        record_webhook_event(payment_event(order.id, succeeded=False))
+
+        process_pending_events()
+
+        order.refresh_from_db()
+        self.assertEqual(order.status, "payment_failed")
+        self.assertEqual(Payment.objects.get().status, "failed")
+
+    def test_unknown_order_is_retried_with_backoff(self):
+        record_webhook_event(payment_event(order_id=999))
+
+        with self.assertLogs("apps.payment.services", "WARNING"):
+            process_pending_events()
+
+        event = WebhookEvent.objects.get()
+        self.assertEqual((event.status, event.attempts), ("pending", 1))
+        self.assertIn("does not exist", event.last_error)
+        self.assertGreater(event.next_attempt_at, timezone.now())
+        # Not due yet
+        self.assertEqual(process_pending_events(), 0)
+
+    def test_gives_up_after_max_attempts(self):
+        record_webhook_event(payment_event(order_id=999))
+        for _ in range(3):
+            WebhookEvent.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+            with self.assertLogs("apps.payment.services", "WARNING"):
+                process_pending_events(max_attempts=3)
+        event = WebhookEvent.objects.get()
+        self.assertEqual((event.status, event.attempts), ("failed", 3))
+
+    def test_event_without_order_id_fails_permanently(self):
+        record_webhook_event(payment_event(order_id=None))
+        with self.assertLogs("apps.payment.services", "ERROR"):
+            process_pending_events()
+        event = WebhookEvent.objects.get()
+        self.assertEqual((event.status, event.attempts), ("failed", 1))
+        self.assertIn("no order_id", event.last_error)
+
+    def test_one_bad_event_does_not_block_the_batch(self):
+        order = make_order()
+        record_webhook_event(payment_event(order_id=999, event_id="evt_bad", intent_id="pi_bad"))
+        record_webhook_event(payment_event(order.id, event_id="evt_good"))
+
+        with self.assertLogs("apps.payment.services", "WARNING"):
+            self.assertEqual(process_pending_events(), 2)
+
+        order.refresh_from_db()
+        self.assertEqual(order.status, "paid")
+        self.assertEqual(WebhookEvent.objects.get(event_id="evt_good").status, "processed")
+
+    def test_unhandled_event_types_are_marked_processed(self):
+        record_webhook_event({"id": "evt_other", "type": "charge.refunded", "data": {"object": {}}})
+        process_pending_events()
+        self.assertEqual(WebhookEvent.objects.get().status, "processed")
+
+
+@skipUnless(connection.vendor == "postgresql", "needs SELECT ... FOR UPDATE SKIP LOCKED")
+class ConcurrentWorkersTests(TransactionTestCase):
+    def test_workers_never_apply_the_same_event_twice(self):
+        for i in range(40):
+            order = make_order()
+            record_webhook_event(payment_event(order.id, intent_id=f"pi_{i}", event_id=f"evt_{i}"))
+
+        def worker():
+            try:
+                while process_pending_events(batch_size=5):
+                    pass
+            finally:
+                close_old_connections()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(WebhookEvent.objects.filter(status="processed", attempts=1).count(), 40)
+        self.assertEqual(Order.objects.filter(status="paid").count(), 40)
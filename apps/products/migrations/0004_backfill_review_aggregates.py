@@ -0,0 +1,45 @@
+from collections import defaultdict
+
+from django.db import migrations
+from django.db.models import Count
+
+RATING_VALUES = (1, 2, 3, 4, 5)
+
+
+def backfill_review_aggregates(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+    Review = apps.get_model('reviews', 'Review')
+
+    counts = defaultdict(dict)
+    rows = (
+        Review.objects.filter(rating__in=RATING_VALUES)
+        .values_list('product_id', 'rating')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    for product_id, rating, total in rows:
+        counts[product_id][rating] = total
+
+    products = []
+    for product in Product.objects.filter(pk__in=counts.keys()).only('id'):
+        histogram = counts[product.pk]
+        for rating in RATING_VALUES:
+            setattr(product, f'rating_{rating}_count', histogram.get(rating, 0))
+        product.review_count = sum(histogram.values())
+        product.average_rating = sum(r * n for r, n in histogram.items()) / product.review_count
+        products.append(product)
+
+    fields = ['review_count', 'average_rating'] + [f'rating_{rating}_count' for rating in RATING_VALUES]
+    Product.objects.bulk_update(products, fields, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_product_review_aggregates'),
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_review_aggregates, migrations.RunPython.noop),
+    ]
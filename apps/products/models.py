@@ -10,5 +10,19 @@ class Product(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     average_rating = models.FloatField(default=0.0)  # 🔹 added average_rating
 
+    # Denormalized review aggregates, kept up to date by apps.reviews.signals
+    review_count = models.PositiveIntegerField(default=0)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+
+    RATING_VALUES = (1, 2, 3, 4, 5)
+
+    @property
+    def rating_histogram(self):
+        return {rating: getattr(self, f"rating_{rating}_count") for rating in self.RATING_VALUES}
+
     def __str__(self):
         return self.name
@@ -1,9 +1,57 @@
+from urllib.parse import urlencode
+from django.urls import reverse
 from rest_framework import serializers
 from .models import Product
+from apps.utils.fast_serializers import RowConverter
 
 class ProductSerializer(serializers.ModelSerializer):
     class Meta:
         model = Product
         fields = ['id', 'name', 'description', 'price', 'stock', 
                  'category', 'image_url', 'created_at']
-        read_only_fields = ['id', 'created_at']
\ No newline at end of file
+        read_only_fields = ['id', 'created_at']
+
+
+# .values() fast path for the product listing
+product_rows = RowConverter(ProductSerializer)
+
+
+class ProductDetailSerializer(ProductSerializer):
+    """
+    Product with its rating summary and first page of reviews (?expand=reviews).
+    Expects the reviews to be prefetched into `latest_reviews` (page size + 1 rows).
+    """
+    rating_summary = serializers.SerializerMethodField()
+    reviews = serializers.SerializerMethodField()
+
+    class Meta(ProductSerializer.Meta):
+        fields = ProductSerializer.Meta.fields + ['rating_summary', 'reviews']
+
+    def get_rating_summary(self, obj):
+        return {
+            "average": obj.average_rating,
+            "count": obj.review_count,
+            "histogram": obj.rating_histogram,
+        }
+
+    def get_reviews(self, obj):
+        from apps.reviews.serializers import ReviewSerializer
+        from apps.reviews.views import ReviewPagination
+
+        page_size = ReviewPagination.page_size
+        reviews = obj.latest_reviews[:page_size]
+
+        next_link = None
+        if len(obj.latest_reviews) > page_size:
+            # Continue with the regular review listing (same "recent" ordering)
+            last = reviews[-1]
+            query = urlencode({
+                "product": obj.pk,
+                "cursor": ReviewPagination().encode_cursor([last.date, last.id]),
+            })
+            next_link = self.context["request"].build_absolute_uri(f"{reverse('review-list')}?{query}")
+
+        return {
+            "next": next_link,
+            "results": ReviewSerializer(reviews, many=True).data,
+        }
@@ -0,0 +1,85 @@
+from django.test import TestCase
+
+from apps.products.models import Product
+from apps.reviews.models import Review
+from apps.reviews.tests.test_permissions import make_product, make_user
+from apps.utils.testing import CacheClearingMixin, auth_client
+
+
+def add_review(product, rating, name="Ann"):
+    return Review.objects.create(
+        product=product, rating=rating, comment="ok",
+        reviewer_name=name, reviewer_email="ann@example.com",
+    )
+
+
+class RatingAggregateTests(TestCase):
+    def setUp(self):
+        self.product = make_product()
+
+    def summary(self):
+        product = Product.objects.get(pk=self.product.pk)
+        return product.review_count, product.average_rating, product.rating_histogram
+
+    def test_reviews_update_the_counters(self):
+        add_review(self.product, 5)
+        add_review(self.product, 4)
+        review = add_review(self.product, 3)
+        self.assertEqual(self.summary(), (3, 4.0, {1: 0, 2: 0, 3: 1, 4: 1, 5: 1}))
+
+        review.rating = 5
+        review.save()
+        self.assertEqual(self.summary(), (3, 14 / 3, {1: 0, 2: 0, 3: 0, 4: 1, 5: 2}))
+
+        review.delete()
+        self.assertEqual(self.summary(), (2, 4.5, {1: 0, 2: 0, 3: 0, 4: 1, 5: 1}))
+
+    def test_moving_a_review_to_another_product(self):
+        other = make_product("Desk")
+        review = add_review(self.product, 2)
+        review.product = other
+        review.save()
+
+        self.assertEqual(self.summary(), (0, 0.0, {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}))
+        other.refresh_from_db()
+        self.assertEqual((other.review_count, other.average_rating), (1, 2.0))
+
+
+class ProductDetailTests(CacheClearingMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.product = make_product()
+        self.client = auth_client(make_user())
+        self.url = f"/api/products/{self.product.id}/"
+
+    def test_plain_detail_has_no_reviews(self):
+        data = self.client.get(self.url).json()["data"]
+        self.assertEqual(data["name"], "Lamp")
+        self.assertNotIn("reviews", data)
+        self.assertNotIn("rating_summary", data)
+
+    def test_expand_reviews(self):
+        reviews = [add_review(self.product, rating=i % 5 + 1, name=f"R{i}") for i in range(21)]
+        add_review(make_product("Desk"), 1)
+
+        self.client.get(self.url)  # authenticated user's state is now cached
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {"expand": "reviews"})
+        data = response.json()["data"]
+
+        self.assertEqual(data["rating_summary"], {
+            "average": 61 / 21, "count": 21,
+            "histogram": {"1": 5, "2": 4, "3": 4, "4": 4, "5": 4},
+        })
+        newest_first = [review.id for review in reversed(reviews)]
+        self.assertEqual([review["id"] for review in data["reviews"]["results"]], newest_first[:20])
+
+        # The next link continues in the regular review listing
+        rest = self.client.get(data["reviews"]["next"]).json()["data"]
+        self.assertEqual([review["id"] for review in rest["results"]], newest_first[20:])
+        self.assertIsNone(rest["next"])
+
+    def test_expand_without_reviews(self):
+        data = self.client.get(self.url, {"expand": "reviews"}).json()["data"]
+        self.assertEqual(data["rating_summary"]["count"], 0)
+        self.assertEqual(data["reviews"], {"next": None, "results": []})
@@ -3,8 +3,10 @@ from rest_framework.decorators import action
 from rest_framework.permissions import BasePermission
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db.models import Prefetch
 from .models import Product
-from .serializers import ProductSerializer
+from .serializers import ProductSerializer, ProductDetailSerializer, product_rows
+from apps.utils.fast_serializers import FastListMixin
 
 
 class IsAdminOrReadOnly(BasePermission):
@@ -21,9 +23,10 @@ class IsAdminOrReadOnly(BasePermission):
         return request.user and request.user.is_authenticated and request.user.is_staff
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(FastListMixin, viewsets.ModelViewSet):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
+    row_converter = product_rows
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['category']
@@ -31,6 +34,27 @@ class ProductViewSet(viewsets.ModelViewSet):
     ordering_fields = ['price', 'created_at', 'name']
     ordering = ['-created_at']
 
+    def _expand_reviews(self):
+        return self.action == 'retrieve' and self.request.query_params.get('expand') == 'reviews'
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self._expand_reviews():
+            from apps.reviews.models import Review
+            from apps.reviews.views import ReviewPagination, ReviewViewSet
+
+            # First page of reviews (+1 row to know if there is a next page) in one prefetch
+            latest = Review.objects.order_by(*ReviewViewSet.SORT_ORDERINGS['recent'])
+            queryset = queryset.prefetch_related(
+                Prefetch('reviews', queryset=latest[:ReviewPagination.page_size + 1], to_attr='latest_reviews')
+            )
+        return queryset
+
+    def get_serializer_class(self):
+        if self._expand_reviews():
+            return ProductDetailSerializer
+        return super().get_serializer_class()
+
     @action(detail=False, methods=['get'], url_path='categories')
     def unique_categories(self, request):
         """
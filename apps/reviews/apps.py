@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ReviewsConfig(AppConfig):
+    name = "apps.reviews"
+
+    def ready(self):
+        from . import signals  # noqa: F401
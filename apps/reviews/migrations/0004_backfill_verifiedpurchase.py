@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def backfill_verified_purchases(apps, schema_editor):
+    OrderItem = apps.get_model('orders', 'OrderItem')
+    VerifiedPurchase = apps.get_model('reviews', 'VerifiedPurchase')
+
+    pairs = (
+        OrderItem.objects.filter(status='DELIVERED')
+        .values_list('order__user_id', 'product_id')
+        .distinct()
+    )
+    VerifiedPurchase.objects.bulk_create(
+        (VerifiedPurchase(user_id=user_id, product_id=product_id) for user_id, product_id in pairs.iterator()),
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_orderitem_status'),
+        ('reviews', '0003_verifiedpurchase'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_verified_purchases, migrations.RunPython.noop),
+    ]
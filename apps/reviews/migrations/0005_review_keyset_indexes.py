@@ -0,0 +1,22 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_product_average_rating'),
+        ('reviews', '0004_backfill_verifiedpurchase'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['product', 'date', 'id'], name='review_product_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['product', 'rating', 'date', 'id'], name='review_product_rating_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_backfill_review_aggregates'),
+        ('reviews', '0005_review_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='user',
+            field=models.ForeignKey(blank=True, help_text='Author, for reviews posted through the API (imported reviews have none)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reviews', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(fields=('product', 'user'), name='review_product_user_uniq'),
+        ),
+    ]
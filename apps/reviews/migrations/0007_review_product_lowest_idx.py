@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_backfill_review_aggregates'),
+        ('reviews', '0006_review_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['product', 'rating', '-date', '-id'], name='review_product_lowest_idx'),
+        ),
+    ]
@@ -4,11 +4,51 @@ class Review(models.Model):
     product = models.ForeignKey(
         'products.Product', on_delete=models.CASCADE, related_name='reviews'
     )
+    user = models.ForeignKey(
+        'users.User', on_delete=models.SET_NULL, null=True, blank=True, related_name='reviews',
+        help_text="Author, for reviews posted through the API (imported reviews have none)"
+    )
     rating = models.IntegerField()
     comment = models.TextField()
     reviewer_name = models.CharField(max_length=255)
     reviewer_email = models.EmailField()
     date = models.DateTimeField(auto_now_add=True) 
 
+    class Meta:
+        constraints = [
+            # One review per user and product; duplicates are rejected by this index
+            models.UniqueConstraint(fields=['product', 'user'], name='review_product_user_uniq'),
+        ]
+        indexes = [
+            # Keyset pagination of a product's reviews: most recent / by rating
+            models.Index(fields=['product', 'date', 'id'], name='review_product_date_idx'),
+            models.Index(fields=['product', 'rating', 'date', 'id'], name='review_product_rating_idx'),
+            # ?sort=lowest mixes directions (rating ASC, newest first), which needs its own index
+            models.Index(fields=['product', 'rating', '-date', '-id'], name='review_product_lowest_idx'),
+        ]
+
+    def __str__(self):
+        return f"Review for product {self.product_id} by {self.reviewer_name}"
+
+
+class VerifiedPurchase(models.Model):
+    """
+    One row per (user, product) that has been delivered to the user.
+    Filled in when order items become DELIVERED so review eligibility is a
+    single unique-index lookup instead of a join over orders.
+    """
+    user = models.ForeignKey(
+        'users.User', on_delete=models.CASCADE, related_name='verified_purchases'
+    )
+    product = models.ForeignKey(
+        'products.Product', on_delete=models.CASCADE, related_name='verified_purchases'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'product'], name='verifiedpurchase_user_product_uniq'),
+        ]
+
     def __str__(self):
-        return f"Review for {self.product.name} by {self.reviewer_name}"
+        return f"User {self.user_id} bought product {self.product_id}"
@@ -1,10 +1,15 @@
 # permissions.py in reviews
 import logging
 from rest_framework import permissions
-from apps.orders.models import OrderItem
+from apps.utils import metrics
+from .services import has_verified_purchase
 
 logger = logging.getLogger(__name__)
 
+REVIEW_PERMISSION_CHECKS = metrics.counter(
+    "review_permission_checks_total", "CanReviewProduct decisions on writes", ["result"]
+)
+
 class CanReviewProduct(permissions.BasePermission):
     """
     Allows review only if user purchased and the specific product was delivered.
@@ -20,34 +25,33 @@ class CanReviewProduct(permissions.BasePermission):
         # Ensure authenticated
         if not request.user.is_authenticated:
             self.message = "You must be logged in to review products."
+            REVIEW_PERMISSION_CHECKS.labels("anonymous").inc()
             return False
 
         # Ensure product is in the request
         product_id = request.data.get("product")
         if not product_id:
             self.message = "Product ID is required to post a review."
+            REVIEW_PERMISSION_CHECKS.labels("missing_product").inc()
             return False
 
         try:
             product_id = int(product_id)
         except (TypeError, ValueError):
             self.message = "Invalid product ID."
+            REVIEW_PERMISSION_CHECKS.labels("invalid_product").inc()
             return False
 
-        # Debugging: print/log what the system is checking
-        qs = OrderItem.objects.filter(
-            order__user=request.user,
-            product=product_id,
-            status="DELIVERED"
-        )
-
-        logger.debug("Checking delivered OrderItems for user=%s, product=%s -> %s",
-                     request.user, product_id, list(qs.values("id", "order_id", "status")))
+        # Single lookup on the (user, product) unique index of VerifiedPurchase
+        has_purchased = has_verified_purchase(request.user, product_id)
 
-        has_purchased = qs.exists()
+        logger.debug("Verified purchase check for user=%s, product=%s -> %s",
+                     request.user.pk, product_id, has_purchased)
 
         if not has_purchased:
             self.message = "You can only review products after they are delivered."
+            REVIEW_PERMISSION_CHECKS.labels("not_purchased").inc()
             return False
 
+        REVIEW_PERMISSION_CHECKS.labels("allowed").inc()
         return True
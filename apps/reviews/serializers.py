@@ -1,8 +1,15 @@
 from rest_framework import serializers
 from .models import Review
+from apps.utils.fast_serializers import RowConverter
 
 class ReviewSerializer(serializers.ModelSerializer):
     class Meta:
         model = Review
         fields = '__all__'
-        read_only_fields = ['date']
+        read_only_fields = ['date', 'user']
+        # (product, user) uniqueness is enforced by the database, not a pre-check query
+        validators = []
+
+
+# .values() fast path for review listings
+review_rows = RowConverter(ReviewSerializer)
@@ -0,0 +1,37 @@
+# apps/reviews/services.py
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+from apps.products.models import Product
+from .models import VerifiedPurchase
+
+def record_verified_purchases(user_id, product_ids):
+    """Mark products delivered to the user as verified purchases (idempotent)."""
+    VerifiedPurchase.objects.bulk_create(
+        [VerifiedPurchase(user_id=user_id, product_id=product_id) for product_id in set(product_ids)],
+        ignore_conflicts=True,
+    )
+
+def has_verified_purchase(user, product_id):
+    return VerifiedPurchase.objects.filter(user=user, product_id=product_id).exists()
+
+def update_product_rating(product_id, rating, delta):
+    """
+    Apply one review being added (delta=1) or removed (delta=-1) to the product's
+    denormalized aggregates in a single UPDATE. All SET expressions see the old row,
+    so the new average is computed from the old counts plus this change.
+    """
+    if rating not in Product.RATING_VALUES:
+        return
+
+    histogram_field = f"rating_{rating}_count"
+    new_count = F("review_count") + delta
+    new_total = sum(F(f"rating_{value}_count") * value for value in Product.RATING_VALUES) + rating * delta
+
+    Product.objects.filter(pk=product_id).update(**{
+        histogram_field: F(histogram_field) + delta,
+        "review_count": new_count,
+        "average_rating": Coalesce(
+            Cast(new_total, FloatField()) / NullIf(new_count, Value(0)),
+            Value(0.0),
+        ),
+    })
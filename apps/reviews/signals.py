@@ -0,0 +1,29 @@
+# apps/reviews/signals.py
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import Review
+from .services import update_product_rating
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_rating(sender, instance, **kwargs):
+    instance._previous = None
+    if not instance._state.adding:
+        instance._previous = (
+            Review.objects.filter(pk=instance.pk).values_list("product_id", "rating").first()
+        )
+
+
+@receiver(post_save, sender=Review)
+def add_review_to_product_rating(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous", None)
+    if not created and previous == (instance.product_id, instance.rating):
+        return
+    if previous:
+        update_product_rating(previous[0], previous[1], -1)
+    update_product_rating(instance.product_id, instance.rating, 1)
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_from_product_rating(sender, instance, **kwargs):
+    update_product_rating(instance.product_id, instance.rating, -1)
@@ -0,0 +1,54 @@
+from django.test import TestCase
+
+from apps.orders.services import OrderService
+from apps.reviews.models import Review
+from apps.utils.testing import CacheClearingMixin, auth_client
+from .test_permissions import make_product, make_user, place_order, review_data
+
+
+class ReviewIngestionTests(CacheClearingMixin, TestCase):
+    url = "/api/reviews/"
+
+    def setUp(self):
+        super().setUp()
+        self.user = make_user()
+        self.client = auth_client(self.user)
+
+    def delivered_product(self, name="Lamp"):
+        product = make_product(name)
+        OrderService.update_order_status(place_order(self.user, product), "DELIVERED")
+        return product
+
+    def post(self, product):
+        return self.client.post(self.url, review_data(product), format="json")
+
+    def test_duplicate_review_is_rejected(self):
+        product = self.delivered_product()
+        self.assertEqual(self.post(product).status_code, 201)
+
+        response = self.post(product)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("already reviewed", str(response.json()))
+        self.assertEqual(Review.objects.count(), 1)
+
+    def test_review_is_linked_to_its_author(self):
+        product = self.delivered_product()
+        self.post(product)
+        self.assertEqual(Review.objects.get().user, self.user)
+
+    def test_attempts_per_product_are_throttled(self):
+        product = self.delivered_product()
+        statuses = [self.post(product).status_code for _ in range(4)]
+        self.assertEqual(statuses, [201, 400, 400, 429])
+        # Other products are still open
+        self.assertEqual(self.post(self.delivered_product("Desk")).status_code, 201)
+
+    def test_reviews_per_user_are_throttled(self):
+        products = [self.delivered_product(f"P{i}") for i in range(11)]
+        statuses = [self.post(product).status_code for product in products]
+        self.assertEqual(statuses, [201] * 10 + [429])
+
+    def test_reading_is_not_throttled(self):
+        product = make_product()
+        for _ in range(12):
+            self.assertEqual(self.client.get(self.url, {"product": product.id}).status_code, 200)
@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.reviews.models import Review
+from apps.utils.pagination import KeysetPagination
+from apps.utils.testing import CacheClearingMixin
+from .test_permissions import make_product
+
+
+class ReviewListingTests(CacheClearingMixin, TestCase):
+    url = "/api/reviews/"
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.product = make_product()
+        now = timezone.now()
+        # Repeated ratings and dates, so pages must break ties on id
+        for i, rating in enumerate([5, 3, 3, 1, 5, 3, 4, 1]):
+            review = Review.objects.create(
+                product=self.product, rating=rating, comment="ok",
+                reviewer_name=f"R{i}", reviewer_email=f"r{i}@example.com",
+            )
+            Review.objects.filter(pk=review.pk).update(date=now - timedelta(days=i // 3))
+        Review.objects.create(
+            product=make_product("Desk"), rating=5, comment="ok",
+            reviewer_name="Other", reviewer_email="o@example.com",
+        )
+
+    def walk(self, **params):
+        """Ids of every review, following the next links three at a time."""
+        ids = []
+        response = self.client.get(self.url, {"product": self.product.id, "page_size": 3, **params})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            data = response.json()["data"]
+            self.assertLessEqual(len(data["results"]), 3)
+            ids += [review["id"] for review in data["results"]]
+            if not data["next"]:
+                return ids
+            response = self.client.get(data["next"])
+
+    def expected(self, *ordering):
+        return list(Review.objects.filter(product=self.product).order_by(*ordering).values_list("id", flat=True))
+
+    def test_recent_is_the_default(self):
+        self.assertEqual(self.walk(), self.expected("-date", "-id"))
+
+    def test_highest_and_lowest(self):
+        self.assertEqual(self.walk(sort="highest"), self.expected("-rating", "-date", "-id"))
+        self.assertEqual(self.walk(sort="lowest"), self.expected("rating", "-date", "-id"))
+
+    def test_filters_apply_to_every_page(self):
+        ids = self.walk(sort="lowest", min_rating=3)
+        self.assertEqual(ids, list(
+            Review.objects.filter(product=self.product, rating__gte=3)
+            .order_by("rating", "-date", "-id").values_list("id", flat=True)
+        ))
+
+    def test_unknown_sort_is_rejected(self):
+        response = self.client.get(self.url, {"product": self.product.id, "sort": "oldest"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("sort", str(response.json()))
+
+    def test_product_is_required(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("product", str(response.json()))
+
+    def test_bad_cursor_is_not_found(self):
+        response = self.client.get(self.url, {"product": self.product.id, "cursor": "not-base64!"})
+        self.assertEqual(response.status_code, 404)
+
+        # Well-formed cursors carrying the wrong types or shape
+        paginator = KeysetPagination()
+        for values in (["notadate", "x"], [1, 2], [None, 1], {"date": 1}, ["2024-01-01T00:00:00"]):
+            with self.subTest(values=values):
+                cursor = paginator.encode_cursor(values)
+                response = self.client.get(self.url, {"product": self.product.id, "cursor": cursor})
+                self.assertEqual(response.status_code, 404)
@@ -0,0 +1,98 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.orders.models import Order, OrderItem
+from apps.orders.services import OrderService
+from apps.products.models import Product
+from apps.reviews.models import VerifiedPurchase
+from apps.users.models import User
+from apps.utils.testing import CacheClearingMixin, auth_client
+
+
+def make_product(name="Lamp", **fields):
+    defaults = {
+        "description": "A lamp", "price": "20.00", "stock": 10,
+        "category": "home", "image_url": "https://example.com/lamp.png",
+    }
+    return Product.objects.create(name=name, **{**defaults, **fields})
+
+
+def make_user(email="reviewer@example.com", **fields):
+    return User.objects.create_user(email=email, password="x", is_active=True, **fields)
+
+
+def place_order(user, *products):
+    order = Order.objects.create(user=user, status="PENDING")
+    for product in products:
+        OrderItem.objects.create(order=order, product=product, quantity=1)
+    return order
+
+
+def review_data(product, rating=4):
+    return {
+        "product": product.id, "rating": rating, "comment": "Bright",
+        "reviewer_name": "Ann", "reviewer_email": "ann@example.com",
+    }
+
+
+class VerifiedPurchaseTests(TestCase):
+    def test_recorded_when_the_order_is_delivered(self):
+        user, lamp, desk = make_user(), make_product(), make_product("Desk")
+        order = place_order(user, lamp, desk)
+
+        OrderService.update_order_status(order, "SHIPPED")
+        self.assertFalse(VerifiedPurchase.objects.exists())
+
+        OrderService.update_order_status(order, "DELIVERED")
+        self.assertEqual(
+            set(VerifiedPurchase.objects.values_list("user_id", "product_id")),
+            {(user.id, lamp.id), (user.id, desk.id)},
+        )
+
+    def test_delivering_the_same_product_twice_is_idempotent(self):
+        user, lamp = make_user(), make_product()
+        OrderService.update_order_status(place_order(user, lamp), "DELIVERED")
+        OrderService.update_order_status(place_order(user, lamp), "DELIVERED")
+        self.assertEqual(VerifiedPurchase.objects.count(), 1)
+
+
+class CanReviewProductTests(CacheClearingMixin, TestCase):
+    url = "/api/reviews/"
+
+    def setUp(self):
+        super().setUp()
+        self.user = make_user()
+        self.product = make_product()
+        self.client = auth_client(self.user)
+
+    def assertRejected(self, response, message):
+        self.assertEqual(response.status_code, 403)
+        self.assertIn(message, str(response.json()))
+
+    def test_delivered_product_can_be_reviewed(self):
+        OrderService.update_order_status(place_order(self.user, self.product), "DELIVERED")
+        response = self.client.post(self.url, review_data(self.product), format="json")
+        self.assertEqual(response.status_code, 201)
+
+    def test_undelivered_product_cannot_be_reviewed(self):
+        OrderService.update_order_status(place_order(self.user, self.product), "SHIPPED")
+        response = self.client.post(self.url, review_data(self.product), format="json")
+        self.assertRejected(response, "after they are delivered")
+
+    def test_other_users_purchases_do_not_count(self):
+        other = make_user("other@example.com")
+        OrderService.update_order_status(place_order(other, self.product), "DELIVERED")
+        response = self.client.post(self.url, review_data(self.product), format="json")
+        self.assertRejected(response, "after they are delivered")
+
+    def test_product_is_required_and_must_be_an_id(self):
+        self.assertRejected(self.client.post(self.url, {"rating": 5}, format="json"), "Product ID is required")
+        self.assertRejected(self.client.post(self.url, {"product": "lamp"}, format="json"), "Invalid product ID")
+
+    def test_anonymous_users_cannot_post(self):
+        response = APIClient().post(self.url, review_data(self.product), format="json")
+        self.assertEqual(response.status_code, 401)
+
+    def test_reading_needs_no_purchase(self):
+        response = APIClient().get(self.url, {"product": self.product.id})
+        self.assertEqual(response.status_code, 200)
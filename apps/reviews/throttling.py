@@ -0,0 +1,20 @@
+# apps/reviews/throttling.py
+from apps.utils.throttling import SlidingWindowThrottle
+
+class ReviewCreateThrottle(SlidingWindowThrottle):
+    """Limits how many reviews one user can post overall."""
+    scope = 'review_create'
+
+    def get_cache_key(self, request, view):
+        if request.method != 'POST' or not request.user.is_authenticated:
+            return None
+        return request.user.pk
+
+class ReviewProductThrottle(SlidingWindowThrottle):
+    """Limits repeated review attempts by one user on the same product."""
+    scope = 'review_product'
+
+    def get_cache_key(self, request, view):
+        if request.method != 'POST' or not request.user.is_authenticated:
+            return None
+        return f"{request.user.pk}:{request.data.get('product')}"
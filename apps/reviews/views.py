@@ -1,16 +1,57 @@
+from django.db import IntegrityError, transaction
 from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from django_filters.rest_framework import DjangoFilterBackend
 from .models import Review
-from .serializers import ReviewSerializer
+from .serializers import ReviewSerializer, review_rows
 from .permissions import CanReviewProduct
+from .filters import ReviewFilter
+from .throttling import ReviewCreateThrottle, ReviewProductThrottle
+from apps.utils.pagination import KeysetPagination
+from apps.utils.fast_serializers import FastListMixin
+from apps.utils.exports import ExportMixin
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewPagination(KeysetPagination):
+    page_size = 20
+    max_page_size = 100
+
+class ReviewViewSet(ExportMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
+    row_converter = review_rows
+    export_filename = "reviews"
     permission_classes = [IsAuthenticatedOrReadOnly, CanReviewProduct]
+    throttle_classes = [ReviewCreateThrottle, ReviewProductThrottle]
+    pagination_class = ReviewPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ReviewFilter
+
+    # ?sort= values -> keyset ordering (each one is served by a (product, ...) index,
+    # scanned forwards or backwards)
+    SORT_ORDERINGS = {
+        'recent': ('-date', '-id'),
+        'highest': ('-rating', '-date', '-id'),
+        'lowest': ('rating', '-date', '-id'),
+    }
+
+    def get_keyset_ordering(self):
+        sort = self.request.query_params.get('sort', 'recent')
+        if sort not in self.SORT_ORDERINGS:
+            raise ValidationError({"sort": f"Must be one of: {', '.join(self.SORT_ORDERINGS)}."})
+        return self.SORT_ORDERINGS[sort]
 
     def get_queryset(self):
-        product_id = self.request.query_params.get('product')
-        if product_id:
-            return self.queryset.filter(product_id=product_id)
+        # Listings are always scoped to one product; no full-table scans
+        if self.action == 'list' and not self.request.query_params.get('product'):
+            if getattr(self, 'swagger_fake_view', False):
+                return Review.objects.none()
+            raise ValidationError({"product": "The product query parameter is required."})
         return self.queryset
+
+    def perform_create(self, serializer):
+        try:
+            with transaction.atomic():
+                serializer.save(user=self.request.user)
+        except IntegrityError:
+            raise ValidationError({"product": "You have already reviewed this product."})
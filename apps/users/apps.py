@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class UsersConfig(AppConfig):
+    name = "apps.users"
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
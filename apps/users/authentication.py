@@ -0,0 +1,107 @@
+# apps/users/authentication.py
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+# User fields that CustomRefreshToken.for_user puts in the token (claim name == field name)
+CLAIM_FIELDS = ('email', 'first_name', 'last_name', 'role', 'is_staff', 'is_superuser')
+
+# Fields that decide what a user may do. They are always read from the auth cache
+# (backed by the database), never trusted from the token.
+AUTH_STATE_FIELDS = ('is_active', 'is_staff', 'is_superuser', 'role')
+
+# Cached for users that don't exist (any more)
+NO_USER_STATE = (False, False, False, None)
+
+USER_ACTIVE_CACHE_TTL = getattr(settings, "USER_ACTIVE_CACHE_TTL", 60)
+
+
+def _auth_state_cache_key(user_id):
+    return f"users:auth_state:{user_id}"
+
+
+def get_auth_state(user_id):
+    """(is_active, is_staff, is_superuser, role) for `user_id`, cached for a short TTL."""
+    key = _auth_state_cache_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        state = User.objects.filter(pk=user_id).values_list(*AUTH_STATE_FIELDS).first() or NO_USER_STATE
+        state = tuple(state)
+        cache.set(key, state, USER_ACTIVE_CACHE_TTL)
+    return state
+
+
+def is_user_active(user_id):
+    """is_active for `user_id` (False if the user is gone)."""
+    return get_auth_state(user_id)[0]
+
+
+def clear_auth_state(user_id):
+    """
+    Drop the cached auth state so the next request reads the row again. Cleared
+    again after commit, in case a request re-cached the old row meanwhile.
+    """
+    key = _auth_state_cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def _privileges(is_staff, is_superuser, role):
+    return {
+        name for name, held in
+        (("staff", is_staff), ("superuser", is_superuser), ("admin", role == "admin"))
+        if held
+    }
+
+
+def privileges_lowered(token, state):
+    """True if the token claims a privilege the user no longer has."""
+    claimed = _privileges(token.get("is_staff"), token.get("is_superuser"), token.get("role"))
+    return not claimed <= _privileges(*state[1:])
+
+
+def user_from_claims(validated_token, state):
+    """
+    Build a User instance from the token claims and the cached auth state without a
+    query. Every field not in the token is deferred, so code that needs the full row
+    (e.g. created_at) loads it lazily, and the instance can still be used in filters,
+    FKs and save().
+    """
+    loaded = {claim: validated_token[claim] for claim in CLAIM_FIELDS}
+    loaded.update(zip(AUTH_STATE_FIELDS, state))
+    # simplejwt stores the id claim as a string
+    loaded['id'] = User._meta.pk.to_python(validated_token[api_settings.USER_ID_CLAIM])
+
+    # from_db() expects the values in concrete field order
+    field_names = [f.attname for f in User._meta.concrete_fields if f.attname in loaded]
+    return User.from_db('default', field_names, [loaded[name] for name in field_names])
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds the User from the signed claims instead of
+    fetching the row on every request. Privileges (is_active, is_staff,
+    is_superuser, role) come from a short-TTL cache that is cleared when the user
+    is saved, so a demotion applies on the next request. Tokens issued before the
+    claims were added fall back to the DB lookup.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if any(claim not in validated_token for claim in CLAIM_FIELDS):
+            return super().get_user(validated_token)
+
+        state = get_auth_state(validated_token[api_settings.USER_ID_CLAIM])
+        if not state[0]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user_from_claims(validated_token, state)
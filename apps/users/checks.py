@@ -0,0 +1,27 @@
+# apps/users/checks.py
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+# Cache backends whose data lives in one process (each gunicorn worker has its own)
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches)
+def check_otp_cache(app_configs, **kwargs):
+    """
+    Pending registrations and OTP attempt counters live only in the default cache
+    (apps.users.otp). With a per-process cache, verify_otp fails whenever it reaches
+    another worker than register did, and every worker allows its own
+    OTP_MAX_ATTEMPTS guesses.
+    """
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    message = f"Registration OTPs are kept in the default cache, which is process-local ({backend})."
+    hint = "Set REDIS_URL (or configure another shared cache backend) when running several workers."
+    if settings.DEBUG:
+        return [Warning(message, hint=hint, id="users.W001")]
+    return [Error(message, hint=hint, id="users.E001")]
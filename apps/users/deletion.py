@@ -0,0 +1,100 @@
+# apps/users/deletion.py
+"""
+Account deletion. The request only deactivates the account and queues it;
+purge_deleted_accounts then removes the user's data in bounded batches with
+set-based statements, so no request holds locks over thousands of rows.
+
+Orders (with their items and payments) are kept for accounting: a user
+with orders is anonymized instead of deleted.
+"""
+import logging
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from apps.addresses.models import Address
+from apps.cart.models import CartItem
+from apps.orders.models import Order
+from apps.reviews.models import Review, VerifiedPurchase
+from .authentication import clear_auth_state
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+
+def request_account_deletion(user_id):
+    """Deactivate the account right away and queue it for the purge worker."""
+    User.objects.filter(pk=user_id).update(is_active=False, deletion_requested_at=timezone.now())
+    # update() sends no signals; tokens must stop working on the next request
+    clear_auth_state(user_id)
+
+
+def _delete_in_batches(queryset, batch_size):
+    """DELETE the rows of `queryset` by primary key, `batch_size` rows per statement."""
+    total = 0
+    while True:
+        ids = list(queryset.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return total
+        queryset.model.objects.filter(pk__in=ids)._raw_delete(queryset.db)
+        total += len(ids)
+
+
+def _update_in_batches(queryset, batch_size, **values):
+    total = 0
+    while True:
+        ids = list(queryset.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return total
+        queryset.model.objects.filter(pk__in=ids).update(**values)
+        total += len(ids)
+
+
+def purge_account(user_id, batch_size=1000):
+    """
+    Remove everything the user owns except orders. Every step is idempotent, so an
+    interrupted purge is simply run again. Returns a {table: rows} stats dict.
+    """
+    stats = {
+        "cart_items": _delete_in_batches(CartItem.objects.filter(user_id=user_id), batch_size),
+        "verified_purchases": _delete_in_batches(VerifiedPurchase.objects.filter(user_id=user_id), batch_size),
+        # Reviews stay on the product (and in its rating), without author details
+        "reviews": _update_in_batches(
+            Review.objects.filter(user_id=user_id), batch_size,
+            user=None, reviewer_name="Deleted user", reviewer_email="",
+        ),
+        # Orders keep their row but lose the link to the deleted address
+        "order_addresses": _update_in_batches(
+            Order.objects.filter(user_id=user_id, shipping_address__isnull=False), batch_size, shipping_address=None
+        ),
+        "addresses": _delete_in_batches(Address.objects.filter(user_id=user_id), batch_size),
+        "blacklisted_tokens": _delete_in_batches(BlacklistedToken.objects.filter(token__user_id=user_id), batch_size),
+        "tokens": _delete_in_batches(OutstandingToken.objects.filter(user_id=user_id), batch_size),
+    }
+
+    if Order.objects.filter(user_id=user_id).exists():
+        user = User.objects.get(pk=user_id)
+        user.email = f"deleted-{user_id}@deleted.invalid"
+        user.first_name = ""
+        user.last_name = ""
+        user.is_active = False
+        user.deletion_requested_at = None
+        user.set_unusable_password()
+        user.save(update_fields=["email", "first_name", "last_name", "is_active", "deletion_requested_at", "password"])
+        stats["user"] = "anonymized"
+    else:
+        # Nothing heavy is left to cascade to
+        User.objects.filter(pk=user_id).delete()
+        stats["user"] = "deleted"
+    return stats
+
+
+def purge_deleted_accounts(limit=100, batch_size=1000):
+    """Purge up to `limit` queued accounts, oldest request first. Returns how many were purged."""
+    user_ids = list(
+        User.objects.filter(deletion_requested_at__isnull=False)
+        .order_by("deletion_requested_at")
+        .values_list("id", flat=True)[:limit]
+    )
+    for user_id in user_ids:
+        stats = purge_account(user_id, batch_size=batch_size)
+        logger.info(f"🗑️ Purged account {user_id}: {stats}")
+    return len(user_ids)
@@ -0,0 +1,13 @@
+# apps/users/filters.py
+import django_filters
+from .models import User
+
+class UserFilter(django_filters.FilterSet):
+    # Case-insensitive prefix match (served by the UPPER(email) pattern index)
+    email = django_filters.CharFilter(field_name='email', lookup_expr='istartswith')
+    created_after = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='gte')
+    created_before = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='lt')
+
+    class Meta:
+        model = User
+        fields = ['email', 'role', 'is_active']
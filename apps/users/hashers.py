@@ -0,0 +1,20 @@
+# apps/users/hashers.py
+"""
+Password hashers with their cost taken from settings, so it can be tuned per
+deployment. The algorithm names are Django's own: hashes stay compatible,
+and changing a cost parameter rehashes each password on its next login.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, ScryptPasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    time_cost = settings.PASSWORD_ARGON2_TIME_COST
+    memory_cost = settings.PASSWORD_ARGON2_MEMORY_COST
+    parallelism = settings.PASSWORD_ARGON2_PARALLELISM
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    work_factor = settings.PASSWORD_SCRYPT_WORK_FACTOR
+    block_size = settings.PASSWORD_SCRYPT_BLOCK_SIZE
+    parallelism = settings.PASSWORD_SCRYPT_PARALLELISM
@@ -0,0 +1,27 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from apps.users.deletion import purge_deleted_accounts
+
+class Command(BaseCommand):
+    help = 'Purge the data of accounts queued for deletion, in bounded batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100, help='Accounts per round')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per DELETE/UPDATE statement')
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting when the queue is drained')
+        parser.add_argument('--sleep', type=float, default=5.0, help='Seconds to wait when there is nothing to do')
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            close_old_connections()
+            purged = purge_deleted_accounts(limit=options['limit'], batch_size=options['batch_size'])
+            total += purged
+            if purged:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f"Purged {total} accounts"))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+class Command(BaseCommand):
+    help = 'Delete expired outstanding/blacklisted refresh tokens in bounded batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = OutstandingToken.objects.filter(expires_at__lte=now).order_by('id')
+        total = 0
+        while True:
+            ids = list(expired.values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            # Set-based deletes, children first; each batch is its own short statement
+            BlacklistedToken.objects.filter(token_id__in=ids)._raw_delete(BlacklistedToken.objects.db)
+            OutstandingToken.objects.filter(id__in=ids)._raw_delete(OutstandingToken.objects.db)
+            total += len(ids)
+            self.stdout.write(f"Deleted {total} expired tokens so far")
+
+        self.stdout.write(self.style.SUCCESS(f"Purged {total} expired tokens"))
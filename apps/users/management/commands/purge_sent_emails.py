@@ -0,0 +1,14 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from apps.users.services import purge_sent_emails
+
+class Command(BaseCommand):
+    help = 'Delete sent and failed emails from the outbox once they are older than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=float, default=7, help='Keep delivered/failed emails this many days')
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        total = purge_sent_emails(timedelta(days=options['days']), batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Purged {total} outbox emails"))
@@ -0,0 +1,31 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from apps.users.services import send_queued_emails, EMAIL_MAX_ATTEMPTS
+
+class Command(BaseCommand):
+    help = 'Deliver queued emails from the outbox in batches (run several for more throughput)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--max-attempts', type=int, default=EMAIL_MAX_ATTEMPTS)
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting when the outbox is drained')
+        parser.add_argument('--sleep', type=float, default=1.0, help='Seconds to wait when there is nothing to do')
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            close_old_connections()
+            handled = send_queued_emails(
+                batch_size=options['batch_size'],
+                max_attempts=options['max_attempts'],
+            )
+            total += handled
+            if handled:
+                # Keep draining at full speed while there is a backlog
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f"Handled {total} queued emails"))
@@ -0,0 +1,16 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:43
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='EmailOTP',
+        ),
+    ]
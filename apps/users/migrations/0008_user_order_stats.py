@@ -0,0 +1,49 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:45
+
+from django.db import migrations, models
+
+
+def create_email_prefix_index(apps, schema_editor):
+    # Matches the SQL Django emits for email__istartswith: UPPER("email"::text) LIKE ...
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS "user_email_prefix_idx" '
+        'ON "users_user" (UPPER("email"::text) text_pattern_ops)'
+    )
+
+
+def drop_email_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS "user_email_prefix_idx"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0007_delete_emailotp'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='lifetime_value',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='order_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['created_at', 'id'], name='user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['lifetime_value', 'id'], name='user_lifetime_value_idx'),
+        ),
+        migrations.RunPython(create_email_prefix_index, drop_email_prefix_index),
+    ]
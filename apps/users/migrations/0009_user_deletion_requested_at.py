@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0008_user_order_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='deletion_requested_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('deletion_requested_at__isnull', False)), fields=['deletion_requested_at'], name='user_deletion_queue_idx'),
+        ),
+    ]
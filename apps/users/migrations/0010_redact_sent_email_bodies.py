@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def redact_sent_email_bodies(apps, schema_editor):
+    # Delivered/failed emails may still contain OTPs in plain text
+    OutgoingEmail = apps.get_model("users", "OutgoingEmail")
+    OutgoingEmail.objects.filter(status__in=["sent", "failed"]).exclude(body="").update(body="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_user_deletion_requested_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(redact_sent_email_bodies, migrations.RunPython.noop),
+    ]
@@ -42,26 +42,77 @@ class User(AbstractUser):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Denormalized from non-cancelled orders (kept up to date by apps.orders.signals)
+    order_count = models.PositiveIntegerField(default=0)
+    lifetime_value = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    # Set when the user deletes their account; purge_deleted_accounts does the rest
+    deletion_requested_at = models.DateTimeField(null=True, blank=True)
+
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = []
 
     objects = CustomUserManager()  # ✅ set custom manager
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Admin directory keyset orderings (?sort=newest / top_customers).
+            # Email prefix search uses a PostgreSQL-only UPPER(email) text_pattern_ops
+            # index created in migration 0008.
+            models.Index(fields=["created_at", "id"], name="user_created_idx"),
+            models.Index(fields=["lifetime_value", "id"], name="user_lifetime_value_idx"),
+            # Purge worker queue scan
+            models.Index(
+                fields=["deletion_requested_at"],
+                name="user_deletion_queue_idx",
+                condition=models.Q(deletion_requested_at__isnull=False),
+            ),
+        ]
+
     def __str__(self):
         return self.email
     
-class EmailOTP(models.Model):
-    email = models.EmailField(unique=True)
-    otp = models.CharField(max_length=6)
+class OutgoingEmail(models.Model):
+    """
+    Email outbox. Requests only insert here; the send_queued_emails worker
+    delivers them in batches over one SMTP connection (with retries).
+    A worker claims rows by marking them "sending" until `lease_expires_at`;
+    rows of a worker that died mid-batch are picked up again after the lease.
+    """
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("sending", "Sending"),
+        ("sent", "Sent"),
+        ("failed", "Failed"),
+    ]
+
+    to_email = models.EmailField()
+    from_email = models.CharField(max_length=255)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    expires_at = models.DateTimeField()
-    
-    # Temporary data
-    password = models.CharField(max_length=128)
-    role = models.CharField(max_length=20, choices=[('customer', 'Customer'), ('admin', 'Admin')])
-    first_name = models.CharField(max_length=100, blank=True)
-    last_name = models.CharField(max_length=100, blank=True)
-    
-    def is_expired(self):
-        return timezone.now() > self.expires_at
+    sent_at = models.DateTimeField(null=True, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Worker queue scan: pending emails that are due
+            models.Index(
+                fields=["next_attempt_at"],
+                name="outgoingemail_pending_idx",
+                condition=models.Q(status="pending"),
+            ),
+            # Claims whose worker died
+            models.Index(
+                fields=["lease_expires_at"],
+                name="outgoingemail_sending_idx",
+                condition=models.Q(status="sending"),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email} ({self.status})"
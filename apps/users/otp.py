@@ -0,0 +1,72 @@
+# apps/users/otp.py
+"""
+Pending-registration store. Registration keeps the OTP and sign-up data in the
+cache (TTL = OTP lifetime) instead of a table, so nothing touches the primary
+database until the account is actually created. The OTP is stored as an HMAC
+and the password is hashed up front; a per-email counter limits guesses.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+OTP_KEY_SALT = "apps.users.otp"
+
+
+def _entry_key(email):
+    return f"otp:pending:{email.lower()}"
+
+
+def _attempts_key(email):
+    return f"otp:attempts:{email.lower()}"
+
+
+def hash_otp(email, otp):
+    return salted_hmac(OTP_KEY_SALT, f"{email.lower()}:{otp}").hexdigest()
+
+
+def store_pending_registration(email, otp, data):
+    """Replace any pending registration for `email` and reset its attempt counter."""
+    ttl = settings.OTP_TTL_SECONDS
+    cache.set(_entry_key(email), {
+        "otp": hash_otp(email, otp),
+        "password": make_password(data["password"]),
+        "role": data.get("role", "customer"),
+        "first_name": data.get("first_name", ""),
+        "last_name": data.get("last_name", ""),
+    }, ttl)
+    cache.set(_attempts_key(email), 0, ttl)
+
+
+def _count_attempt(email):
+    key = _attempts_key(email)
+    cache.add(key, 0, settings.OTP_TTL_SECONDS)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Expired between add() and incr()
+        cache.set(key, 1, settings.OTP_TTL_SECONDS)
+        return 1
+
+
+def check_otp(email, otp):
+    """
+    Return (entry, None) when `otp` matches, or (None, error message).
+    Every check counts as an attempt; after OTP_MAX_ATTEMPTS the pending
+    registration is dropped and the user has to register again.
+    """
+    entry = cache.get(_entry_key(email))
+    if entry is None:
+        return None, "OTP not found or expired."
+
+    if _count_attempt(email) > settings.OTP_MAX_ATTEMPTS:
+        discard_pending_registration(email)
+        return None, "Too many attempts. Please register again."
+
+    if not constant_time_compare(entry["otp"], hash_otp(email, otp)):
+        return None, "Invalid OTP."
+    return entry, None
+
+
+def discard_pending_registration(email):
+    cache.delete_many([_entry_key(email), _attempts_key(email)])
@@ -1,10 +1,10 @@
 from rest_framework import serializers
-from .models import User, EmailOTP
+from .models import User
+from apps.utils.fast_serializers import RowConverter
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.contrib.auth.password_validation import validate_password
-from django.contrib.auth import authenticate
 from .services import generate_tokens_for_user
 
 User = get_user_model()
@@ -27,6 +27,22 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'is_superuser']
 
 
+# AdminUserSerializer is the staff view of the user directory.
+class AdminUserSerializer(UserSerializer):
+    class Meta(UserSerializer.Meta):
+        fields = UserSerializer.Meta.fields + [
+            'is_active',
+            'is_staff',
+            'order_count',
+            'lifetime_value',
+        ]
+        read_only_fields = UserSerializer.Meta.read_only_fields + ['is_staff', 'order_count', 'lifetime_value']
+
+
+# .values() rows for the admin user export
+admin_user_rows = RowConverter(AdminUserSerializer)
+
+
 # RegisterSerializer is for input/creation like handling user registration to securely handle password
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
@@ -38,7 +54,9 @@ class RegisterSerializer(serializers.ModelSerializer):
         model = User
         fields = ['email', 'password', 'first_name', 'last_name', 'role']
         extra_kwargs = {
-            'password': {'write_only': True}
+            'password': {'write_only': True},
+            # validate_email below already checks uniqueness (one query, not two)
+            'email': {'validators': []},
         }
 
     def validate_email(self, value):
@@ -71,19 +89,20 @@ class LoginSerializer(serializers.Serializer):
         if not email or not password:
             raise serializers.ValidationError(_("Both email and password are required."))
 
-        user = authenticate(username=email, password=password)
-        
-        if not user:
-            try:
-                user_obj = User.objects.get(email=email)
-                if not user_obj.is_active:
-                    raise serializers.ValidationError(_("Account is not activated. Please check your email."))
-            except User.DoesNotExist:
-                pass
+        # One lookup and one hash; check_password() also upgrades the stored
+        # hash when PASSWORD_HASHER or its cost settings have changed
+        try:
+            user = User._default_manager.get_by_natural_key(email)
+        except User.DoesNotExist:
+            # Hash anyway so response time doesn't reveal which emails exist
+            User().set_password(password)
+            raise serializers.ValidationError(_("Invalid credentials."))
+
+        if not user.check_password(password):
             raise serializers.ValidationError(_("Invalid credentials."))
 
         if not user.is_active:
-            raise serializers.ValidationError(_("User account is disabled."))
+            raise serializers.ValidationError(_("Account is not activated. Please check your email."))
 
         tokens = generate_tokens_for_user(user)
 
@@ -104,10 +123,42 @@ class RefreshTokenSerializer(serializers.Serializer):
     refresh = serializers.CharField()
 
     def validate(self, data):
-        from rest_framework_simplejwt.tokens import RefreshToken, TokenError
+        from django.conf import settings
+        from django.utils.module_loading import import_string
+        from rest_framework_simplejwt.settings import api_settings as jwt_settings
+        from rest_framework_simplejwt.tokens import TokenError
+        from .authentication import AUTH_STATE_FIELDS, get_auth_state, privileges_lowered
 
+        token_class = import_string(settings.SIMPLE_JWT["REFRESH_TOKEN_CLASS"])
         try:
-            refresh = RefreshToken(data["refresh"])
-            return {"access": str(refresh.access_token)}
+            # Verification includes the (cached) blacklist check
+            refresh = token_class(data["refresh"])
         except TokenError:
-            raise serializers.ValidationError({"refresh": "Token is invalid or expired"})
\ No newline at end of file
+            raise serializers.ValidationError({"refresh": "Token is invalid or expired"})
+
+        state = get_auth_state(refresh.payload.get(jwt_settings.USER_ID_CLAIM))
+        if not state[0]:
+            raise serializers.ValidationError({"refresh": "No active account found for the given token."})
+
+        # A demoted user must log in again; the old token can't be used any more
+        if privileges_lowered(refresh, state):
+            refresh.blacklist()
+            raise serializers.ValidationError({"refresh": "Account permissions changed. Please log in again."})
+
+        # Rotated and access tokens carry the current privileges, not the old claims
+        for field, value in zip(AUTH_STATE_FIELDS[1:], state[1:]):
+            refresh[field] = value
+
+        result = {"access": str(refresh.access_token)}
+
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            if jwt_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            result["refresh"] = str(refresh)
+
+        return result
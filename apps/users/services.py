@@ -1,12 +1,25 @@
-from .models import User, EmailOTP
-from django.core.mail import send_mail
+from .models import User, OutgoingEmail
+from .otp import store_pending_registration, check_otp, discard_pending_registration
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
 from .tokens import CustomRefreshToken  # Import custom token
-import random
+import logging
+import secrets
 from django.utils import timezone
 from datetime import timedelta
 
+logger = logging.getLogger(__name__)
+
+EMAIL_MAX_ATTEMPTS = 6
+EMAIL_BACKOFF_BASE = timedelta(seconds=30)
+EMAIL_BACKOFF_MAX = timedelta(hours=1)
+# How long a worker owns the emails it claimed; longer than sending a whole batch takes
+EMAIL_LEASE = timedelta(minutes=10)
+
 def generate_otp():
-    return str(random.randint(100000, 999999))
+    return str(100000 + secrets.randbelow(900000))
 
 def generate_tokens_for_user(user):
     refresh = CustomRefreshToken.for_user(user)  # Use custom token
@@ -17,56 +30,158 @@ def generate_tokens_for_user(user):
 
 def send_otp_to_email(validated_data):
     otp = generate_otp()
-    expires_at = timezone.now() + timedelta(minutes=10)
-
-    # Update or create OTP entry
-    EmailOTP.objects.update_or_create(
-        email=validated_data['email'],
-        defaults={
-            'otp': otp,
-            'expires_at': expires_at,
-            'password': validated_data['password'],
-            'role': validated_data.get('role', 'customer'),
-            'first_name': validated_data.get('first_name', ''),
-            'last_name': validated_data.get('last_name', ''),
-        }
-    )
 
-    # Send email
-    send_mail(
+    # Pending sign-up lives in the cache until the OTP is verified
+    store_pending_registration(validated_data['email'], otp, validated_data)
+
+    # Queued; the send_queued_emails worker delivers it
+    queue_email(
+        to_email=validated_data['email'],
         subject="Your OTP Code",
-        message=f"Your verification code is: {otp}",
-        from_email="noreply@example.com",
-        recipient_list=[validated_data['email']],
-        fail_silently=False,
+        body=f"Your verification code is: {otp}",
     )
 
-def verify_otp_and_create_user(email, otp):
+def queue_email(to_email, subject, body, from_email=None):
+    """Add an email to the outbox (one INSERT; no SMTP work in the request)."""
+    return OutgoingEmail.objects.create(
+        to_email=to_email,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        subject=subject,
+        body=body,
+    )
+
+def _email_backoff(attempts):
+    return min(EMAIL_BACKOFF_BASE * (2 ** (attempts - 1)), EMAIL_BACKOFF_MAX)
+
+def _claim_emails(batch_size):
+    """
+    Claim due emails (and expired claims of dead workers) in one short transaction:
+    SELECT ... FOR UPDATE SKIP LOCKED, then mark them "sending" until the lease ends.
+    The attempt is counted here, so an email that crashes its worker can't loop forever.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status="pending", next_attempt_at__lte=now)
+                | Q(status="sending", lease_expires_at__lte=now)
+            )
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        if emails:
+            OutgoingEmail.objects.filter(id__in=[email.id for email in emails]).update(
+                status="sending", lease_expires_at=now + EMAIL_LEASE, attempts=F("attempts") + 1
+            )
+    for email in emails:
+        email.attempts += 1
+    return emails
+
+def _deliver(emails):
+    """Send `emails` over one backend connection. Returns {email id: exception} for failures."""
+    try:
+        connection = get_connection(fail_silently=False)
+        connection.open()
+    except Exception as e:
+        # Relay unreachable: the whole batch is retried later
+        logger.warning(f"⚠️ Could not connect to the email backend: {e}")
+        return {email.id: e for email in emails}
+
+    errors = {}
     try:
-        otp_obj = EmailOTP.objects.get(email=email)
-    except EmailOTP.DoesNotExist:
-        return None, "OTP not found."
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email,
+                to=[email.to_email],
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as e:
+                errors[email.id] = e
+    finally:
+        connection.close()
+    return errors
+
+def send_queued_emails(batch_size=50, max_attempts=EMAIL_MAX_ATTEMPTS):
+    """
+    Claim a batch of due emails, send them over a single backend connection with no
+    transaction or row lock held, then record the results. Several workers can run
+    at once. Returns the number of emails handled.
+    """
+    emails = _claim_emails(batch_size)
+    if not emails:
+        return 0
+
+    errors = _deliver(emails)
+
+    now = timezone.now()
+    sent_ids = []
+    failed = []
+    for email in emails:
+        error = errors.get(email.id)
+        if error is None:
+            sent_ids.append(email.id)
+            continue
+        logger.warning(f"⚠️ Error sending email {email.id} to {email.to_email} (attempt {email.attempts}): {error}")
+        email.last_error = str(error)
+        email.lease_expires_at = None
+        if email.attempts >= max_attempts:
+            email.status = "failed"
+            email.body = ""
+        else:
+            email.status = "pending"
+            email.next_attempt_at = now + _email_backoff(email.attempts)
+        failed.append(email)
+
+    with transaction.atomic():
+        # Bodies can hold OTPs; the outbox is not an archive
+        OutgoingEmail.objects.filter(id__in=sent_ids, status="sending").update(
+            status="sent", sent_at=now, last_error="", body="", lease_expires_at=None
+        )
+        OutgoingEmail.objects.bulk_update(
+            failed, ["status", "next_attempt_at", "last_error", "body", "lease_expires_at"]
+        )
+    return len(emails)
 
-    if otp_obj.otp != otp:
-        return None, "Invalid OTP."
-    
-    if otp_obj.is_expired():
-        return None, "OTP has expired."
+def purge_sent_emails(older_than, batch_size=5000):
+    """Delete sent and failed outbox rows created more than `older_than` ago. Returns the count."""
+    done = OutgoingEmail.objects.filter(
+        status__in=["sent", "failed"], created_at__lt=timezone.now() - older_than
+    ).order_by("id")
+    total = 0
+    while True:
+        ids = list(done.values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return total
+        OutgoingEmail.objects.filter(id__in=ids)._raw_delete(OutgoingEmail.objects.db)
+        total += len(ids)
+
+def verify_otp_and_create_user(email, otp):
+    pending, error = check_otp(email, otp)
+    if pending is None:
+        return None, error
 
     if User.objects.filter(email=email).exists():
         return None, "User already exists."
 
-    # Create user now
-    user = User.objects.create_user(
-        email=otp_obj.email,
-        password=otp_obj.password,
-        role=otp_obj.role,
-        first_name=otp_obj.first_name,
-        last_name=otp_obj.last_name,
-        is_active=True
-    )
+    # Create user now (the password was hashed at registration)
+    try:
+        user = User.objects.create(
+            email=User.objects.normalize_email(email),
+            password=pending['password'],
+            role=pending['role'],
+            first_name=pending['first_name'],
+            last_name=pending['last_name'],
+            is_active=True
+        )
+    except IntegrityError:
+        # A concurrent verification created it first
+        return None, "User already exists."
 
-    otp_obj.delete()  # Remove used OTP
+    discard_pending_registration(email)  # Remove used OTP
 
     tokens = generate_tokens_for_user(user)
     return user, tokens
\ No newline at end of file
@@ -0,0 +1,12 @@
+# apps/users/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import User
+from .authentication import clear_auth_state
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def clear_auth_state_cache(sender, instance, **kwargs):
+    # Deactivation and demotion take effect on the next request, not after the cache TTL
+    clear_auth_state(instance.pk)
@@ -0,0 +1,81 @@
+from django.test import TestCase
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.users.authentication import ClaimsJWTAuthentication, get_auth_state
+from apps.users.models import User
+from apps.users.tokens import CustomRefreshToken
+from apps.utils.testing import CacheClearingMixin, auth_client
+
+
+def make_user(email="user@example.com", **fields):
+    return User.objects.create_user(email=email, password="x", is_active=True, **fields)
+
+
+class ClaimsJWTAuthenticationTests(CacheClearingMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = make_user(first_name="Ann", is_staff=True)
+        self.token = CustomRefreshToken.for_user(self.user).access_token
+        self.authentication = ClaimsJWTAuthentication()
+
+    def test_user_is_built_from_claims(self):
+        get_auth_state(self.user.pk)
+        with self.assertNumQueries(0):
+            user = self.authentication.get_user(self.token)
+            self.assertEqual((user.pk, user.email, user.first_name), (self.user.pk, self.user.email, "Ann"))
+            self.assertTrue(user.is_staff)
+        # Fields outside the token load on access
+        with self.assertNumQueries(1):
+            self.assertEqual(user.created_at, self.user.created_at)
+
+    def test_privileges_come_from_the_database_not_the_token(self):
+        User.objects.filter(pk=self.user.pk).update(role="admin")  # no signal; cache not warm yet
+        user = self.authentication.get_user(self.token)
+        self.assertEqual(user.role, "admin")
+        self.assertTrue(user.is_staff)
+
+    def test_saving_the_user_clears_the_cached_state(self):
+        self.authentication.get_user(self.token)
+        self.user.is_staff = False
+        self.user.save()
+        self.assertFalse(self.authentication.get_user(self.token).is_staff)
+
+    def test_inactive_and_deleted_users_are_rejected(self):
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.get_user(self.token)
+
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.get_user(self.token)
+
+    def test_tokens_without_claims_fall_back_to_the_database(self):
+        token = AccessToken.for_user(self.user)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.authentication.get_user(token), self.user)
+
+
+class DemotionTests(CacheClearingMixin, TestCase):
+    def test_demoted_admin_loses_access_on_the_next_request(self):
+        admin = make_user(is_staff=True)
+        client = auth_client(admin)
+        self.assertEqual(client.get("/api/users/").status_code, 200)
+        self.assertEqual(client.get("/api/coupons/").status_code, 200)
+
+        admin.is_staff = False
+        admin.save()
+
+        self.assertEqual(client.get("/api/coupons/").status_code, 403)
+        # The directory falls back to the user's own row
+        ids = [user["id"] for user in client.get("/api/users/").json()["data"]["results"]]
+        self.assertEqual(ids, [admin.id])
+
+    def test_deactivated_user_is_logged_out(self):
+        user = make_user()
+        client = auth_client(user)
+        self.assertEqual(client.get("/api/users/me/").status_code, 200)
+        user.is_active = False
+        user.save()
+        self.assertEqual(client.get("/api/users/me/").status_code, 401)
@@ -0,0 +1,90 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.addresses.models import Address
+from apps.cart.models import CartItem
+from apps.orders.models import Order
+from apps.reviews.models import Review, VerifiedPurchase
+from apps.reviews.tests.test_permissions import make_product
+from apps.users.deletion import purge_account, request_account_deletion
+from apps.users.models import User
+from apps.users.tokens import CustomRefreshToken
+from apps.utils.testing import CacheClearingMixin, auth_client
+from .test_authentication import make_user
+
+
+class AccountDeletionTests(CacheClearingMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = make_user()
+        self.product = make_product()
+        self.address = Address.objects.create(user=self.user, city="Oslo", is_default=True)
+        CartItem.objects.create(user=self.user, product=self.product)
+        VerifiedPurchase.objects.create(user=self.user, product=self.product)
+        self.review = Review.objects.create(
+            product=self.product, user=self.user, rating=5, comment="ok",
+            reviewer_name="Ann", reviewer_email="ann@example.com",
+        )
+        CustomRefreshToken.for_user(self.user).blacklist()
+
+    def test_delete_me_deactivates_and_queues(self):
+        client = auth_client(self.user)
+        self.assertEqual(client.delete("/api/users/me/").status_code, 204)
+
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertIsNotNone(self.user.deletion_requested_at)
+        # Nothing is deleted in the request
+        self.assertTrue(Address.objects.filter(user=self.user).exists())
+        self.assertEqual(client.get("/api/users/me/").status_code, 401)
+
+    def test_user_without_orders_is_deleted(self):
+        request_account_deletion(self.user.pk)
+        stats = purge_account(self.user.pk, batch_size=1)
+
+        self.assertEqual(stats["user"], "deleted")
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(Address.objects.exists())
+        self.assertFalse(CartItem.objects.exists())
+        self.assertFalse(VerifiedPurchase.objects.exists())
+        self.assertEqual(Review.objects.get().reviewer_name, "Deleted user")
+
+    def test_user_with_orders_is_anonymized(self):
+        order = Order.objects.create(user=self.user, shipping_address=self.address, total_amount="20.00")
+        request_account_deletion(self.user.pk)
+
+        stats = purge_account(self.user.pk)
+
+        self.assertEqual(stats["user"], "anonymized")
+        user = User.objects.get(pk=self.user.pk)
+        self.assertEqual(user.email, f"deleted-{user.pk}@deleted.invalid")
+        self.assertFalse(user.has_usable_password())
+        self.assertIsNone(user.deletion_requested_at)
+        order.refresh_from_db()
+        self.assertIsNone(order.shipping_address)
+        self.assertFalse(Address.objects.exists())
+        review = Review.objects.get()
+        self.assertEqual((review.user, review.reviewer_email), (None, ""))
+        # The product keeps the rating
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.review_count, 1)
+
+    def test_purge_is_idempotent(self):
+        Order.objects.create(user=self.user, total_amount="20.00")
+        request_account_deletion(self.user.pk)
+        purge_account(self.user.pk)
+        stats = purge_account(self.user.pk)
+        self.assertEqual(stats["addresses"], 0)
+        self.assertEqual(stats["user"], "anonymized")
+
+    def test_command_purges_only_queued_accounts(self):
+        other = make_user("other@example.com")
+        request_account_deletion(self.user.pk)
+
+        out = StringIO()
+        call_command("purge_deleted_accounts", stdout=out)
+
+        self.assertIn("Purged 1", out.getvalue())
+        self.assertEqual(list(User.objects.values_list("pk", flat=True)), [other.pk])
@@ -0,0 +1,101 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.orders.models import Order
+from apps.users.models import User
+from apps.utils.pagination import KeysetPagination
+from apps.utils.testing import CacheClearingMixin, auth_client
+from .test_authentication import make_user
+
+
+class OrderAggregateTests(TestCase):
+    def test_orders_update_the_user_aggregates(self):
+        user = make_user()
+        first = Order.objects.create(user=user, total_amount=Decimal("30.00"))
+        Order.objects.create(user=user, total_amount=Decimal("12.50"))
+        user.refresh_from_db()
+        self.assertEqual((user.order_count, user.lifetime_value), (2, Decimal("42.50")))
+
+        first.total_amount = Decimal("40.00")
+        first.save()
+        user.refresh_from_db()
+        self.assertEqual(user.lifetime_value, Decimal("52.50"))
+
+        first.status = "CANCELLED"
+        first.save()
+        user.refresh_from_db()
+        self.assertEqual((user.order_count, user.lifetime_value), (1, Decimal("12.50")))
+
+        Order.objects.filter(user=user).delete()
+        user.refresh_from_db()
+        self.assertEqual((user.order_count, user.lifetime_value), (0, Decimal("0")))
+
+
+class UserDirectoryTests(CacheClearingMixin, TestCase):
+    url = "/api/users/"
+
+    def setUp(self):
+        super().setUp()
+        self.admin = make_user("admin@example.com", is_staff=True, role="admin")
+        now = timezone.now()
+        for i, (email, value) in enumerate([
+            ("ann@example.com", "10"), ("Anton@example.com", "99"), ("bob@example.com", "50"),
+            ("carl@example.com", "99"), ("dora@example.com", "0"),
+        ]):
+            user = make_user(email)
+            User.objects.filter(pk=user.pk).update(
+                lifetime_value=Decimal(value), created_at=now - timedelta(days=5 - i)
+            )
+        User.objects.filter(email="dora@example.com").update(is_active=False)
+        self.client = auth_client(self.admin)
+
+    def walk(self, **params):
+        emails = []
+        response = self.client.get(self.url, {"page_size": 2, **params})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            data = response.json()["data"]
+            emails += [user["email"] for user in data["results"]]
+            if not data["next"]:
+                return emails
+            response = self.client.get(data["next"])
+
+    def test_sorts(self):
+        def expected(*ordering):
+            return list(User.objects.order_by(*ordering).values_list("email", flat=True))
+
+        self.assertEqual(self.walk(), expected("id"))
+        self.assertEqual(self.walk(sort="newest"), expected("-created_at", "-id"))
+        self.assertEqual(self.walk(sort="top_customers"), expected("-lifetime_value", "-id"))
+        self.assertEqual(self.client.get(self.url, {"sort": "name"}).status_code, 400)
+
+    def test_mistyped_cursor_is_not_found(self):
+        for sort, values in (("oldest", ["x"]), ("newest", ["notadate", 1]), ("top_customers", ["lots", 1])):
+            with self.subTest(sort=sort):
+                cursor = KeysetPagination().encode_cursor(values)
+                self.assertEqual(self.client.get(self.url, {"sort": sort, "cursor": cursor}).status_code, 404)
+
+    def test_filters(self):
+        self.assertEqual(self.walk(email="an"), ["ann@example.com", "Anton@example.com"])
+        self.assertEqual(self.walk(role="admin"), ["admin@example.com"])
+        self.assertEqual(self.walk(is_active="false"), ["dora@example.com"])
+        since = (timezone.now() - timedelta(days=2, hours=12)).isoformat()
+        self.assertEqual(
+            self.walk(created_after=since, sort="newest"),
+            ["admin@example.com", "dora@example.com", "carl@example.com"],
+        )
+
+    def test_admin_rows_carry_the_aggregates(self):
+        row = next(user for user in self.client.get(self.url).json()["data"]["results"]
+                   if user["email"] == "bob@example.com")
+        self.assertEqual((row["order_count"], Decimal(row["lifetime_value"])), (0, Decimal("50")))
+        self.assertTrue(row["is_active"])
+
+    def test_customers_only_see_themselves(self):
+        ann = User.objects.get(email="ann@example.com")
+        results = auth_client(ann).get(self.url).json()["data"]["results"]
+        self.assertEqual([user["email"] for user in results], ["ann@example.com"])
+        self.assertNotIn("lifetime_value", results[0])
@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+
+from apps.users.hashers import TunedScryptPasswordHasher
+from apps.users.models import User
+from apps.utils.testing import CacheClearingMixin
+
+PASSWORD = "c0rrect-Horse-battery"
+SCRYPT = ["apps.users.hashers.TunedScryptPasswordHasher"]
+
+
+class LoginTests(CacheClearingMixin, TestCase):
+    url = "/api/auth/login/"
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(email="ann@example.com", password=PASSWORD, is_active=True)
+
+    def login(self, email="ann@example.com", password=PASSWORD, **extra):
+        return self.client.post(self.url, {"email": email, "password": password}, **extra)
+
+    def test_success_returns_tokens(self):
+        response = self.login()
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual(data["user"]["id"], self.user.id)
+        self.assertEqual(set(data["tokens"]), {"access", "refresh"})
+
+    def test_wrong_password_and_unknown_email_look_the_same(self):
+        wrong = self.login(password="nope").json()
+        unknown = self.login(email="nobody@example.com").json()
+        self.assertIn("Invalid credentials", str(wrong))
+        self.assertEqual(wrong, unknown)
+
+    def test_unknown_email_still_hashes(self):
+        with mock.patch.object(User, "set_password", autospec=True) as set_password:
+            self.login(email="nobody@example.com")
+        set_password.assert_called_once()
+
+    def test_inactive_account(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertIn("not activated", str(self.login().json()))
+
+    def test_outdated_hash_is_upgraded_on_login(self):
+        User.objects.filter(pk=self.user.pk).update(password=make_password(PASSWORD, hasher="pbkdf2_sha1"))
+        self.assertEqual(self.login().status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("md5$"))
+
+    def test_attempts_per_email_are_throttled(self):
+        statuses = [self.login(email="Ann@example.com ", password="nope").status_code for _ in range(10)]
+        self.assertEqual(set(statuses), {400})
+        # Right password, but the account has had its 10 tries this hour
+        self.assertEqual(self.login().status_code, 429)
+
+    def test_attempts_per_ip_are_throttled(self):
+        for i in range(30):
+            self.login(email=f"user{i}@example.com")
+        self.assertEqual(self.login().status_code, 429)
+        self.assertEqual(self.login(REMOTE_ADDR="10.0.0.2").status_code, 200)
+
+
+@override_settings(PASSWORD_HASHERS=SCRYPT)
+class TunedHasherTests(TestCase):
+    def test_changing_the_cost_rehashes(self):
+        with mock.patch.object(TunedScryptPasswordHasher, "work_factor", 2 ** 10):
+            user = User.objects.create_user(email="ann@example.com", password=PASSWORD, is_active=True)
+        old_hash = user.password
+        self.assertIn("$1024$", old_hash)
+
+        self.assertTrue(user.check_password(PASSWORD))  # upgrades and saves
+        user.refresh_from_db()
+        self.assertNotEqual(user.password, old_hash)
+        self.assertIn(f"${TunedScryptPasswordHasher.work_factor}$", user.password)
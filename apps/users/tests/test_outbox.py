@@ -0,0 +1,141 @@
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.management import call_command
+from django.db import close_old_connections, connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from apps.users.models import OutgoingEmail
+from apps.users.services import EMAIL_LEASE, queue_email, send_queued_emails
+
+
+def fail_for(*addresses):
+    """EmailMessage.send replacement that fails for the given recipients."""
+    def send(message, fail_silently=False):
+        if message.to[0] in addresses:
+            raise ConnectionError("550 mailbox unavailable")
+        mail.outbox.append(message)
+        return 1
+    return mock.patch.object(EmailMessage, "send", autospec=True, side_effect=send)
+
+
+class SendQueuedEmailsTests(TestCase):
+    def test_queueing_sends_nothing(self):
+        queue_email("a@example.com", "Hi", "Hello")
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutgoingEmail.objects.get().status, "pending")
+
+    def test_sends_due_emails(self):
+        queue_email("a@example.com", "Hi", "Hello")
+        queue_email("b@example.com", "Later", "Not yet")
+        OutgoingEmail.objects.filter(to_email="b@example.com").update(
+            next_attempt_at=timezone.now() + timedelta(minutes=5)
+        )
+
+        self.assertEqual(send_queued_emails(), 1)
+
+        self.assertEqual([(m.to, m.subject, m.body) for m in mail.outbox], [(["a@example.com"], "Hi", "Hello")])
+        email = OutgoingEmail.objects.get(to_email="a@example.com")
+        self.assertEqual((email.status, email.attempts, email.lease_expires_at), ("sent", 1, None))
+        self.assertIsNotNone(email.sent_at)
+        self.assertEqual(send_queued_emails(), 0)
+
+    def test_failures_are_retried_with_backoff(self):
+        queue_email("a@example.com", "Hi", "Hello")
+        queue_email("bad@example.com", "Hi", "Hello")
+
+        with fail_for("bad@example.com"), self.assertLogs("apps.users.services", "WARNING"):
+            send_queued_emails()
+
+        self.assertEqual(OutgoingEmail.objects.get(to_email="a@example.com").status, "sent")
+        bad = OutgoingEmail.objects.get(to_email="bad@example.com")
+        self.assertEqual((bad.status, bad.attempts), ("pending", 1))
+        self.assertIn("550", bad.last_error)
+        self.assertGreater(bad.next_attempt_at, timezone.now())
+        self.assertEqual(send_queued_emails(), 0)
+
+    def test_gives_up_after_max_attempts(self):
+        queue_email("bad@example.com", "Hi", "Hello")
+        with fail_for("bad@example.com"), self.assertLogs("apps.users.services", "WARNING"):
+            for _ in range(2):
+                OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+                send_queued_emails(max_attempts=2)
+        email = OutgoingEmail.objects.get()
+        self.assertEqual((email.status, email.attempts), ("failed", 2))
+
+    def test_unreachable_backend_retries_the_whole_batch(self):
+        queue_email("a@example.com", "Hi", "Hello")
+        queue_email("b@example.com", "Hi", "Hello")
+        with mock.patch("apps.users.services.get_connection", side_effect=OSError("refused")), \
+                self.assertLogs("apps.users.services", "WARNING"):
+            self.assertEqual(send_queued_emails(), 2)
+        self.assertEqual(list(OutgoingEmail.objects.values_list("status", "attempts")), [("pending", 1)] * 2)
+
+    def test_expired_claims_are_taken_over(self):
+        queue_email("a@example.com", "Hi", "Hello")
+        queue_email("b@example.com", "Hi", "Hello")
+        now = timezone.now()
+        # a: claimed by a worker that died; b: claimed by a live worker
+        OutgoingEmail.objects.filter(to_email="a@example.com").update(
+            status="sending", attempts=1, lease_expires_at=now - timedelta(seconds=1)
+        )
+        OutgoingEmail.objects.filter(to_email="b@example.com").update(
+            status="sending", attempts=1, lease_expires_at=now + EMAIL_LEASE
+        )
+
+        self.assertEqual(send_queued_emails(), 1)
+
+        self.assertEqual([m.to for m in mail.outbox], [["a@example.com"]])
+        a = OutgoingEmail.objects.get(to_email="a@example.com")
+        self.assertEqual((a.status, a.attempts), ("sent", 2))
+        self.assertEqual(OutgoingEmail.objects.get(to_email="b@example.com").status, "sending")
+
+    def test_no_transaction_is_open_while_sending(self):
+        queue_email("a@example.com", "Hi", "Hello")
+        seen = []
+
+        def send(message, fail_silently=False):
+            seen.append((OutgoingEmail.objects.get().status, list(connection.savepoint_ids)))
+            return 1
+
+        # Savepoints beyond the test case's own would mean the claim is still open
+        outer = list(connection.savepoint_ids)
+        with mock.patch.object(EmailMessage, "send", autospec=True, side_effect=send):
+            send_queued_emails()
+        self.assertEqual(seen, [("sending", outer)])
+
+    def test_command_drains_the_outbox(self):
+        for i in range(5):
+            queue_email(f"{i}@example.com", "Hi", "Hello")
+        out = StringIO()
+        call_command("send_queued_emails", "--batch-size", "2", stdout=out)
+        self.assertIn("Handled 5", out.getvalue())
+        self.assertEqual(len(mail.outbox), 5)
+
+
+@skipUnless(connection.vendor == "postgresql", "needs SELECT ... FOR UPDATE SKIP LOCKED")
+class ConcurrentSendersTests(TransactionTestCase):
+    def test_each_email_is_sent_once(self):
+        for i in range(30):
+            queue_email(f"{i}@example.com", "Hi", "Hello")
+
+        def worker():
+            try:
+                while send_queued_emails(batch_size=4):
+                    pass
+            finally:
+                close_old_connections()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), sorted(f"{i}@example.com" for i in range(30)))
+        self.assertEqual(OutgoingEmail.objects.filter(status="sent", attempts=1).count(), 30)
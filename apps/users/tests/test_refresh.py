@@ -0,0 +1,110 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.users import tokens
+from apps.users.tokens import CustomRefreshToken, is_jti_blacklisted
+from apps.utils.testing import CacheClearingMixin
+from .test_authentication import make_user
+
+
+class RefreshTests(CacheClearingMixin, TestCase):
+    url = "/api/auth/refresh/"
+
+    def setUp(self):
+        super().setUp()
+        tokens._local_blacklist.clear()
+        self.client = APIClient()
+        self.user = make_user()
+        self.refresh = str(CustomRefreshToken.for_user(self.user))
+
+    def post(self, refresh=None):
+        return self.client.post(self.url, {"refresh": refresh or self.refresh}, format="json")
+
+    def test_rotates_and_blacklists_the_old_token(self):
+        response = self.post()
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual(AccessToken(data["access"])["user_id"], str(self.user.pk))
+        self.assertNotEqual(data["refresh"], self.refresh)
+
+        self.assertEqual(self.post().status_code, 400)
+        self.assertEqual(self.post(data["refresh"]).status_code, 200)
+
+    def test_promotion_is_carried_into_new_tokens(self):
+        self.user.is_staff = True
+        self.user.role = "admin"
+        self.user.save()
+
+        data = self.post().json()["data"]
+        for token in (AccessToken(data["access"]), RefreshToken(data["refresh"])):
+            self.assertEqual((token["is_staff"], token["role"]), (True, "admin"))
+
+    def test_demoted_user_must_log_in_again(self):
+        self.user.is_staff = True
+        self.user.save()
+        refresh = CustomRefreshToken.for_user(self.user)
+        self.user.is_staff = False
+        self.user.save()
+
+        response = self.post(str(refresh))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("log in again", str(response.json()))
+        self.assertTrue(BlacklistedToken.objects.filter(token__jti=refresh["jti"]).exists())
+
+    def test_inactive_user_is_rejected(self):
+        self.user.is_active = False
+        self.user.save()
+        response = self.post()
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("No active account", str(response.json()))
+
+    def test_rows_added_outside_the_api_are_honoured(self):
+        # e.g. through the simplejwt admin, with nothing in the caches
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=RefreshToken(self.refresh)["jti"]))
+
+        response = self.post()
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Token is invalid or expired", str(response.json()))
+
+    def test_garbage_token_is_rejected(self):
+        self.assertEqual(self.post("not-a-token").status_code, 400)
+
+
+class BlacklistLookupTests(CacheClearingMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        tokens._local_blacklist.clear()
+        self.token = CustomRefreshToken.for_user(make_user())
+        self.token.blacklist()
+        self.jti = self.token["jti"]
+
+    def test_tiers(self):
+        with self.assertNumQueries(0):
+            self.assertTrue(is_jti_blacklisted(self.jti))
+
+        tokens._local_blacklist.clear()  # another process
+        with self.assertNumQueries(0):
+            self.assertTrue(is_jti_blacklisted(self.jti))
+
+        cache.clear()  # shared cache lost its entry
+        with self.assertNumQueries(1):
+            self.assertTrue(is_jti_blacklisted(self.jti))
+
+        # ...and cached again
+        with self.assertNumQueries(0):
+            self.assertTrue(is_jti_blacklisted(self.jti))
+
+    def test_unknown_jti_is_checked_once_then_cached(self):
+        with self.assertNumQueries(1):
+            self.assertFalse(is_jti_blacklisted("unknown"))
+        with self.assertNumQueries(0):
+            self.assertFalse(is_jti_blacklisted("unknown"))
+
+    def test_rotation_overrides_a_cached_negative_answer(self):
+        token = CustomRefreshToken.for_user(make_user("other@example.com"))
+        self.assertFalse(is_jti_blacklisted(token["jti"]))
+        token.blacklist()
+        self.assertTrue(is_jti_blacklisted(token["jti"]))
@@ -0,0 +1,109 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.users import otp
+from apps.users.checks import check_otp_cache
+from apps.users.models import OutgoingEmail, User
+from apps.users.services import queue_email, send_queued_emails
+from apps.utils.testing import CacheClearingMixin
+
+PASSWORD = "c0rrect-Horse-battery"
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class RegistrationTests(CacheClearingMixin, TestCase):
+    def register(self, email="new@example.com", code="123456"):
+        with mock.patch("apps.users.services.generate_otp", return_value=code):
+            return self.client.post("/api/auth/register/", {
+                "email": email, "password": PASSWORD, "first_name": "Ann", "role": "customer",
+            })
+
+    def verify(self, code="123456", email="new@example.com"):
+        return self.client.post("/api/auth/verify_otp/", {"email": email, "otp": code})
+
+    def test_register_then_verify(self):
+        self.assertEqual(self.register().status_code, 200)
+        self.assertFalse(User.objects.exists())
+        self.assertIn("123456", OutgoingEmail.objects.get(to_email="new@example.com").body)
+
+        response = self.verify()
+        self.assertEqual(response.status_code, 201)
+        self.assertIn("access", response.json()["data"]["tokens"])
+        user = User.objects.get(email="new@example.com")
+        self.assertTrue(user.is_active)
+        self.assertEqual(user.first_name, "Ann")
+        self.assertTrue(user.check_password(PASSWORD))
+        # The code is single use
+        self.assertIn("not found", str(self.verify().json()))
+
+    def test_cache_holds_no_plain_otp_or_password(self):
+        self.register()
+        entry = cache.get(otp._entry_key("new@example.com"))
+        self.assertNotIn("123456", str(entry))
+        self.assertNotIn(PASSWORD, str(entry))
+
+    def test_wrong_codes_are_limited(self):
+        self.register()
+        for _ in range(5):
+            self.assertIn("Invalid OTP", str(self.verify("000000").json()))
+        self.assertIn("Too many attempts", str(self.verify().json()))
+        self.assertFalse(User.objects.exists())
+        # Registering again starts over
+        self.register(code="654321")
+        self.assertEqual(self.verify("654321").status_code, 201)
+
+    def test_new_registration_replaces_the_old_code(self):
+        self.register(code="111111")
+        self.register(code="222222")
+        self.assertIn("Invalid OTP", str(self.verify("111111").json()))
+        self.assertEqual(self.verify("222222").status_code, 201)
+
+    def test_existing_email_cannot_register(self):
+        User.objects.create_user(email="new@example.com", password=PASSWORD)
+        self.assertEqual(self.register().status_code, 400)
+        self.assertFalse(OutgoingEmail.objects.exists())
+
+
+class OTPCacheCheckTests(TestCase):
+    @override_settings(CACHES=LOCMEM, DEBUG=False)
+    def test_process_local_cache_is_an_error_in_production(self):
+        self.assertEqual([error.id for error in check_otp_cache(None)], ["users.E001"])
+
+    @override_settings(CACHES=LOCMEM, DEBUG=True)
+    def test_process_local_cache_is_a_warning_in_debug(self):
+        self.assertEqual([error.id for error in check_otp_cache(None)], ["users.W001"])
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}})
+    def test_shared_cache_passes(self):
+        self.assertEqual(check_otp_cache(None), [])
+
+
+class OutboxRetentionTests(TestCase):
+    def test_bodies_are_cleared_once_handled(self):
+        queue_email("a@example.com", "Your OTP Code", "Your verification code is: 123456")
+        send_queued_emails()
+        self.assertEqual(OutgoingEmail.objects.get().body, "")
+
+    def test_purge_deletes_old_handled_emails(self):
+        for address, status in [("sent@example.com", "sent"), ("failed@example.com", "failed"),
+                                ("pending@example.com", "pending"), ("new@example.com", "sent")]:
+            queue_email(address, "Hi", "Hello")
+            OutgoingEmail.objects.filter(to_email=address).update(status=status)
+        OutgoingEmail.objects.exclude(to_email="new@example.com").update(
+            created_at=timezone.now() - timedelta(days=8)
+        )
+
+        out = StringIO()
+        call_command("purge_sent_emails", "--batch-size", "1", stdout=out)
+
+        self.assertIn("Purged 2", out.getvalue())
+        self.assertEqual(
+            sorted(OutgoingEmail.objects.values_list("to_email", flat=True)),
+            ["new@example.com", "pending@example.com"],
+        )
@@ -0,0 +1,19 @@
+# apps/users/throttling.py
+from apps.utils.throttling import SlidingWindowThrottle
+
+class LoginIPThrottle(SlidingWindowThrottle):
+    """Limits login attempts per client IP (checked before any password hashing)."""
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.get_ident(request)
+
+class LoginEmailThrottle(SlidingWindowThrottle):
+    """Limits login attempts against one account, whichever IPs they come from."""
+    scope = 'login_email'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email')
+        if not isinstance(email, str) or not email:
+            return None
+        return email.strip().lower()
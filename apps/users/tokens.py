@@ -1,4 +1,57 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from apps.utils.cache import LRUCache
+from apps.utils.metrics import CACHE_LOOKUPS
+
+# Blacklisted JTIs seen by this process; entries never need invalidating
+_local_blacklist = LRUCache(maxsize=100_000, ttl=api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+
+
+def _blacklist_cache_key(jti):
+    return f"jwt:blacklisted:{jti}"
+
+
+def mark_jti_blacklisted(jti, exp):
+    """Remember a blacklisted JTI in both cache tiers until the token expires anyway."""
+    ttl = exp - time.time()
+    if ttl <= 0:
+        return
+    _local_blacklist.set(jti, True, ttl=ttl)
+    cache.set(_blacklist_cache_key(jti), True, int(ttl) + 1)
+
+
+def is_jti_blacklisted(jti):
+    """
+    In-process set, then the shared cache, then the database. The table stays the
+    source of truth: a cache miss (eviction, flush, rows added through the admin)
+    is answered by the indexed lookup, and a "not blacklisted" answer is cached
+    for JWT_BLACKLIST_NEGATIVE_CACHE_TTL seconds only.
+    """
+    if _local_blacklist.get(jti):
+        CACHE_LOOKUPS.labels("jwt_blacklist", "local").inc()
+        return True
+    cached = cache.get(_blacklist_cache_key(jti))
+    if cached is not None:
+        CACHE_LOOKUPS.labels("jwt_blacklist", "shared").inc()
+        return cached
+
+    CACHE_LOOKUPS.labels("jwt_blacklist", "database").inc()
+    expires_at = BlacklistedToken.objects.filter(token__jti=jti).values_list("token__expires_at", flat=True).first()
+    if expires_at is not None:
+        mark_jti_blacklisted(jti, expires_at.timestamp())
+        return True
+    cache.set(_blacklist_cache_key(jti), False, getattr(settings, "JWT_BLACKLIST_NEGATIVE_CACHE_TTL", 30))
+    return False
+
 
 class CustomRefreshToken(RefreshToken):
     @classmethod
@@ -9,4 +62,33 @@ class CustomRefreshToken(RefreshToken):
         token['first_name'] = user.first_name
         token['last_name'] = user.last_name
         token['email'] = user.email
-        return token
\ No newline at end of file
+        # Lets ClaimsJWTAuthentication build request.user without a query
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
+        return token
+
+    def _outstanding_fields(self):
+        return {
+            "user_id": self.payload.get(api_settings.USER_ID_CLAIM),
+            "created_at": self.current_time,
+            "token": str(self),
+            "expires_at": datetime_from_epoch(self.payload["exp"]),
+        }
+
+    def check_blacklist(self):
+        if is_jti_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        """Blacklist without loading the user row; also records the JTI in the caches."""
+        jti = self.payload[api_settings.JTI_CLAIM]
+        token, _created = OutstandingToken.objects.get_or_create(jti=jti, defaults=self._outstanding_fields())
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=token)], ignore_conflicts=True)
+        mark_jti_blacklisted(jti, self.payload["exp"])
+
+    def outstand(self):
+        """Record the rotated token with a single INSERT ... ON CONFLICT DO NOTHING."""
+        OutstandingToken.objects.bulk_create(
+            [OutstandingToken(jti=self.payload[api_settings.JTI_CLAIM], **self._outstanding_fields())],
+            ignore_conflicts=True,
+        )
@@ -1,11 +1,19 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from .serializers import RegisterSerializer, VerifyOTPSerializer, UserSerializer,LoginSerializer, RefreshTokenSerializer
+from django_filters.rest_framework import DjangoFilterBackend
+from .serializers import RegisterSerializer, VerifyOTPSerializer, UserSerializer, AdminUserSerializer, LoginSerializer, RefreshTokenSerializer, admin_user_rows
+from .filters import UserFilter
+from .deletion import request_account_deletion
 from .services import send_otp_to_email, verify_otp_and_create_user
+from .throttling import LoginIPThrottle, LoginEmailThrottle
 from django.contrib.auth import get_user_model
 from apps.utils.responses import success_response, error_response
+from apps.utils.pagination import KeysetPagination
+from apps.utils.exports import ExportMixin
+from apps.utils import metrics
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
@@ -13,17 +21,48 @@ from drf_yasg import openapi
 
 User = get_user_model()
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserPagination(KeysetPagination):
+    page_size = 50
+    max_page_size = 500
+
+class UserViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = User.objects.all().order_by("id")
     serializer_class = UserSerializer
+    row_converter = admin_user_rows
+    export_filename = "users"
     permission_classes = [IsAuthenticated]
+    pagination_class = UserPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = UserFilter
+
+    # ?sort= values -> keyset ordering (each one is served by an index)
+    SORT_ORDERINGS = {
+        'oldest': ('id',),
+        'newest': ('-created_at', '-id'),
+        'top_customers': ('-lifetime_value', '-id'),
+    }
+
+    def get_keyset_ordering(self):
+        sort = self.request.query_params.get('sort', 'oldest')
+        if sort not in self.SORT_ORDERINGS:
+            raise ValidationError({"sort": f"Must be one of: {', '.join(self.SORT_ORDERINGS)}."})
+        return self.SORT_ORDERINGS[sort]
+
+    def _is_admin(self):
+        return self.request.user.is_staff or self.request.user.is_superuser
+
+    def get_serializer_class(self):
+        # /users/me stays on the plain serializer (request.user comes from token claims)
+        if self.action != 'me' and (getattr(self, 'swagger_fake_view', False) or self._is_admin()):
+            return AdminUserSerializer
+        return UserSerializer
 
     def get_queryset(self):
         # Handle Swagger schema generation
         if getattr(self, 'swagger_fake_view', False):
             return User.objects.none()
             
-        if self.request.user.is_staff or self.request.user.is_superuser:
+        if self._is_admin():
             return User.objects.all().order_by("id")
         return User.objects.filter(id=self.request.user.id)
 
@@ -41,8 +80,9 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     @swagger_auto_schema(
         method='delete',
-        operation_description="Delete (or deactivate) the currently authenticated user account.",
-        responses={204: "Account successfully deleted"},
+        operation_description="Delete the currently authenticated user account. The account is deactivated "
+                              "immediately; its data is purged in the background.",
+        responses={204: "Account scheduled for deletion"},
     )
     @action(detail=False, methods=["get", "patch", "delete"], url_path="me")
     def me(self, request):
@@ -53,6 +93,9 @@ class UserViewSet(viewsets.ModelViewSet):
             return Response(serializer.data)
             
         elif request.method == "PATCH":
+            # request.user is built from token claims; save through the real row so
+            # possibly stale claims (role, is_staff...) are never written back
+            user = User.objects.get(pk=user.pk)
             serializer = self.get_serializer(
                 user, data=request.data, partial=True
             )
@@ -61,12 +104,16 @@ class UserViewSet(viewsets.ModelViewSet):
             return Response(serializer.data)
             
         elif request.method == "DELETE":
-            user.delete()  # or soft-delete if you prefer
+            # Deactivate now; purge_deleted_accounts removes the data in batches
+            request_account_deletion(user.pk)
             return Response(status=status.HTTP_204_NO_CONTENT)
     
 
 
 
+AUTH_REQUESTS = metrics.counter("auth_requests_total", "Auth endpoint outcomes", ["endpoint", "result"])
+
+
 class AuthViewSet(viewsets.ViewSet):
     permission_classes = [AllowAny]
 
@@ -84,11 +131,14 @@ class AuthViewSet(viewsets.ViewSet):
         if serializer.is_valid():
             try:
                 send_otp_to_email(serializer.validated_data)
+                AUTH_REQUESTS.labels("register", "success").inc()
                 return success_response(
                     message="OTP sent to email. Please verify to complete registration."
                 )
             except Exception as e:
+                AUTH_REQUESTS.labels("register", "error").inc()
                 return error_response(message="Failed to send OTP", errors=str(e))
+        AUTH_REQUESTS.labels("register", "invalid").inc()
         return error_response(errors=serializer.errors)
 
     @swagger_auto_schema(
@@ -116,17 +166,20 @@ class AuthViewSet(viewsets.ViewSet):
                     }
                 }
             ),
-            400: "Invalid credentials"
+            400: "Invalid credentials",
+            429: "Too many login attempts"
         }
     )
-    @action(detail=False, methods=['post'])
+    @action(detail=False, methods=['post'], throttle_classes=[LoginIPThrottle, LoginEmailThrottle])
     def login(self, request):
         serializer = LoginSerializer(data=request.data)
         if serializer.is_valid():
+            AUTH_REQUESTS.labels("login", "success").inc()
             return success_response(
                 data=serializer.validated_data,
                 message="Login successful"
             )
+        AUTH_REQUESTS.labels("login", "invalid").inc()
         return error_response(errors=serializer.errors, message="Login failed")
 
     @swagger_auto_schema(
@@ -146,11 +199,14 @@ class AuthViewSet(viewsets.ViewSet):
             try:
                 user, result = verify_otp_and_create_user(email, otp)
             except Exception as e:
+                AUTH_REQUESTS.labels("verify_otp", "error").inc()
                 return error_response(message="Internal error verifying OTP", errors=str(e))
 
             if user is None:
+                AUTH_REQUESTS.labels("verify_otp", "invalid").inc()
                 return error_response(message="OTP verification failed", errors=result)
 
+            AUTH_REQUESTS.labels("verify_otp", "success").inc()
             return success_response(
                 data={
                     "user": {
@@ -163,6 +219,7 @@ class AuthViewSet(viewsets.ViewSet):
                 message="Account verified successfully",
                 code=status.HTTP_201_CREATED,
             )
+        AUTH_REQUESTS.labels("verify_otp", "invalid").inc()
         return error_response(errors=serializer.errors, message="Invalid input")
     
     @swagger_auto_schema(
@@ -170,13 +227,14 @@ class AuthViewSet(viewsets.ViewSet):
         request_body=RefreshTokenSerializer,
         responses={
             200: openapi.Response(
-                description="New access token",
+                description="New access token (and a rotated refresh token when rotation is enabled)",
                 examples={
                     "application/json": {
                         "success": True,
                         "message": "Token refreshed successfully",
                         "data": {
-                            "access": "new-jwt-access-token"
+                            "access": "new-jwt-access-token",
+                            "refresh": "new-jwt-refresh-token"
                         }
                     }
                 }
@@ -188,9 +246,11 @@ class AuthViewSet(viewsets.ViewSet):
     def refresh(self, request):
         serializer = RefreshTokenSerializer(data=request.data)
         if serializer.is_valid():
+            AUTH_REQUESTS.labels("refresh", "success").inc()
             return success_response(
                 data=serializer.validated_data,
                 message="Token refreshed successfully"
             )
+        AUTH_REQUESTS.labels("refresh", "invalid").inc()
         return error_response(errors=serializer.errors, message="Invalid refresh token")
 
@@ -1,12 +1,14 @@
+from rest_framework.exceptions import APIException
 from rest_framework.views import exception_handler
-from apps.utils.responses import error_response
 
 def custom_exception_handler(exc, context):
     response = exception_handler(exc, context)
     if response is not None:
-        return error_response(
-            errors=response.data,
-            message=str(exc),
-            code=response.status_code
-        )
+        # The envelope is added by EnvelopeJSONRenderer; only pick a readable message.
+        # A plain detail ("Not found.") is the message; field errors get the generic one.
+        data = response.data
+        if isinstance(data, dict) and isinstance(data.get("detail"), str):
+            response.message = data["detail"]
+        elif isinstance(exc, APIException):
+            response.message = str(exc.default_detail)
     return response
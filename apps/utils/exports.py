@@ -0,0 +1,96 @@
+# apps/utils/exports.py
+"""
+Streaming admin exports: GET <list url>/export/?format=jsonl (default) or ?format=csv.
+`Accept: text/csv` also selects CSV. ?format= wins over the Accept header, and
+any other Accept header (application/json, */*...) gets JSON Lines rather than
+a 406. An unknown ?format= is still a 404.
+
+Rows come from a `.values()` server-side cursor (`.iterator(chunk_size=...)`)
+and go through the view's RowConverter one chunk at a time, so worker memory
+stays flat however many rows are exported. The list endpoint's filters apply.
+"""
+from itertools import islice
+
+from django.utils import timezone
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.permissions import IsAdminUser
+
+from .renderers import EnvelopeJSONRenderer, dumps
+from .streaming import csv_streaming_response, jsonl_streaming_response
+
+
+class JSONLinesRenderer(EnvelopeJSONRenderer):
+    # Exports stream their rows themselves; this renders errors (403...) as JSON
+    media_type = "application/x-ndjson"
+    format = "jsonl"
+
+
+class CSVRenderer(EnvelopeJSONRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+
+class ExportContentNegotiation(DefaultContentNegotiation):
+    """
+    When the Accept header matches no renderer, use the one ?format= asks for, or
+    the first one (JSON Lines), instead of answering 406.
+    """
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        try:
+            return super().select_renderer(request, renderers, format_suffix)
+        except NotAcceptable:
+            format_query = format_suffix or request.query_params.get(self.settings.URL_FORMAT_OVERRIDE)
+            if format_query:
+                renderers = self.filter_renderers(renderers, format_query)
+            return renderers[0], renderers[0].media_type
+
+
+def iter_converted(converter, rows, chunk_size):
+    """Convert `rows` with `converter` one chunk at a time."""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield from converter.convert_rows(chunk)
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode("utf-8")
+    return value
+
+
+class ExportMixin:
+    """Adds the admin-only `export` list action; the view provides `row_converter`."""
+    export_chunk_size = 2000
+    export_filename = "export"
+
+    def get_row_converter(self):
+        return self.row_converter
+
+    def get_export_queryset(self):
+        return self.filter_queryset(self.get_queryset()).order_by("pk")
+
+    @action(
+        detail=False, methods=["get"], permission_classes=[IsAdminUser],
+        renderer_classes=[JSONLinesRenderer, CSVRenderer],
+        content_negotiation_class=ExportContentNegotiation,
+    )
+    def export(self, request):
+        converter = self.get_row_converter()
+        queryset = converter.values(self.get_export_queryset())
+        rows = iter_converted(converter, queryset.iterator(chunk_size=self.export_chunk_size), self.export_chunk_size)
+        filename = f"{self.export_filename}-{timezone.now():%Y%m%d-%H%M%S}.{request.accepted_renderer.format}"
+
+        if request.accepted_renderer.format == "csv":
+            header = converter.field_names
+            return csv_streaming_response(
+                header, ([_csv_cell(row[name]) for name in header] for row in rows), filename
+            )
+        return jsonl_streaming_response(rows, dumps, filename)
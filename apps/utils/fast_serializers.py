@@ -0,0 +1,173 @@
+# apps/utils/fast_serializers.py
+"""
+Read-only fast path for list endpoints.
+
+A RowConverter is compiled once from a ModelSerializer: every readable field
+becomes a `.values()` path plus a plain conversion function (or none at all
+for strings, ints and bools). Listing then fetches `.values()` rows and maps
+them to the same dicts the serializer would produce, without building model
+instances or running DRF field machinery per row.
+
+Fields that can't be read from one `.values()` column (nested serializers,
+SerializerMethodField) must be listed in `exclude` and filled in by a subclass
+overriding convert_rows(); compiling fails loudly otherwise.
+"""
+import threading
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import fields as drf_fields
+from rest_framework import relations, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# to_representation() is the identity for the Python values .values() returns
+IDENTITY_FIELDS = (
+    drf_fields.BooleanField,
+    drf_fields.CharField,
+    drf_fields.ChoiceField,
+    drf_fields.FloatField,
+    drf_fields.IntegerField,
+    drf_fields.ReadOnlyField,
+    relations.PrimaryKeyRelatedField,
+)
+
+
+def _decimal_converter(field):
+    coerce_to_string = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    if (
+        not coerce_to_string or field.localize or getattr(field, "normalize_output", False)
+        or field.decimal_places is None
+    ):
+        return field.to_representation
+    places = field.decimal_places
+    # Stored values already have `places` decimals; formatting rounds like quantize()
+    return lambda value: f"{value:.{places}f}"
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    utc = settings.USE_TZ and timezone.get_default_timezone_name() == "UTC"
+    if not utc or output_format is None or output_format.lower() != drf_fields.ISO_8601:
+        return field.to_representation
+
+    def convert(value):
+        # The database returns aware UTC datetimes
+        if value.tzinfo is not dt_timezone.utc:
+            return field.to_representation(value)
+        return value.isoformat()[:-6] + "Z"
+    return convert
+
+
+class RowConverter:
+    def __init__(self, serializer_class, exclude=(), extra_paths=()):
+        self.serializer_class = serializer_class
+        self.exclude = tuple(exclude)
+        self.extra_paths = tuple(extra_paths)
+        self._plan = None
+        self._lock = threading.Lock()
+
+    # Compiled lazily: serializer fields can only be built once the app registry is ready
+    @property
+    def plan(self):
+        if self._plan is None:
+            with self._lock:
+                if self._plan is None:
+                    self._plan = self._compile()
+        return self._plan
+
+    @property
+    def field_names(self):
+        return [name for name, _path, _convert in self.plan]
+
+    @property
+    def paths(self):
+        paths = [path for _name, path, _convert in self.plan if path is not None]
+        return list(dict.fromkeys(paths + list(self.extra_paths)))
+
+    def _resolve(self, model, source_attrs):
+        """source attrs -> (values() path, converter for model-level transforms)."""
+        parts = []
+        for index, attr in enumerate(source_attrs):
+            last = index == len(source_attrs) - 1
+            if last and attr.startswith("get_") and attr.endswith("_display"):
+                field = model._meta.get_field(attr[4:-8])
+                choices = {key: str(label) for key, label in field.flatchoices}
+                parts.append(field.name)
+                return "__".join(parts), lambda value: choices.get(value, value)
+            try:
+                field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                raise ImproperlyConfigured(f"{self.serializer_class.__name__}: can't read '{attr}' from .values()")
+            parts.append(field.name)
+            if field.is_relation and not last:
+                model = field.related_model
+        return "__".join(parts), None
+
+    def _compile(self):
+        serializer = self.serializer_class()
+        model = serializer.Meta.model
+        plan = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if name in self.exclude:
+                plan.append((name, None, None))
+                continue
+            if isinstance(field, (serializers.BaseSerializer, drf_fields.SerializerMethodField)) or field.source == "*":
+                raise ImproperlyConfigured(
+                    f"{self.serializer_class.__name__}.{name} needs custom handling; add it to `exclude`"
+                )
+            path, model_convert = self._resolve(model, field.source_attrs)
+            if model_convert is not None:
+                convert = model_convert
+            elif isinstance(field, drf_fields.DecimalField):
+                convert = _decimal_converter(field)
+            elif isinstance(field, drf_fields.DateTimeField):
+                convert = _datetime_converter(field)
+            elif isinstance(field, IDENTITY_FIELDS):
+                convert = None
+            else:
+                convert = field.to_representation
+            plan.append((name, path, convert))
+        return tuple(plan)
+
+    def values(self, queryset):
+        return queryset.values(*self.paths)
+
+    def convert(self, row):
+        out = {}
+        for name, path, convert in self.plan:
+            if path is None:
+                out[name] = None  # filled in by convert_rows()
+                continue
+            value = row[path]
+            out[name] = value if convert is None or value is None else convert(value)
+        return out
+
+    def convert_rows(self, rows):
+        return [self.convert(row) for row in rows]
+
+
+class FastListMixin:
+    """
+    ViewSet mixin: list() reads `.values()` rows through `row_converter` instead of
+    instantiating the serializer for every row. Filtering and pagination work as before.
+    """
+    row_converter = None
+
+    def get_row_converter(self):
+        return self.row_converter
+
+    def list(self, request, *args, **kwargs):
+        converter = self.get_row_converter()
+        if converter is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = converter.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(converter.convert_rows(page))
+        return Response(converter.convert_rows(queryset))
@@ -0,0 +1,136 @@
+# apps/utils/instrumentation.py
+"""
+Per-request instrumentation: query count and SQL time (via
+connection.execute_wrapper), JSON render time, total time and response size.
+
+RequestMetricsMiddleware attaches the numbers to the response as a
+Server-Timing header (SERVER_TIMING_HEADER) and records them in per-route
+histograms of the metrics registry (apps.utils.metrics). Routes can be given
+query budgets (QUERY_BUDGETS / QUERY_BUDGET_DEFAULT); going over budget logs a warning, or
+raises QueryBudgetExceeded when QUERY_BUDGET_STRICT is on, which makes test
+runs fail on new N+1 queries.
+"""
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_current = ContextVar("request_metrics", default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    """A route ran more queries than its budget allows (QUERY_BUDGET_STRICT)."""
+
+
+class RequestMetrics:
+    __slots__ = ("queries", "sql_seconds", "render_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.render_seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += time.perf_counter() - start
+            self.queries += 1
+
+
+def current_metrics():
+    """Metrics of the request being handled, or None outside RequestMetricsMiddleware."""
+    return _current.get()
+
+
+@contextmanager
+def measure_render():
+    request_metrics = _current.get()
+    if request_metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        request_metrics.render_seconds += time.perf_counter() - start
+
+
+REQUEST_LATENCY = metrics.histogram(
+    "http_request_duration_seconds", "Time spent handling the request", ["method", "route"]
+)
+REQUEST_QUERIES = metrics.histogram(
+    "db_queries_per_request", "Database queries run per request", ["method", "route"], buckets=QUERY_BUCKETS
+)
+REQUEST_SQL_TIME = metrics.histogram(
+    "db_query_duration_seconds", "Time spent in SQL per request", ["method", "route"]
+)
+RESPONSES = metrics.counter("http_responses_total", "Responses by status code", ["method", "route", "status"])
+
+
+def _route_of(request):
+    # URL name ("order-list", "product-detail"): stable and readable, unlike router regexes
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+    return match.view_name or match.route
+
+
+def query_budget(route):
+    return getattr(settings, "QUERY_BUDGETS", {}).get(route, getattr(settings, "QUERY_BUDGET_DEFAULT", None))
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing = getattr(settings, "SERVER_TIMING_HEADER", settings.DEBUG)
+        self.strict = getattr(settings, "QUERY_BUDGET_STRICT", False)
+
+    def __call__(self, request):
+        request_metrics = RequestMetrics()
+        token = _current.set(request_metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(request_metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        elapsed = time.perf_counter() - start
+
+        route = _route_of(request)
+        REQUEST_LATENCY.labels(request.method, route).observe(elapsed)
+        REQUEST_QUERIES.labels(request.method, route).observe(request_metrics.queries)
+        REQUEST_SQL_TIME.labels(request.method, route).observe(request_metrics.sql_seconds)
+        RESPONSES.labels(request.method, route, response.status_code).inc()
+        metrics.registry.maybe_flush()
+
+        size = None if response.streaming else len(response.content)
+        if self.server_timing:
+            response["Server-Timing"] = ", ".join([
+                f'db;dur={request_metrics.sql_seconds * 1000:.1f};desc="{request_metrics.queries} queries"',
+                f"render;dur={request_metrics.render_seconds * 1000:.1f}",
+                f"app;dur={elapsed * 1000:.1f}",
+            ])
+            if size is not None:
+                response["X-Response-Size"] = str(size)
+
+        budget = query_budget(route)
+        if budget is not None and request_metrics.queries > budget:
+            message = f"{request.method} {route} ran {request_metrics.queries} queries (budget {budget})"
+            if self.strict:
+                raise QueryBudgetExceeded(message)
+            logger.warning(f"🐢 {message}")
+        return response
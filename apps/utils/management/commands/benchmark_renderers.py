@@ -0,0 +1,85 @@
+import time
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from apps.products.models import Product
+from apps.products.serializers import ProductSerializer
+from apps.utils.renderers import build_envelope, orjson_dumps, stdlib_dumps
+
+class Command(BaseCommand):
+    help = 'Compare JSON render throughput of DRF JSONRenderer and the envelope renderer encoders'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Products / orders per payload')
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def product_payload(self, rows):
+        now = timezone.now()
+        products = [
+            Product(
+                id=i, name=f"Product {i}", description="Lorem ipsum dolor sit amet " * 8,
+                price=Decimal("19.99") + i, stock=i % 50, category="electronics",
+                image_url=f"https://cdn.example.com/products/{i}.jpg", created_at=now - timedelta(minutes=i),
+            )
+            for i in range(1, rows + 1)
+        ]
+        # Real serializer output (ReturnList of dicts, decimals as strings)
+        return {"next": "https://api.example.com/api/products/?cursor=abc", "results": ProductSerializer(products, many=True).data}
+
+    def order_payload(self, rows):
+        now = timezone.now()
+        # Shaped like OrderSerializer output, with raw Decimal/datetime values mixed in
+        return [
+            {
+                "id": i, "user": i % 100, "user_email": f"user{i % 100}@example.com",
+                "total_amount": Decimal("129.95"), "status": "PENDING", "status_display": "Pending",
+                "created_at": now, "updated_at": now, "coupon_details": None, "shipping_address": i,
+                "items": [
+                    {
+                        "id": i * 10 + n, "product_id": n, "product_name": f"Product {n}",
+                        "product_price": "25.99", "quantity": 1 + n % 3, "price_per_unit": "25.99",
+                        "status": "PENDING", "status_display": "Pending",
+                    }
+                    for n in range(5)
+                ],
+            }
+            for i in range(1, rows + 1)
+        ]
+
+    def measure(self, render, payload, repeat):
+        size = len(render(payload))
+        start = time.perf_counter()
+        for _ in range(repeat):
+            render(payload)
+        elapsed = (time.perf_counter() - start) / repeat
+        return elapsed, size
+
+    def handle(self, *args, **options):
+        context = {"response": Response(status=200)}
+        drf = JSONRenderer()
+        renderers = {
+            "DRF JSONRenderer (no envelope)": lambda payload: drf.render(payload, renderer_context=context),
+            "envelope + json": lambda payload: stdlib_dumps(build_envelope(payload, 200)),
+        }
+        if orjson_dumps is not None:
+            renderers["envelope + orjson"] = lambda payload: orjson_dumps(build_envelope(payload, 200))
+        else:
+            self.stdout.write(self.style.WARNING("orjson is not installed; skipping the orjson encoder"))
+
+        payloads = {
+            "products": self.product_payload(options['rows']),
+            "orders": self.order_payload(options['rows']),
+        }
+        for payload_name, payload in payloads.items():
+            self.stdout.write(f"\n{payload_name} ({options['rows']} rows)")
+            baseline = None
+            for name, render in renderers.items():
+                elapsed, size = self.measure(render, payload, options['repeat'])
+                baseline = baseline or elapsed
+                self.stdout.write(
+                    f"  {name:32} {elapsed * 1000:8.2f} ms/render  {size / elapsed / 1e6:8.1f} MB/s  "
+                    f"x{baseline / elapsed:.1f}"
+                )
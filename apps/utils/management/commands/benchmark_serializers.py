@@ -0,0 +1,108 @@
+import time
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from apps.coupons.models import Coupon
+from apps.cart.models import CartItem
+from apps.cart.serializers import CartItemSerializer, cart_item_rows
+from apps.orders.models import Order, OrderItem
+from apps.orders.serializers import OrderSerializer, order_rows
+from apps.products.models import Product
+from apps.products.serializers import ProductSerializer, product_rows
+from apps.reviews.models import Review
+from apps.reviews.serializers import ReviewSerializer, review_rows
+
+class Rollback(Exception):
+    pass
+
+class Command(BaseCommand):
+    help = (
+        'Compare ModelSerializer list output with the .values() row converters: checks that '
+        'both produce identical data and times them. Test rows are created in a rolled-back transaction.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Rows per listing')
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def create_rows(self, rows):
+        User = get_user_model()
+        users = User.objects.bulk_create(
+            User(email=f"bench-{i}@example.invalid", first_name="Bench", is_active=True) for i in range(rows)
+        )
+        products = Product.objects.bulk_create(
+            Product(
+                name=f"Product {i}", description="Lorem ipsum dolor sit amet " * 8, price=Decimal("19.99") + i,
+                stock=i % 50, category="electronics", image_url=f"https://cdn.example.com/products/{i}.jpg",
+            )
+            for i in range(rows)
+        )
+        CartItem.objects.bulk_create(CartItem(user=users[0], product=product, quantity=2) for product in products)
+        Review.objects.bulk_create(
+            Review(product=products[0], user=user, rating=1 + i % 5, comment="Great product " * 5,
+                   reviewer_name="Bench", reviewer_email=user.email)
+            for i, user in enumerate(users)
+        )
+        now = timezone.now()
+        coupon = Coupon.objects.create(
+            code="BENCH-ROLLBACK", discount_type="percent", discount_value=Decimal("10"),
+            valid_from=now, valid_to=now, min_cart_value=Decimal("0"),
+        )
+        orders = Order.objects.bulk_create(
+            Order(user=users[0], total_amount=Decimal("129.95"), coupon=coupon if i % 2 else None) for i in range(rows)
+        )
+        OrderItem.objects.bulk_create(
+            OrderItem(order=order, product=products[n], quantity=1 + n, price_per_unit=products[n].price)
+            for order in orders for n in range(3)
+        )
+        return users, products
+
+    def listings(self, user, product):
+        # Serializer side gets the joins/prefetches it needs, so the comparison is about DRF overhead
+        return [
+            ("products", Product.objects.order_by("-created_at", "id"), ProductSerializer, product_rows),
+            ("cart", CartItem.objects.filter(user=user).select_related("user", "product").order_by("id"),
+             CartItemSerializer, cart_item_rows),
+            ("reviews", Review.objects.filter(product=product).order_by("-date", "-id"), ReviewSerializer, review_rows),
+            ("orders", Order.objects.filter(user=user).select_related("user", "coupon")
+             .prefetch_related("items__product").order_by("id"), OrderSerializer, order_rows),
+        ]
+
+    def timed(self, func, repeat):
+        result = func()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return result, (time.perf_counter() - start) / repeat
+
+    def handle(self, *args, **options):
+        failures = []
+        try:
+            with transaction.atomic():
+                users, products = self.create_rows(options['rows'])
+                for name, queryset, serializer_class, converter in self.listings(users[0], products[0]):
+                    expected, slow = self.timed(lambda: serializer_class(queryset.all(), many=True).data, options['repeat'])
+                    actual, fast = self.timed(lambda: converter.convert_rows(converter.values(queryset.all())), options['repeat'])
+
+                    mismatch = next(
+                        (i for i, (a, b) in enumerate(zip(expected, actual)) if dict(a) != b), None
+                    )
+                    if len(expected) != len(actual):
+                        mismatch = min(len(expected), len(actual))
+                    status = self.style.SUCCESS("same output") if mismatch is None else self.style.ERROR("MISMATCH")
+                    self.stdout.write(
+                        f"{name:8} {len(actual):6} rows  serializer {slow * 1000:8.1f} ms  "
+                        f"values() {fast * 1000:8.1f} ms  x{slow / fast:5.1f}  {status}"
+                    )
+                    if mismatch is not None:
+                        failures.append(name)
+                        self.stdout.write(f"  serializer: {dict(expected[mismatch]) if mismatch < len(expected) else None}")
+                        self.stdout.write(f"  values():   {actual[mismatch] if mismatch < len(actual) else None}")
+                raise Rollback
+        except Rollback:
+            pass
+
+        if failures:
+            raise CommandError(f"Fast path output differs from the serializer for: {', '.join(failures)}")
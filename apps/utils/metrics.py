@@ -0,0 +1,317 @@
+# apps/utils/metrics.py
+"""
+Prometheus-style counters and histograms, exposed as text at /metrics.
+
+Metrics are declared once at module level:
+
+    ORDERS_CREATED = metrics.counter("orders_created_total", "Orders committed")
+    ORDERS_CREATED.inc()
+    WEBHOOK_REQUESTS.labels("stored").inc()
+
+Recording takes no lock: every thread writes to its own dict of values, and
+the shards are only merged when the metrics are collected. Values of finished
+threads are folded into a retired total so short-lived worker threads don't
+accumulate.
+
+With several worker processes (gunicorn), set METRICS_MULTIPROC_DIR to a
+directory shared by the workers. Each process then writes its totals to
+`<dir>/metrics_<pid>.json` at most every METRICS_FLUSH_INTERVAL seconds (and at
+exit), and /metrics sums the files of all processes. Clear the directory
+before starting the server, as prometheus_client's multiprocess mode requires.
+"""
+import atexit
+import bisect
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _merge_into(target, source):
+    """Add `source` values ({key: number or histogram row}) into `target`."""
+    for key, value in source.items():
+        current = target.get(key)
+        if current is None:
+            target[key] = list(value) if isinstance(value, list) else value
+        elif isinstance(value, list):
+            for i, part in enumerate(value):
+                current[i] += part
+        else:
+            target[key] = current + value
+
+
+class _BoundMetric:
+    """A metric with its label values fixed; what the hot path calls."""
+    __slots__ = ("_metric", "_key")
+
+    def __init__(self, metric, key):
+        self._metric = metric
+        self._key = key
+
+    def inc(self, amount=1):
+        values = self._metric.registry.shard()
+        values[self._key] = values.get(self._key, 0) + amount
+
+    def observe(self, value):
+        metric = self._metric
+        values = metric.registry.shard()
+        row = values.get(self._key)
+        if row is None:
+            # bucket counts (last one is +Inf), then sum and count
+            row = values[self._key] = [0] * (len(metric.buckets) + 3)
+        row[bisect.bisect_left(metric.buckets, value)] += 1
+        row[-2] += value
+        row[-1] += 1
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=None):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) if buckets is not None else None
+        self._children = {}
+        self._default = _BoundMetric(self, (name, ())) if not self.labelnames else None
+
+    def labels(self, *labelvalues):
+        child = self._children.get(labelvalues)
+        if child is None:
+            if len(labelvalues) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labelvalues}")
+            key = (self.name, tuple(str(value) for value in labelvalues))
+            child = self._children[labelvalues] = _BoundMetric(self, key)
+        return child
+
+    def _unlabelled(self):
+        if self._default is None:
+            raise ValueError(f"{self.name} has labels {self.labelnames}; use .labels()")
+        return self._default
+
+    def describe(self):
+        return {
+            "type": self.type,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "buckets": list(self.buckets) if self.buckets is not None else None,
+        }
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount=1):
+        self._unlabelled().inc(amount)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def observe(self, value):
+        self._unlabelled().observe(value)
+
+    def time(self):
+        return self._unlabelled().time()
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._live = []  # (thread, values) per recording thread
+        self._retired = {}
+        self._last_flush = time.monotonic()
+
+    # -- declaration -------------------------------------------------------
+
+    def _register(self, cls, name, documentation, labelnames, buckets=None):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is not None:
+                if type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                    raise ValueError(f"Metric {name} is already registered differently")
+                return metric
+            metric = self._metrics[name] = cls(self, name, documentation, labelnames, buckets)
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, sorted(buckets))
+
+    # -- recording ---------------------------------------------------------
+
+    def shard(self):
+        """This thread's value dict (created on first use)."""
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            with self._lock:
+                self._live.append((threading.current_thread(), values))
+            return values
+
+    def collect(self):
+        """Merged values of all threads of this process: {(name, labelvalues): value}."""
+        with self._lock:
+            live = []
+            for thread, values in self._live:
+                if thread.is_alive():
+                    live.append((thread, values))
+                else:
+                    # Nobody writes to a finished thread's dict any more
+                    _merge_into(self._retired, values)
+            self._live = live
+            merged = {}
+            _merge_into(merged, self._retired)
+            shards = [values.copy() for _thread, values in live]
+        for values in shards:
+            _merge_into(merged, values)
+        return merged
+
+    def reset(self):
+        with self._lock:
+            self._retired.clear()
+            for _thread, values in self._live:
+                values.clear()
+
+    # -- multiprocess ------------------------------------------------------
+
+    @staticmethod
+    def multiproc_dir():
+        return getattr(settings, "METRICS_MULTIPROC_DIR", None) if settings.configured else None
+
+    def _dump(self):
+        return {
+            "metrics": {name: metric.describe() for name, metric in self._metrics.items()},
+            "samples": [[name, list(labels), value] for (name, labels), value in self.collect().items()],
+        }
+
+    def flush(self):
+        """Write this process's totals to the shared directory (atomic rename)."""
+        directory = self.multiproc_dir()
+        if not directory:
+            return
+        self._last_flush = time.monotonic()
+        path = os.path.join(directory, f"metrics_{os.getpid()}.json")
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self._dump(), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write metrics to {path}: {e}")
+
+    def maybe_flush(self):
+        if time.monotonic() - self._last_flush >= getattr(settings, "METRICS_FLUSH_INTERVAL", 5):
+            self.flush()
+
+    def _gather(self):
+        """(descriptions, values) for this process, plus the other processes' files."""
+        descriptions = {name: metric.describe() for name, metric in self._metrics.items()}
+        values = self.collect()
+        directory = self.multiproc_dir()
+        if not directory:
+            return descriptions, values
+
+        own_file = f"metrics_{os.getpid()}.json"
+        for path in glob.glob(os.path.join(directory, "metrics_*.json")):
+            if os.path.basename(path) == own_file:
+                continue
+            try:
+                with open(path) as f:
+                    dump = json.load(f)
+            except (OSError, ValueError):
+                continue  # being replaced or truncated; picked up next scrape
+            for name, description in dump["metrics"].items():
+                descriptions.setdefault(name, description)
+            _merge_into(values, {(name, tuple(labels)): value for name, labels, value in dump["samples"]})
+        return descriptions, values
+
+    # -- exposition --------------------------------------------------------
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        descriptions, values = self._gather()
+        samples = {}
+        for (name, labels), value in values.items():
+            samples.setdefault(name, []).append((labels, value))
+
+        lines = []
+        for name in sorted(descriptions):
+            description = descriptions[name]
+            labelnames = description["labelnames"]
+            lines.append(f"# HELP {name} {_escape_help(description['help'])}")
+            lines.append(f"# TYPE {name} {description['type']}")
+            for labels, value in sorted(samples.get(name, ())):
+                if description["type"] == "counter":
+                    lines.append(f"{name}{_labels(labelnames, labels)} {_number(value)}")
+                    continue
+                cumulative = 0
+                bucket_bounds = [*map(_number, description["buckets"]), "+Inf"]
+                for bound, count in zip(bucket_bounds, value):
+                    cumulative += count
+                    lines.append(
+                        f"{name}_bucket{_labels(labelnames, labels, ('le', bound))} {_number(cumulative)}"
+                    )
+                lines.append(f"{name}_sum{_labels(labelnames, labels)} {_number(value[-2])}")
+                lines.append(f"{name}_count{_labels(labelnames, labels)} {_number(value[-1])}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text):
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_value(text):
+    return text.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_value(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value):
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+registry = MetricsRegistry()
+counter = registry.counter
+histogram = registry.histogram
+
+atexit.register(registry.flush)
+
+# Shared by the caches that report hit rates (coupon definitions, JWT blacklist...)
+CACHE_LOOKUPS = counter(
+    "cache_lookups_total", "Cache lookups by the tier that answered them", ["cache", "tier"]
+)
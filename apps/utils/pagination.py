@@ -0,0 +1,135 @@
+import json
+from base64 import b64decode, b64encode
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class StandardResultsSetPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor (keyset) pagination over several ordering fields.
+
+    The cursor encodes the ordering values of the last row returned, and the next
+    page is fetched with `WHERE (ordering) > (cursor)`, so deep pages cost the same
+    as the first one when a matching index exists. The view provides the ordering
+    through `get_keyset_ordering()` (or `keyset_ordering`); it must end with a
+    unique field such as "id".
+    """
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_ordering(self, view):
+        if hasattr(view, "get_keyset_ordering"):
+            return view.get_keyset_ordering()
+        return view.keyset_ordering
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            return json.loads(b64decode(encoded.encode("ascii")).decode("utf-8"))
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, values):
+        # Full-precision isoformat (DjangoJSONEncoder would truncate microseconds)
+        def default(value):
+            return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+        return b64encode(json.dumps(values, default=default).encode("utf-8")).decode("ascii")
+
+    def coerce_cursor(self, queryset, cursor):
+        """
+        Cursor values converted with each ordering field's `to_python()`, so a
+        well-formed cursor carrying the wrong types is a 404 rather than a 500.
+        """
+        if not isinstance(cursor, list) or len(cursor) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        values = []
+        for field, value in zip(self.ordering, cursor):
+            name = field.lstrip("-")
+            try:
+                model_field = queryset.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                model_field = queryset.query.annotations[name].output_field
+            try:
+                value = model_field.to_python(value)
+            except (DjangoValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+            values.append(value)
+        return values
+
+    @staticmethod
+    def _after(ordering, values):
+        """Q for rows strictly after `values` in `ordering` (mixed directions allowed)."""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = self.get_ordering(view)
+        page_size = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request)
+        queryset = queryset.order_by(*self.ordering)
+        if cursor is not None:
+            queryset = queryset.filter(self._after(self.ordering, self.coerce_cursor(queryset, cursor)))
+
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        # Pages are model instances, or dicts on the .values() fast path
+        if isinstance(last, dict):
+            values = [last[field.lstrip("-")] for field in self.ordering]
+        else:
+            values = [getattr(last, field.lstrip("-")) for field in self.ordering]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(values))
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
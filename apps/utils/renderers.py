@@ -0,0 +1,73 @@
+# apps/utils/renderers.py
+"""
+JSON renderer that wraps every API response in the envelope
+
+    {"success": true, "message": ..., "data": ...}      (status < 400)
+    {"success": false, "message": ..., "errors": ...}   (status >= 400)
+
+once, at render time. Views return plain data (optionally with
+`response.message` set, see apps.utils.responses) and never build the envelope
+themselves. Encoding uses orjson when it is installed and falls back to the
+standard library encoder otherwise; both produce the same JSON as DRF's
+JSONRenderer for the values serializers emit.
+"""
+import json
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .instrumentation import measure_render
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+_drf_encoder = JSONEncoder()
+
+
+def _default(obj):
+    # Decimal, lazy strings, querysets... exactly as DRF's encoder does it
+    return _drf_encoder.default(obj)
+
+
+def stdlib_dumps(data):
+    return json.dumps(
+        data, cls=JSONEncoder, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+if orjson is not None:
+    # Datetimes go through _default so their format matches DRF (ms precision, "Z")
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def orjson_dumps(data):
+        return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+
+    dumps = orjson_dumps
+else:
+    orjson_dumps = None
+    dumps = stdlib_dumps
+
+
+def build_envelope(data, status_code, message=None):
+    if status_code >= 400:
+        if message is None and isinstance(data, dict) and isinstance(data.get("error"), str):
+            message = data["error"]
+        return {"success": False, "message": message or "Error", "errors": data}
+    return {"success": True, "message": message or "Success", "data": data}
+
+
+class EnvelopeJSONRenderer(BaseRenderer):
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = (renderer_context or {}).get("response")
+        if response is None:
+            return dumps(data)
+        if response.status_code == 204:
+            return b""
+        with measure_render():
+            return dumps(build_envelope(data, response.status_code, getattr(response, "message", None)))
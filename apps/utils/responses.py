@@ -1,14 +1,15 @@
 from rest_framework.response import Response
 from rest_framework import status
 
+# The {"success", "message", "data"/"errors"} envelope itself is added by
+# apps.utils.renderers.EnvelopeJSONRenderer; these only attach the message.
+
 def success_response(data=None, message="Success", code=status.HTTP_200_OK):
-    return Response(
-        {"success": True, "message": message, "data": data},
-        status=code
-    )
+    response = Response(data, status=code)
+    response.message = message
+    return response
 
 def error_response(errors=None, message="Error", code=status.HTTP_400_BAD_REQUEST):
-    return Response(
-        {"success": False, "message": message, "errors": errors},
-        status=code
-    )
+    response = Response(errors, status=code)
+    response.message = message
+    return response
@@ -0,0 +1,47 @@
+import csv
+
+from django.http import StreamingHttpResponse
+
+
+class EchoBuffer:
+    """File-like object whose write() just returns the value (for csv.writer)."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(header, rows):
+    """Yield CSV-encoded lines for `header` followed by each row in `rows`."""
+    writer = csv.writer(EchoBuffer())
+    if header:
+        yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def csv_streaming_response(header, rows, filename):
+    response = StreamingHttpResponse(iter_csv(header, rows), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def iter_jsonl(rows, dumps, buffer_size=64 * 1024):
+    """Yield newline-delimited JSON for `rows` (encoded with `dumps`) in ~buffer_size byte chunks."""
+    buffer = []
+    size = 0
+    for row in rows:
+        line = dumps(row) + b"\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= buffer_size:
+            yield b"".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def jsonl_streaming_response(rows, dumps, filename):
+    response = StreamingHttpResponse(iter_jsonl(rows, dumps), content_type="application/x-ndjson")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,24 @@
+# apps/utils/testing.py
+"""Helpers shared by the apps' test suites."""
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+
+def auth_client(user):
+    """APIClient sending a fresh access token for `user`."""
+    from apps.users.services import generate_tokens_for_user
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {generate_tokens_for_user(user)['access']}")
+    return client
+
+
+class CacheClearingMixin:
+    """
+    Start every test with an empty default cache: auth state, throttles and OTPs
+    live there, and database ids are reused between tests.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
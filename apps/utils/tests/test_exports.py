@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from apps.orders.models import Order, OrderItem
+from apps.orders.views import OrderViewSet
+from apps.reviews.models import Review
+from apps.reviews.tests.test_permissions import make_product
+from apps.users.tests.test_authentication import make_user
+from apps.utils.renderers import dumps
+from apps.utils.streaming import iter_jsonl
+from apps.utils.testing import CacheClearingMixin, auth_client
+
+
+def content(response):
+    return b"".join(response.streaming_content).decode("utf-8")
+
+
+class ExportTests(CacheClearingMixin, TestCase):
+    url = "/api/orders/export/"
+
+    def setUp(self):
+        super().setUp()
+        self.admin = make_user("admin@example.com", is_staff=True)
+        self.client = auth_client(self.admin)
+        customer = make_user()
+        lamp = make_product()
+        self.orders = []
+        for status in ["PENDING", "SHIPPED", "PENDING"]:
+            order = Order.objects.create(user=customer, status=status, total_amount="19.90")
+            OrderItem.objects.create(order=order, product=lamp, quantity=2)
+            self.orders.append(order)
+
+    def jsonl(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        return [json.loads(line) for line in content(response).splitlines()]
+
+    def csv_rows(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        return list(csv.reader(io.StringIO(content(response))))
+
+    def test_jsonl_rows_match_the_listing(self):
+        rows = self.jsonl(self.client.get(self.url))
+        listing = self.client.get("/api/orders/").json()["data"]
+        self.assertEqual(sorted(rows, key=lambda row: row["id"]), sorted(listing, key=lambda row: row["id"]))
+        self.assertIn('filename="orders-', self.client.get(self.url)["Content-Disposition"])
+
+    def test_filters_and_chunks(self):
+        with mock.patch.object(OrderViewSet, "export_chunk_size", 1):
+            rows = self.jsonl(self.client.get(self.url))
+        self.assertEqual([row["id"] for row in rows], [order.id for order in self.orders])
+
+        review_product = make_product("Desk")
+        Review.objects.create(product=review_product, rating=3, comment="", reviewer_name="A", reviewer_email="a@b.c")
+        Review.objects.create(product=make_product("Chair"), rating=3, comment="", reviewer_name="B", reviewer_email="b@b.c")
+        rows = self.jsonl(self.client.get("/api/reviews/export/", {"product": review_product.id}))
+        self.assertEqual([row["product"] for row in rows], [review_product.id])
+
+    def test_csv(self):
+        for response in (
+            self.client.get(self.url, {"format": "csv"}),
+            self.client.get(self.url, HTTP_ACCEPT="text/csv"),
+        ):
+            header, *rows = self.csv_rows(response)
+            self.assertEqual(header[:2], ["id", "user"])
+            self.assertEqual(len(rows), 3)
+            items = json.loads(rows[0][header.index("items")])
+            self.assertEqual(items[0]["quantity"], 2)
+
+    def test_negotiation(self):
+        # Accept headers no export renderer matches get JSON Lines, not 406
+        for accept in ("application/json", "*/*", "text/html", "application/json, text/plain"):
+            self.assertEqual(len(self.jsonl(self.client.get(self.url, HTTP_ACCEPT=accept))), 3)
+        # ?format= wins over the Accept header
+        self.assertEqual(len(self.csv_rows(self.client.get(
+            self.url, {"format": "csv"}, HTTP_ACCEPT="application/json"
+        ))), 4)
+        self.assertEqual(self.client.get(self.url, {"format": "xml"}).status_code, 404)
+
+    def test_admin_only(self):
+        response = auth_client(make_user("other@example.com")).get(self.url)
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(json.loads(response.content)["success"])
+
+
+class IterJsonlTests(SimpleTestCase):
+    def test_rows_are_buffered_into_chunks(self):
+        rows = [{"n": i} for i in range(10)]
+        chunks = list(iter_jsonl(rows, dumps, buffer_size=20))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b"".join(chunks).decode().splitlines(), [json.dumps(row, separators=(",", ":")) for row in rows])
+
+    def test_no_rows(self):
+        self.assertEqual(list(iter_jsonl([], dumps)), [])
@@ -0,0 +1,100 @@
+from decimal import Decimal
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from rest_framework import serializers
+
+from apps.addresses.tests.test_defaults import make_address
+from apps.cart.models import CartItem
+from apps.cart.serializers import CartItemSerializer, cart_item_rows
+from apps.coupons.tests.test_cache import make_coupon
+from apps.orders.models import Order, OrderItem
+from apps.orders.serializers import OrderSerializer, order_rows
+from apps.products.models import Product
+from apps.products.serializers import ProductSerializer, product_rows
+from apps.reviews.models import Review
+from apps.reviews.serializers import ReviewSerializer, review_rows
+from apps.reviews.tests.test_permissions import make_product
+from apps.users.models import User
+from apps.users.serializers import AdminUserSerializer, admin_user_rows
+from apps.users.tests.test_authentication import make_user
+from apps.utils.fast_serializers import RowConverter
+from apps.utils.testing import CacheClearingMixin, auth_client
+
+
+class RowConverterParityTests(TestCase):
+    """Every converter must produce exactly what its serializer produces."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user(first_name="Ann")
+        User.objects.filter(pk=cls.user.pk).update(lifetime_value=Decimal("12.5"))
+        lamp = make_product(price=Decimal("19.9"))
+        desk = make_product("Desk", price=Decimal("250.00"))
+        Review.objects.create(
+            product=lamp, user=cls.user, rating=4, comment="Nice ✓",
+            reviewer_name="Ann", reviewer_email="ann@example.com",
+        )
+        Review.objects.create(product=desk, rating=2, comment="", reviewer_name="Bo", reviewer_email="bo@example.com")
+        CartItem.objects.create(user=cls.user, product=lamp, quantity=2)
+        address = make_address(cls.user)
+        with_coupon = Order.objects.create(
+            user=cls.user, shipping_address=address, coupon=make_coupon(), status="SHIPPED"
+        )
+        OrderItem.objects.create(order=with_coupon, product=lamp, quantity=1)
+        OrderItem.objects.create(order=with_coupon, product=desk, quantity=3)
+        Order.objects.create(user=cls.user)  # no items, coupon or address
+
+    def assertParity(self, converter, serializer_class, queryset):
+        queryset = queryset.order_by("id")
+        expected = serializer_class(queryset, many=True).data
+        actual = converter.convert_rows(converter.values(queryset))
+        self.assertEqual(actual, [dict(row) for row in expected])
+        self.assertTrue(actual)
+
+    def test_products(self):
+        self.assertParity(product_rows, ProductSerializer, Product.objects.all())
+
+    def test_reviews(self):
+        self.assertParity(review_rows, ReviewSerializer, Review.objects.all())
+
+    def test_cart_items(self):
+        self.assertParity(cart_item_rows, CartItemSerializer, CartItem.objects.all())
+
+    def test_admin_users(self):
+        self.assertParity(admin_user_rows, AdminUserSerializer, User.objects.all())
+
+    def test_orders_with_items_and_coupons(self):
+        expected = OrderSerializer(Order.objects.order_by("id"), many=True).data
+        actual = order_rows.convert_rows(order_rows.values(Order.objects.order_by("id")))
+        self.assertEqual(actual, [
+            {**order, "items": [dict(item) for item in order["items"]]} for order in expected
+        ])
+
+    def test_orders_take_two_queries(self):
+        with self.assertNumQueries(2):
+            order_rows.convert_rows(order_rows.values(Order.objects.all()))
+
+    def test_fields_that_need_custom_handling_must_be_excluded(self):
+        class WithMethodField(serializers.ModelSerializer):
+            shout = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Product
+                fields = ["id", "shout"]
+
+            def get_shout(self, obj):
+                return obj.name.upper()
+
+        with self.assertRaises(ImproperlyConfigured):
+            RowConverter(WithMethodField).plan
+        self.assertEqual(RowConverter(WithMethodField, exclude=["shout"]).field_names, ["id", "shout"])
+
+
+class FastListEndpointTests(CacheClearingMixin, TestCase):
+    def test_product_listing_matches_the_serializer(self):
+        make_product()
+        make_product("Desk")
+        results = auth_client(make_user()).get("/api/products/").json()["data"]
+        expected = ProductSerializer(Product.objects.order_by("-created_at"), many=True).data
+        self.assertEqual(results, [dict(row) for row in expected])
@@ -0,0 +1,65 @@
+from django.test import TestCase, override_settings
+
+from apps.addresses.tests.test_defaults import make_address
+from apps.orders.models import Order, OrderItem
+from apps.reviews.tests.test_permissions import make_product
+from apps.users.authentication import get_auth_state
+from apps.users.tests.test_authentication import make_user
+from apps.utils.instrumentation import QueryBudgetExceeded
+from apps.utils.metrics import registry
+from apps.utils.testing import CacheClearingMixin, auth_client
+
+
+class RequestMetricsMiddlewareTests(CacheClearingMixin, TestCase):
+    url = "/api/addresses/"
+
+    def setUp(self):
+        super().setUp()
+        self.user = make_user()
+        make_address(self.user)
+
+    def get(self, url=None):
+        get_auth_state(self.user.pk)  # cached, so only the view's own queries are counted
+        # A new client: the middleware reads its settings on the client's first request
+        return auth_client(self.user).get(url or self.url)
+
+    @override_settings(SERVER_TIMING_HEADER=True)
+    def test_server_timing_header(self):
+        response = self.get()
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r'^db;dur=[\d.]+;desc="1 queries", render;dur=[\d.]+, app;dur=[\d.]+$')
+        self.assertEqual(response["X-Response-Size"], str(len(response.content)))
+
+    def test_no_header_when_disabled(self):
+        response = self.get()
+        self.assertNotIn("Server-Timing", response)
+        self.assertNotIn("X-Response-Size", response)
+
+    def test_per_route_metrics(self):
+        def recorded():
+            queries = registry.collect().get(("db_queries_per_request", ("GET", "address-list")))
+            responses = registry.collect().get(("http_responses_total", ("GET", "address-list", "200")), 0)
+            return (queries[-1] if queries else 0), responses
+
+        count, responses = recorded()
+        self.get()
+        self.assertEqual(recorded(), (count + 1, responses + 1))
+
+    @override_settings(QUERY_BUDGETS={"address-list": 0})
+    def test_over_budget_is_logged(self):
+        with self.assertLogs("apps.utils.instrumentation", "WARNING") as logs:
+            self.assertEqual(self.get().status_code, 200)
+        self.assertIn("GET address-list ran 1 queries (budget 0)", logs.output[-1])
+
+    @override_settings(QUERY_BUDGETS={"address-list": 0}, QUERY_BUDGET_STRICT=True)
+    def test_over_budget_fails_in_strict_mode(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.get()
+
+    @override_settings(QUERY_BUDGETS={"order-list": 2}, QUERY_BUDGET_STRICT=True)
+    def test_order_listing_stays_within_budget(self):
+        lamp = make_product()
+        for _ in range(5):
+            order = Order.objects.create(user=self.user)
+            OrderItem.objects.create(order=order, product=lamp, quantity=1)
+        self.assertEqual(len(self.get("/api/orders/").json()["data"]), 5)
@@ -0,0 +1,168 @@
+import json
+import os
+import tempfile
+import threading
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.orders.models import Order
+from apps.orders.services import OrderService
+from apps.users.tests.test_authentication import make_user
+from apps.utils.metrics import MetricsRegistry, registry
+
+
+class MetricsRegistryTests(SimpleTestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_exposition(self):
+        requests = self.registry.counter("requests_total", "Requests\nhandled", ["route", "status"])
+        requests.labels("order-list", 200).inc()
+        requests.labels("order-list", 200).inc(2)
+        requests.labels('say "hi"', 500).inc()
+        self.registry.counter("idle_total", "Never incremented")
+
+        self.assertEqual(self.registry.render(), "\n".join([
+            "# HELP idle_total Never incremented",
+            "# TYPE idle_total counter",
+            "# HELP requests_total Requests\\nhandled",
+            "# TYPE requests_total counter",
+            'requests_total{route="order-list",status="200"} 3',
+            'requests_total{route="say \\"hi\\"",status="500"} 1',
+        ]) + "\n")
+
+    def test_histogram_exposition(self):
+        latency = self.registry.histogram("latency_seconds", "Latency", buckets=(0.5, 0.1))
+        for value in (0.05, 0.1, 0.3, 2):
+            latency.observe(value)
+
+        self.assertEqual(self.registry.render().splitlines()[2:], [
+            'latency_seconds_bucket{le="0.1"} 2',
+            'latency_seconds_bucket{le="0.5"} 3',
+            'latency_seconds_bucket{le="+Inf"} 4',
+            "latency_seconds_sum 2.45",
+            "latency_seconds_count 4",
+        ])
+
+    def test_timer(self):
+        latency = self.registry.histogram("latency_seconds", "Latency", ["op"])
+        with latency.labels("load").time():
+            pass
+        self.assertEqual(self.registry.collect()[("latency_seconds", ("load",))][-1], 1)
+
+    def test_declaration_rules(self):
+        counter = self.registry.counter("things_total", "Things", ["kind"])
+        self.assertIs(self.registry.counter("things_total", "Things", ["kind"]), counter)
+        with self.assertRaises(ValueError):
+            self.registry.histogram("things_total", "Things", ["kind"])
+        with self.assertRaises(ValueError):
+            counter.labels("a", "b")
+        with self.assertRaises(ValueError):
+            counter.inc()
+
+    def test_threads_are_merged_and_finished_threads_kept(self):
+        counter = self.registry.counter("work_total", "Work")
+
+        def work():
+            for _ in range(1000):
+                counter.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.inc()
+
+        self.assertEqual(self.registry.collect()[("work_total", ())], 4001)
+        # The finished threads' shards were folded into the retired total
+        self.assertEqual(len(self.registry._live), 1)
+        self.assertEqual(self.registry.collect()[("work_total", ())], 4001)
+
+    def test_reset(self):
+        counter = self.registry.counter("work_total", "Work")
+        counter.inc()
+        self.registry.reset()
+        self.assertEqual(self.registry.collect(), {})
+
+
+class MultiprocessTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        override = override_settings(METRICS_MULTIPROC_DIR=self.directory)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.registry = MetricsRegistry()
+        self.counter = self.registry.counter("jobs_total", "Jobs", ["queue"])
+
+    def write_worker_file(self, pid, dump):
+        with open(os.path.join(self.directory, f"metrics_{pid}.json"), "w") as f:
+            f.write(dump if isinstance(dump, str) else json.dumps(dump))
+
+    def test_flush_writes_this_process_file(self):
+        self.counter.labels("emails").inc(3)
+        self.registry.flush()
+        with open(os.path.join(self.directory, f"metrics_{os.getpid()}.json")) as f:
+            dump = json.load(f)
+        self.assertEqual(dump["samples"], [["jobs_total", ["emails"], 3]])
+        self.assertEqual(dump["metrics"]["jobs_total"]["type"], "counter")
+
+    def test_other_workers_are_summed(self):
+        self.counter.labels("emails").inc(3)
+        self.registry.flush()  # our own file is not counted twice
+        self.write_worker_file(1, {
+            "metrics": {
+                "jobs_total": {"type": "counter", "help": "Jobs", "labelnames": ["queue"], "buckets": None},
+                "only_there_total": {"type": "counter", "help": "Other", "labelnames": [], "buckets": None},
+            },
+            "samples": [["jobs_total", ["emails"], 2], ["jobs_total", ["webhooks"], 1], ["only_there_total", [], 5]],
+        })
+        self.write_worker_file(2, "{truncated")
+
+        lines = self.registry.render().splitlines()
+        self.assertIn('jobs_total{queue="emails"} 5', lines)
+        self.assertIn('jobs_total{queue="webhooks"} 1', lines)
+        self.assertIn("only_there_total 5", lines)
+
+    @override_settings(METRICS_FLUSH_INTERVAL=3600)
+    def test_maybe_flush_waits_for_the_interval(self):
+        self.registry.maybe_flush()
+        self.assertEqual(os.listdir(self.directory), [])
+
+
+class MetricsViewTests(SimpleTestCase):
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_token_is_required(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8")
+        self.assertIn(b"# TYPE http_request_duration_seconds histogram", response.content)
+
+    @override_settings(METRICS_TOKEN="", DEBUG=False)
+    def test_without_a_token_only_in_debug(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        with self.settings(DEBUG=True):
+            self.assertEqual(self.client.get("/metrics").status_code, 200)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_read_only(self):
+        self.assertEqual(self.client.post("/metrics", HTTP_AUTHORIZATION="Bearer s3cret").status_code, 405)
+
+
+class TransactionalCountersTests(TestCase):
+    def test_status_changes_are_counted_on_commit(self):
+        order = Order.objects.create(user=make_user())
+        key = ("order_status_changes_total", ("SHIPPED",))
+        before = registry.collect().get(key, 0)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            OrderService.update_order_status(order, "SHIPPED")
+        self.assertEqual(registry.collect().get(key, 0), before)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(registry.collect().get(key, 0), before + 1)
@@ -0,0 +1,86 @@
+import datetime
+import uuid
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.test import SimpleTestCase, TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from apps.users.tests.test_authentication import make_user
+from apps.utils import renderers
+from apps.utils.renderers import EnvelopeJSONRenderer, build_envelope, stdlib_dumps
+from apps.utils.responses import error_response, success_response
+from apps.utils.testing import CacheClearingMixin, auth_client
+
+SAMPLE = {
+    "price": Decimal("19.90"),
+    "created_at": datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+    "day": datetime.date(2024, 5, 1),
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "name": "Café ✓",
+    "tags": ["a", None, True, 1.5],
+}
+
+
+def render(response):
+    return EnvelopeJSONRenderer().render(response.data, renderer_context={"response": response})
+
+
+class EnvelopeTests(SimpleTestCase):
+    def test_success_and_error_envelopes(self):
+        self.assertEqual(build_envelope([1], 200), {"success": True, "message": "Success", "data": [1]})
+        self.assertEqual(
+            build_envelope({"email": ["Required"]}, 400, "Login failed"),
+            {"success": False, "message": "Login failed", "errors": {"email": ["Required"]}},
+        )
+
+    def test_error_message_is_taken_from_the_data(self):
+        envelope = build_envelope({"error": "Order is already paid"}, 400)
+        self.assertEqual(envelope["message"], "Order is already paid")
+
+    def test_response_message_is_used(self):
+        self.assertEqual(
+            render(success_response({"a": 1}, message="Created", code=201)),
+            b'{"success":true,"message":"Created","data":{"a":1}}',
+        )
+        self.assertIn(b'"message":"Nope"', render(error_response({"a": ["x"]}, message="Nope")))
+
+    def test_no_content_has_no_body(self):
+        self.assertEqual(render(Response(status=204)), b"")
+
+    def test_without_a_response_the_data_is_rendered_as_is(self):
+        self.assertEqual(EnvelopeJSONRenderer().render({"a": 1}), b'{"a":1}')
+
+    def test_stdlib_encoding_matches_drf(self):
+        self.assertEqual(stdlib_dumps(SAMPLE), JSONRenderer().render(SAMPLE))
+
+    @skipUnless(renderers.orjson is not None, "orjson is not installed")
+    def test_orjson_encoding_matches_drf(self):
+        self.assertEqual(renderers.orjson_dumps(SAMPLE), JSONRenderer().render(SAMPLE))
+
+
+class EnvelopeEndpointTests(CacheClearingMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = auth_client(make_user())
+
+    def test_list(self):
+        body = self.client.get("/api/addresses/").json()
+        self.assertEqual(body, {"success": True, "message": "Success", "data": {"next": None, "results": []}})
+
+    def test_not_found_uses_the_detail_as_message(self):
+        body = self.client.get("/api/addresses/999/").json()
+        self.assertFalse(body["success"])
+        self.assertEqual(body["message"], body["errors"]["detail"])
+
+    def test_validation_errors(self):
+        body = self.client.post("/api/addresses/", {"zip_code": "1", "country": "US"}, format="json").json()
+        self.assertEqual(body["message"], "Invalid input.")
+        self.assertIn("zip_code", body["errors"])
+
+    def test_unauthenticated(self):
+        self.client.credentials()
+        response = self.client.get("/api/addresses/")
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(response.json()["success"])
@@ -0,0 +1,59 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from apps.utils.throttling import SlidingWindowThrottle
+
+
+class PerKeyThrottle(SlidingWindowThrottle):
+    scope = "test"
+
+    def get_cache_key(self, request, view):
+        return request
+
+
+@override_settings(REST_FRAMEWORK={"DEFAULT_THROTTLE_RATES": {"test": "4/m"}})
+class SlidingWindowThrottleTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.now = 6000.0  # start of a minute window
+        patcher = mock.patch("apps.utils.throttling.time.time", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def allowed(self, key="k", count=1):
+        return [PerKeyThrottle().allow_request(key, None) for _ in range(count)]
+
+    def test_limits_each_key_within_the_window(self):
+        self.assertEqual(self.allowed(count=5), [True, True, True, True, False])
+        self.assertEqual(self.allowed("other"), [True])
+
+    def test_previous_window_counts_in_proportion(self):
+        self.allowed(count=4)
+        # Halfway into the next window half of the previous 4 requests still count
+        self.now += 90
+        self.assertEqual(self.allowed(count=3), [True, True, False])
+
+    def test_rejected_requests_keep_counting(self):
+        self.allowed(count=8)
+        self.now += 60  # the previous window still weighs 8 at its start
+        self.assertEqual(self.allowed(), [False])
+        self.now += 60
+        self.assertEqual(self.allowed(), [True])
+
+    def test_wait_is_the_rest_of_the_window(self):
+        self.now += 15
+        throttle = PerKeyThrottle()
+        throttle.allow_request("k", None)
+        self.assertEqual(throttle.wait(), 45)
+
+    def test_no_key_means_no_throttling(self):
+        with mock.patch.object(PerKeyThrottle, "get_cache_key", return_value=None):
+            self.assertEqual(self.allowed(count=6), [True] * 6)
+
+    @override_settings(REST_FRAMEWORK={"DEFAULT_THROTTLE_RATES": {}})
+    def test_missing_rate_is_a_configuration_error(self):
+        with self.assertRaises(ImproperlyConfigured):
+            PerKeyThrottle()
@@ -0,0 +1,80 @@
+import time
+
+from django.core.cache import cache as default_cache
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .metrics import counter
+
+THROTTLED = counter("throttled_requests_total", "Requests rejected by a throttle", ["scope"])
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Sliding-window counter throttle backed by Django's cache.
+
+    Each key costs two counters (current and previous fixed window) and one
+    atomic incr per request, instead of the timestamp list DRF's
+    SimpleRateThrottle keeps. The request count is estimated as
+    previous * (share of the previous window still inside the sliding window) + current.
+    Rejected requests are counted too, so clients that keep hammering stay blocked.
+
+    Subclasses set `scope` (rate taken from DEFAULT_THROTTLE_RATES) and implement
+    get_cache_key(); returning None skips throttling for that request.
+    """
+    cache = default_cache
+    scope = None
+
+    def __init__(self):
+        self.num_requests, self.duration = self.parse_rate(self.get_rate())
+        self.wait_seconds = None
+
+    def get_rate(self):
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        except KeyError:
+            raise ImproperlyConfigured(f"No default throttle rate set for '{self.scope}' scope")
+
+    @staticmethod
+    def parse_rate(rate):
+        num, period = rate.split("/")
+        duration = {"s": 1, "m": 60, "h": 3600, "d": 86400}[period[0]]
+        return int(num), duration
+
+    def get_cache_key(self, request, view):
+        raise NotImplementedError(".get_cache_key() must be overridden")
+
+    def hit(self, key):
+        """Count one request for `key` and return the estimated sliding-window count."""
+        now = time.time()
+        window = int(now // self.duration)
+        current_key = f"throttle:{self.scope}:{key}:{window}"
+        previous_key = f"throttle:{self.scope}:{key}:{window - 1}"
+
+        # add() is a no-op if the counter exists; incr() is atomic on shared caches
+        self.cache.add(current_key, 0, timeout=self.duration * 2)
+        try:
+            current = self.cache.incr(current_key)
+        except ValueError:
+            # Expired between add() and incr()
+            self.cache.set(current_key, 1, timeout=self.duration * 2)
+            current = 1
+        previous = self.cache.get(previous_key, 0)
+
+        elapsed = (now % self.duration) / self.duration
+        estimate = previous * (1 - elapsed) + current
+        self.wait_seconds = (1 - elapsed) * self.duration
+        return estimate
+
+    def allow_request(self, request, view):
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+        if self.hit(key) <= self.num_requests:
+            return True
+        THROTTLED.labels(self.scope).inc()
+        return False
+
+    def wait(self):
+        return self.wait_seconds
@@ -0,0 +1,24 @@
+# apps/utils/views.py
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+from . import metrics
+
+
+@require_GET
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint (plain text, outside the API envelope).
+    Requires `Authorization: Bearer <METRICS_TOKEN>` when METRICS_TOKEN is set;
+    without a token it is only served in DEBUG.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        provided = request.META.get("HTTP_AUTHORIZATION", "").removeprefix("Bearer ")
+        if not constant_time_compare(provided, token):
+            return HttpResponse(status=403)
+    elif not settings.DEBUG:
+        return HttpResponse(status=403)
+    return HttpResponse(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)
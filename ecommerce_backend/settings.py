@@ -1,4 +1,5 @@
 import os
+from importlib.util import find_spec
 from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv
@@ -23,6 +24,7 @@ INSTALLED_APPS = [
     # Third-party apps
     "rest_framework",
     "rest_framework_simplejwt",
+    "rest_framework_simplejwt.token_blacklist",
     "corsheaders",
 
     "drf_yasg",
@@ -41,6 +43,7 @@ INSTALLED_APPS = [
     ]
 
 MIDDLEWARE = [
+    "apps.utils.instrumentation.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     'whitenoise.middleware.WhiteNoiseMiddleware',
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -52,6 +55,17 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Request instrumentation (apps.utils.instrumentation)
+SERVER_TIMING_HEADER = os.getenv("SERVER_TIMING_HEADER", str(DEBUG)) == "True"
+QUERY_BUDGET_DEFAULT = 50
+QUERY_BUDGETS = {}  # URL name -> max queries, e.g. {"order-list": 3}
+QUERY_BUDGET_STRICT = os.getenv("QUERY_BUDGET_STRICT", "False") == "True"
+
+# Metrics (apps.utils.metrics), scraped at /metrics
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")  # bearer token for /metrics; unset = DEBUG only
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR")  # shared dir for gunicorn workers
+METRICS_FLUSH_INTERVAL = 5  # seconds between writes of a worker's totals to that dir
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",  
 ]
@@ -101,6 +115,25 @@ AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.NumericPasswordValidator"},
 ]
 
+# New and rehashed passwords use PASSWORD_HASHER: argon2 by default (argon2-cffi is
+# in requirements.txt), falling back to PBKDF2 only where it is not installed; all
+# listed hashers can still verify old hashes
+PASSWORD_HASHER_CLASSES = {
+    "argon2": "apps.users.hashers.TunedArgon2PasswordHasher",
+    "scrypt": "apps.users.hashers.TunedScryptPasswordHasher",
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+}
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "argon2" if find_spec("argon2") else "pbkdf2")
+PASSWORD_HASHERS = [PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    path for name, path in PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER
+] + ["django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher"]
+PASSWORD_ARGON2_TIME_COST = int(os.getenv("PASSWORD_ARGON2_TIME_COST", 2))
+PASSWORD_ARGON2_MEMORY_COST = int(os.getenv("PASSWORD_ARGON2_MEMORY_COST", 65536))  # KiB
+PASSWORD_ARGON2_PARALLELISM = int(os.getenv("PASSWORD_ARGON2_PARALLELISM", 2))
+PASSWORD_SCRYPT_WORK_FACTOR = int(os.getenv("PASSWORD_SCRYPT_WORK_FACTOR", 2 ** 14))
+PASSWORD_SCRYPT_BLOCK_SIZE = int(os.getenv("PASSWORD_SCRYPT_BLOCK_SIZE", 8))
+PASSWORD_SCRYPT_PARALLELISM = int(os.getenv("PASSWORD_SCRYPT_PARALLELISM", 1))
+
 # LANGUAGE & TIMEZONE
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "UTC"
@@ -115,22 +148,65 @@ MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
+DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "noreply@example.com")
+
+# Registration OTPs (kept in CACHES until verified)
+OTP_TTL_SECONDS = 600
+OTP_MAX_ATTEMPTS = 5
+
+# CACHE (per-process memory by default, shared Redis when REDIS_URL is set).
+# Production needs a shared cache: registration OTPs live only here (check users.E001).
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# COUPON CACHE (seconds)
+COUPON_CACHE_TTL = int(os.getenv("COUPON_CACHE_TTL", "300"))
+COUPON_LOCAL_CACHE_TTL = int(os.getenv("COUPON_LOCAL_CACHE_TTL", "30"))
+COUPON_NEGATIVE_CACHE_TTL = 30
+
+# Seconds a user's is_active/is_staff/is_superuser/role are cached by ClaimsJWTAuthentication
+USER_ACTIVE_CACHE_TTL = int(os.getenv("USER_ACTIVE_CACHE_TTL", "60"))
 
 # DEFAULT PRIMARY KEY
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # STRIPE CONFIG
 STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY", "")
+STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET", "")
+STRIPE_CONNECT_TIMEOUT = float(os.getenv("STRIPE_CONNECT_TIMEOUT", "3"))
+STRIPE_READ_TIMEOUT = float(os.getenv("STRIPE_READ_TIMEOUT", "10"))
+STRIPE_MAX_NETWORK_RETRIES = int(os.getenv("STRIPE_MAX_NETWORK_RETRIES", "2"))
+
+# PAYMENT GATEWAY ("stripe", or "fake" for offline development / load tests)
+PAYMENT_GATEWAY = os.getenv("PAYMENT_GATEWAY", "stripe")
+FAKE_PAYMENT_GATEWAY_LATENCY_MS = int(os.getenv("FAKE_PAYMENT_GATEWAY_LATENCY_MS", "0"))
 
 # REST FRAMEWORK + JWT CONFIG
 REST_FRAMEWORK = {
     "EXCEPTION_HANDLER": "apps.utils.exception_handler.custom_exception_handler",
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.ClaimsJWTAuthentication",
     ),
     'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
+        'apps.utils.renderers.EnvelopeJSONRenderer',
     ),
+    'DEFAULT_THROTTLE_RATES': {
+        'review_create': '10/hour',
+        'review_product': '3/hour',
+        'login_ip': '30/minute',
+        'login_email': '10/hour',
+    },
 }
 
 SWAGGER_SETTINGS = {
@@ -164,5 +240,9 @@ SIMPLE_JWT = {
     
     # Custom token classes
     'ACCESS_TOKEN_CLASS': 'rest_framework_simplejwt.tokens.AccessToken',
-    'REFRESH_TOKEN_CLASS': 'your_app.tokens.CustomRefreshToken',  # Replace 'your_app' with your actual app name
+    'REFRESH_TOKEN_CLASS': 'apps.users.tokens.CustomRefreshToken',  # used by RefreshTokenSerializer
 }
+
+# Blacklisted JTIs are cached until they expire; a JTI found not blacklisted in the
+# table is cached this many seconds (rows added outside the API apply after at most this)
+JWT_BLACKLIST_NEGATIVE_CACHE_TTL = int(os.getenv("JWT_BLACKLIST_NEGATIVE_CACHE_TTL", "30"))
@@ -0,0 +1,20 @@
+# ecommerce_backend/test_settings.py
+# python manage.py test --settings=ecommerce_backend.test_settings
+# SQLite in memory unless DB_NAME points at a Postgres database; the concurrency
+# tests (SKIP LOCKED workers, parallel coupon redemption) only run on Postgres.
+from .settings import *  # noqa: F401,F403
+
+if not os.getenv("DB_NAME"):
+    DATABASES = {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}}
+
+SECRET_KEY = "test-secret-key-for-the-test-suite-only"
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"] + PASSWORD_HASHERS
+STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
+EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+PAYMENT_GATEWAY = "fake"
+STRIPE_WEBHOOK_SECRET = "whsec_test"
+SERVER_TIMING_HEADER = False
+METRICS_MULTIPROC_DIR = None
+
+# The test run is a single process, so the per-process cache is shared by everything
+SILENCED_SYSTEM_CHECKS = ["users.E001"]
@@ -4,6 +4,7 @@ from django.contrib import admin
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from apps.utils.views import metrics_view
 
 # Environment-based base URL
 base_url = (
@@ -33,6 +34,7 @@ urlpatterns = [
     path('api/', include('apps.orders.urls')),
     path('api/', include('apps.addresses.urls')),
     path('api/', include('apps.reviews.urls')),
+    path('metrics', metrics_view, name='metrics'),
     re_path(r'^swagger/$', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
 
 ]
\ No newline at end of file